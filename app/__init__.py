@@ -17,5 +17,17 @@ def create_app(config_class=Config):
     from app.routes import main
     app.register_blueprint(main)
     
+    # Heavy dependencies load on first use; `flask prewarm` or PREWARM loads them now
+    app.cli.command('prewarm')(prewarm_command)
+    if app.config.get('PREWARM'):
+        from app.utils.prewarm import prewarm
+        prewarm()
+    
     # Return the configured app
-    return app
\ No newline at end of file
+    return app
+
+def prewarm_command():
+    """Load the model bundle, lookup tables and heavy imports, reporting each step's time"""
+    from app.utils.prewarm import prewarm
+    for name, seconds in prewarm():
+        print(f"{name:<20} {seconds * 1000:8.1f} ms")
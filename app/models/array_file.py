@@ -0,0 +1,61 @@
+import json
+import mmap
+import struct
+
+import numpy as np
+
+MAGIC = b'RFARRAY1'
+# Array data starts on 64-byte boundaries (cache lines; safe for any dtype)
+ALIGNMENT = 64
+
+
+def _align(offset):
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def write_array_file(path, arrays, header=None):
+    """Write named arrays plus a JSON header into one memory-mappable file.
+
+    Layout: magic, header length (8 bytes, little endian), the JSON header
+    (``header`` plus each array's dtype, shape and offset), then every
+    array's raw bytes at an aligned offset.
+    """
+    arrays = {name: np.ascontiguousarray(array) for name, array in arrays.items()}
+    layout, offset = {}, 0
+    for name, array in arrays.items():
+        offset = _align(offset)
+        layout[name] = {'dtype': array.dtype.str, 'shape': list(array.shape), 'offset': offset}
+        offset += array.nbytes
+    meta = json.dumps({'header': header or {}, 'arrays': layout}).encode('utf-8')
+    data_start = _align(len(MAGIC) + 8 + len(meta))
+
+    with open(path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(struct.pack('<Q', len(meta)))
+        f.write(meta)
+        for name, array in arrays.items():
+            f.write(b'\0' * (data_start + layout[name]['offset'] - f.tell()))
+            f.write(memoryview(array).cast('B'))
+
+
+def read_array_file(path):
+    """Map a file written by ``write_array_file``; returns (header, {name: array}).
+
+    One open and one mmap: the arrays are read-only views of the mapping,
+    so every process reading the same file shares its pages through the
+    OS page cache and nothing is copied or deserialized.
+    """
+    with open(path, 'rb') as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if buffer[:len(MAGIC)] != MAGIC:
+        raise ValueError(f"{path} is not an array file")
+    (length,) = struct.unpack('<Q', buffer[len(MAGIC):len(MAGIC) + 8])
+    meta = json.loads(buffer[len(MAGIC) + 8:len(MAGIC) + 8 + length])
+    data_start = _align(len(MAGIC) + 8 + length)
+    arrays = {}
+    for name, info in meta['arrays'].items():
+        dtype = np.dtype(info['dtype'])
+        count = int(np.prod(info['shape'], dtype=np.int64))
+        arrays[name] = np.frombuffer(buffer, dtype=dtype, count=count,
+                                     offset=data_start + info['offset']).reshape(info['shape'])
+    return meta['header'], arrays
@@ -0,0 +1,206 @@
+import os
+import pickle
+import time
+from collections import namedtuple
+
+import numpy as np
+from config import Config
+from app.models.array_file import read_array_file, write_array_file
+from app.models.forest_engine import CompiledForest, compile_model
+from app.utils.feature_store import FEATURE_COLUMNS, label_encoder
+
+# Bump when the bundle layout changes; readers refuse other formats
+BUNDLE_FORMAT = 1
+BUNDLE_SUFFIX = '.bundle'
+VERSIONS_DIR = 'versions'
+# Link (or hard link) to the promoted file in VERSIONS_DIR; the only file the app opens
+CURRENT_BUNDLE = 'current.bundle'
+# Artifacts written before bundles; removed when a bundle is published
+LEGACY_FILES = ('rainfall_model.pkl', 'rainfall_model.forest', 'scaler.pkl',
+                'location_encoder.pkl', 'season_encoder.pkl')
+
+# ``model`` takes scaled input, as ``model.predict(scaler.transform(X))``; ``engine`` is
+# the model compiled for fast inference with the scaler built in, taking raw features
+# (None if it cannot be compiled). Forest bundles hold no sklearn object, so their
+# ``model`` is the engine's node arrays without the scaler.
+ModelBundle = namedtuple('ModelBundle', ['model', 'scaler', 'location_encoder', 'season_encoder',
+                                         'version', 'engine', 'manifest'])
+
+
+def _vocabulary(encoder):
+    return [str(label) for label in getattr(encoder, 'classes_', [])]
+
+
+def _scaler_stats(scaler):
+    if getattr(scaler, 'mean_', None) is None:
+        return None
+    return {
+        'count': np.asarray(scaler.n_samples_seen_).tolist(),
+        'mean': scaler.mean_.tolist(),
+        'var': scaler.var_.tolist(),
+        'scale': scaler.scale_.tolist()
+    }
+
+
+def _scaler(stats):
+    if stats is None:
+        return None
+    from sklearn.preprocessing import StandardScaler
+    scaler = StandardScaler()
+    scaler.n_samples_seen_ = np.asarray(stats['count'])
+    scaler.mean_ = np.array(stats['mean'])
+    scaler.var_ = np.array(stats['var'])
+    scaler.scale_ = np.array(stats['scale'])
+    scaler.n_features_in_ = len(scaler.mean_)
+    return scaler
+
+
+def write_bundle(path, model, scaler, location_encoder, season_encoder, version, source_hash=None, metrics=None):
+    """Write the model and everything needed to feed it as one bundle file.
+
+    The manifest (the array file's header) records the feature order,
+    encoder vocabularies, scaler statistics, the feature matrix's
+    ``source_hash`` and evaluation ``metrics``. Tree models are stored as
+    their compacted CompiledForest arrays (unless ``MODEL_COMPACT`` is
+    off); any other model is pickled into a byte array. Returns the manifest.
+    """
+    engine = compile_model(model, scaler) if Config.MODEL_COMPACT else None
+    if engine is not None:
+        engine_header, arrays = engine.compact(Config.MODEL_PRUNE_TOLERANCE).to_arrays()
+    else:
+        engine_header = None
+        arrays = {'model_pickle': np.frombuffer(pickle.dumps(model, pickle.HIGHEST_PROTOCOL), dtype=np.uint8)}
+    manifest = {
+        'format': BUNDLE_FORMAT,
+        'version': version,
+        'created_at': time.time(),
+        'model_type': 'forest' if engine is not None else 'pickle',
+        'feature_columns': FEATURE_COLUMNS,
+        'vocabulary': {'location': _vocabulary(location_encoder), 'season': _vocabulary(season_encoder)},
+        'scaler': _scaler_stats(scaler),
+        'source_hash': source_hash,
+        'metrics': metrics,
+        'engine': engine_header
+    }
+    write_array_file(path, arrays, manifest)
+    return manifest
+
+
+def read_bundle(path):
+    """Load a bundle with one open and one mmap; returns a ModelBundle.
+
+    Forest arrays are used in place as read-only views of the mapping.
+    Raises ValueError for a file that is not a bundle of this format.
+    """
+    manifest, arrays = read_array_file(path)
+    if manifest.get('format') != BUNDLE_FORMAT or manifest.get('feature_columns') != FEATURE_COLUMNS:
+        raise ValueError(f"{path} is not a compatible model bundle; re-run scripts/train_model.py")
+    scaler = _scaler(manifest['scaler'])
+    if manifest['model_type'] == 'forest':
+        engine = CompiledForest.from_arrays(manifest['engine'], arrays)
+        model = engine.unscaled()
+    else:
+        model = pickle.loads(arrays['model_pickle'].tobytes())
+        engine = compile_model(model, scaler)
+    return ModelBundle(model, scaler, label_encoder(manifest['vocabulary']['location']),
+                       label_encoder(manifest['vocabulary']['season']), manifest['version'], engine, manifest)
+
+
+def read_manifest(path):
+    """The manifest of a bundle file, without building its model"""
+    manifest, _ = read_array_file(path)
+    if manifest.get('format') != BUNDLE_FORMAT:
+        raise ValueError(f"{path} is not a compatible model bundle")
+    return manifest
+
+
+def version_path(version, model_dir=None):
+    return os.path.join(model_dir or Config.MODEL_DIR, VERSIONS_DIR, f"{version}{BUNDLE_SUFFIX}")
+
+
+def list_versions(model_dir=None):
+    """Stored bundle versions, oldest first"""
+    directory = os.path.join(model_dir or Config.MODEL_DIR, VERSIONS_DIR)
+    if not os.path.isdir(directory):
+        return []
+    # Versions are fixed-width hex timestamps, so name order is age order
+    return sorted(name[:-len(BUNDLE_SUFFIX)] for name in os.listdir(directory) if name.endswith(BUNDLE_SUFFIX))
+
+
+def current_version(model_dir=None):
+    """Version the current bundle points at, or None if none is promoted"""
+    try:
+        return read_manifest(os.path.join(model_dir or Config.MODEL_DIR, CURRENT_BUNDLE))['version']
+    except (OSError, ValueError):
+        return None
+
+
+def promote(version, model_dir=None):
+    """Make ``version`` the current bundle with one atomic rename.
+
+    A temporary link to the stored version replaces ``CURRENT_BUNDLE``, so
+    a reader opens either the old bundle or the new one, never a mix. The
+    bundle is read first, so a missing or corrupt version is refused.
+    """
+    model_dir = model_dir or Config.MODEL_DIR
+    read_manifest(version_path(version, model_dir))
+    current = os.path.join(model_dir, CURRENT_BUNDLE)
+    tmp_path = f"{current}.tmp"
+    if os.path.lexists(tmp_path):
+        os.remove(tmp_path)
+    try:
+        os.symlink(os.path.join(VERSIONS_DIR, f"{version}{BUNDLE_SUFFIX}"), tmp_path)
+    except (OSError, NotImplementedError):
+        # No symlink support (e.g. unprivileged Windows): a hard link swaps just as atomically
+        os.link(version_path(version, model_dir), tmp_path)
+    os.replace(tmp_path, current)
+
+
+def rollback(model_dir=None, version=None):
+    """Promote ``version``, or by default the newest version older than the current one.
+
+    Returns the promoted version; raises ValueError if there is nothing to roll back to.
+    """
+    model_dir = model_dir or Config.MODEL_DIR
+    if version is None:
+        current = current_version(model_dir)
+        older = [v for v in list_versions(model_dir) if current is None or v < current]
+        if not older:
+            raise ValueError(f"No model version older than {current} in {model_dir}")
+        version = older[-1]
+    promote(version, model_dir)
+    return version
+
+
+def prune_versions(model_dir=None, keep=None):
+    """Delete all but the newest ``keep`` versions (never the current one)"""
+    model_dir = model_dir or Config.MODEL_DIR
+    keep = Config.MODEL_KEEP_VERSIONS if keep is None else keep
+    current = current_version(model_dir)
+    versions = list_versions(model_dir)
+    for version in versions[:max(0, len(versions) - keep)]:
+        if version != current:
+            os.remove(version_path(version, model_dir))
+
+
+def publish_bundle(model, scaler, location_encoder, season_encoder, model_dir=None, source_hash=None, metrics=None):
+    """Store a new bundle version, promote it and prune old versions; returns its manifest.
+
+    The bundle is written under a temporary name and renamed into
+    ``VERSIONS_DIR`` before promotion, so the current link only ever
+    points at a complete file.
+    """
+    model_dir = model_dir or Config.MODEL_DIR
+    os.makedirs(os.path.join(model_dir, VERSIONS_DIR), exist_ok=True)
+    version = f"{time.time_ns():016x}"
+    path = version_path(version, model_dir)
+    manifest = write_bundle(f"{path}.tmp", model, scaler, location_encoder, season_encoder, version,
+                            source_hash, metrics)
+    os.replace(f"{path}.tmp", path)
+    promote(version, model_dir)
+    prune_versions(model_dir)
+    for name in LEGACY_FILES:
+        legacy_path = os.path.join(model_dir, name)
+        if os.path.exists(legacy_path):
+            os.remove(legacy_path)
+    return manifest
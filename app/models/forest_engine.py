@@ -0,0 +1,235 @@
+import numpy as np
+
+from app.models.array_file import read_array_file, write_array_file
+
+ENGINE_ARRAYS = ('feature', 'threshold', 'children', 'value', 'roots')
+
+
+class CompiledForest:
+    """A fitted tree ensemble flattened into contiguous node arrays.
+
+    All trees share one set of arrays: split feature, threshold, leaf
+    value, the side missing (NaN) inputs take at each split and a child
+    table holding node ``i``'s right and left child at ``2 * i`` and
+    ``2 * i + 1``. Leaves point at themselves and never move, so scoring
+    is ``max_depth`` rounds of array lookups that advance every tree (and
+    every row) at once, with no per-tree Python calls, input validation
+    or thread dispatch. An optional StandardScaler is applied first with
+    the same float64 arithmetic sklearn uses, and inputs are rounded to
+    float32 before comparison as sklearn trees do, so predictions match
+    ``model.predict`` exactly.
+
+    ``compact()`` gives the artifact form saved with ``save()``: float32
+    thresholds and values with redundant splits pruned. ``load()``
+    memory-maps it.
+    """
+
+    def __init__(self, feature, threshold, children, value, roots, max_depth, n_features,
+                 mean=None, scale=None, weight=None, missing_left=None):
+        self.feature = feature
+        self.threshold = threshold
+        self.children = children
+        self.value = value
+        self.roots = roots
+        self.max_depth = max_depth
+        self.n_features = n_features
+        self.mean = mean
+        self.scale = scale
+        # Training samples per node; only needed to prune, so never saved
+        self.weight = weight
+        # sklearn's missing_go_to_left per node; None for engines saved before it was recorded
+        self.missing_left = missing_left
+
+    @classmethod
+    def from_estimator(cls, model, scaler=None):
+        """Compile a fitted single-output forest (or single tree) regressor"""
+        if hasattr(model, 'classes_'):
+            raise ValueError("Only regressors can be compiled")
+        trees = [estimator.tree_ for estimator in getattr(model, 'estimators_', [model])]
+        if any(tree.n_outputs != 1 for tree in trees):
+            raise ValueError("Only single-output tree models can be compiled")
+        sizes = [tree.node_count for tree in trees]
+        offsets = np.concatenate([[0], np.cumsum(sizes)[:-1]]).astype(np.int64)
+        total = int(sum(sizes))
+
+        feature = np.zeros(total, dtype=np.intp)
+        threshold = np.full(total, np.inf, dtype=np.float64)
+        children = np.empty(2 * total, dtype=np.intp)
+        value = np.empty(total, dtype=np.float64)
+        weight = np.empty(total, dtype=np.float64)
+        missing_left = np.zeros(total, dtype=bool)
+        for tree, offset in zip(trees, offsets):
+            nodes = np.arange(tree.node_count) + offset
+            leaf = tree.children_left < 0
+            feature[nodes] = np.where(leaf, 0, tree.feature)
+            threshold[nodes] = np.where(leaf, np.inf, tree.threshold)
+            children[2 * nodes] = np.where(leaf, nodes, tree.children_right + offset)
+            children[2 * nodes + 1] = np.where(leaf, nodes, tree.children_left + offset)
+            value[nodes] = tree.value[:, 0, 0]
+            weight[nodes] = tree.weighted_n_node_samples
+            # sklearn < 1.3 has no missing-value routing (and rejects NaN input)
+            missing_left[nodes] = getattr(tree, 'missing_go_to_left', False)
+
+        mean = scale = None
+        if scaler is not None:
+            mean = getattr(scaler, 'mean_', None)
+            scale = getattr(scaler, 'scale_', None)
+        return cls(feature, threshold, children, value, offsets.astype(np.intp),
+                   max(tree.max_depth for tree in trees), trees[0].n_features, mean, scale, weight, missing_left)
+
+    @property
+    def n_trees(self):
+        return len(self.roots)
+
+    def _prepare(self, X):
+        X = np.array(X, dtype=np.float64, ndmin=2)
+        if X.shape[1] != self.n_features:
+            raise ValueError(f"Expected {self.n_features} features, got {X.shape[1]}")
+        if self.mean is not None:
+            X -= self.mean
+        if self.scale is not None:
+            X /= self.scale
+        # sklearn trees compare float32 inputs against float64 thresholds
+        # (compacted thresholds are float32 themselves)
+        return X.astype(np.float32).astype(self.threshold.dtype)
+
+    def predict(self, X):
+        """Mean leaf value over all trees for each row of ``X`` (one row or a small batch)"""
+        X = self._prepare(X)
+        feature, threshold, children, missing_left = self.feature, self.threshold, self.children, self.missing_left
+        # x <= threshold goes left, as in sklearn. NaN fails every comparison, so
+        # rows with NaN also take the side sklearn recorded per node (missing_go_to_left)
+        missing = bool(np.isnan(X).any())
+        if missing and missing_left is None:
+            raise ValueError("This compiled model cannot route missing values; recompile it from the estimator")
+        if len(X) == 1:
+            # Single row: 1-D gathers only, the single-prediction hot path
+            x = X[0]
+            nodes = self.roots
+            for _ in range(self.max_depth):
+                values = x[feature[nodes]]
+                go_left = values <= threshold[nodes]
+                if missing:
+                    go_left |= np.isnan(values) & missing_left[nodes]
+                nodes = children[2 * nodes + go_left]
+            return np.array([self.value[nodes].sum(dtype=np.float64) / self.n_trees])
+
+        rows = np.arange(len(X))[:, None]
+        nodes = np.broadcast_to(self.roots, (len(X), self.n_trees))
+        for _ in range(self.max_depth):
+            values = X[rows, feature[nodes]]
+            go_left = values <= threshold[nodes]
+            if missing:
+                go_left |= np.isnan(values) & missing_left[nodes]
+            nodes = children[2 * nodes + go_left]
+        return self.value[nodes].sum(axis=1, dtype=np.float64) / self.n_trees
+
+    def predict_one(self, x):
+        """Prediction for a single feature vector, as a float"""
+        return float(self.predict(x)[0])
+
+    def unscaled(self):
+        """Engine over the same node arrays that expects already-scaled input, like the sklearn model"""
+        return CompiledForest(self.feature, self.threshold, self.children, self.value, self.roots,
+                              self.max_depth, self.n_features, weight=self.weight, missing_left=self.missing_left)
+
+    @property
+    def node_count(self):
+        return len(self.feature)
+
+    def compact(self, prune_tolerance=0.0):
+        """Smaller copy for storage: float32 thresholds and values.
+
+        Thresholds are rounded down to float32, which decides every split
+        exactly as before, since inputs are float32 anyway. Values lose
+        float64 precision (about 1e-7 relative). A split whose two children
+        are leaves with values at most ``prune_tolerance`` apart is replaced
+        by a leaf holding their sample-weighted mean, repeatedly; with the
+        default of 0 only splits that cannot change a prediction go. Indices
+        stay pointer-sized: narrower ones would have to be widened on every
+        lookup. Pruning needs node weights, so it only applies to engines
+        compiled from a model, not to loaded ones.
+        """
+        threshold = self.threshold.astype(np.float32)
+        above = threshold > self.threshold
+        threshold[above] = np.nextafter(threshold[above], np.float32(-np.inf))
+        value = self.value.astype(np.float32)
+        feature, children = self.feature.copy(), self.children.copy()
+
+        nodes = np.arange(self.node_count)
+        if self.weight is not None:
+            weight = self.weight.copy()
+            while True:
+                leaf = children[1::2] == nodes
+                right, left = children[0::2], children[1::2]
+                redundant = (~leaf & leaf[left] & leaf[right]
+                             & (np.abs(value[left] - value[right]) <= prune_tolerance))
+                if not redundant.any():
+                    break
+                l, r = left[redundant], right[redundant]
+                weight[redundant] = weight[l] + weight[r]
+                value[redundant] = (value[l] * weight[l] + value[r] * weight[r]) / weight[redundant]
+                children[0::2][redundant] = nodes[redundant]
+                children[1::2][redundant] = nodes[redundant]
+                feature[redundant] = 0
+                threshold[redundant] = np.inf
+
+        # Keep only nodes still reachable from the roots, renumbered in order
+        reachable = np.zeros(self.node_count, dtype=bool)
+        frontier, depth = self.roots, 0
+        while True:
+            reachable[frontier] = True
+            frontier = np.unique(children[np.concatenate([2 * frontier, 2 * frontier + 1])])
+            frontier = frontier[~reachable[frontier]]
+            if not len(frontier):
+                break
+            depth += 1
+        new_ids = np.cumsum(reachable) - 1
+        kept_children = np.empty(2 * int(reachable.sum()), dtype=np.intp)
+        kept_children[0::2] = new_ids[children[0::2][reachable]]
+        kept_children[1::2] = new_ids[children[1::2][reachable]]
+        missing_left = self.missing_left[reachable] if self.missing_left is not None else None
+        return CompiledForest(
+            feature[reachable], threshold[reachable], kept_children, value[reachable],
+            new_ids[self.roots].astype(np.intp), depth, self.n_features, self.mean, self.scale,
+            missing_left=missing_left
+        )
+
+    def to_arrays(self):
+        """(header, arrays) describing the engine, for ``write_array_file`` or a model bundle"""
+        arrays = {name: getattr(self, name) for name in ENGINE_ARRAYS}
+        if self.mean is not None:
+            arrays['mean'] = self.mean
+        if self.scale is not None:
+            arrays['scale'] = self.scale
+        if self.missing_left is not None:
+            arrays['missing_left'] = self.missing_left
+        return {'max_depth': self.max_depth, 'n_features': self.n_features}, arrays
+
+    @classmethod
+    def from_arrays(cls, header, arrays):
+        """Engine over arrays produced by ``to_arrays()`` (used as is, e.g. views of a mapped file)"""
+        return cls(*(arrays[name] for name in ENGINE_ARRAYS), header['max_depth'], header['n_features'],
+                   arrays.get('mean'), arrays.get('scale'), missing_left=arrays.get('missing_left'))
+
+    def save(self, path):
+        """Write the engine as one memory-mappable array file"""
+        header, arrays = self.to_arrays()
+        write_array_file(path, arrays, header)
+
+    @classmethod
+    def load(cls, path):
+        """Map an engine saved with ``save()``; its arrays are read-only views of the file"""
+        header, arrays = read_array_file(path)
+        return cls.from_arrays(header, arrays)
+
+
+def compile_model(model, scaler=None):
+    """CompiledForest for ``model``, or None if it is not a tree model this engine supports"""
+    if not hasattr(model, 'estimators_') and not hasattr(model, 'tree_'):
+        return None
+    try:
+        return CompiledForest.from_estimator(model, scaler)
+    except (AttributeError, ValueError) as e:
+        print(f"[WARN] Model could not be compiled for fast inference: {e}")
+        return None
@@ -0,0 +1,132 @@
+import os
+import threading
+import time
+
+from config import Config
+from app.models.bundle import CURRENT_BUNDLE, ModelBundle, publish_bundle, read_bundle
+from app.models.forest_engine import compile_model
+
+# Separate artifacts written before model bundles; still loaded when no bundle is promoted
+MODEL_FILES = ('rainfall_model.pkl', 'scaler.pkl', 'location_encoder.pkl', 'season_encoder.pkl')
+
+EMPTY_BUNDLE = ModelBundle(None, None, None, None, None, None, None)
+
+
+class ModelRegistry:
+    """Process-wide cache of the model bundle with hot reload on promotion.
+
+    The bundle is loaded once and served from memory. At most every
+    ``check_interval`` seconds the current bundle file is stat'ed; when a
+    new version has been promoted it is loaded and swapped in with a
+    single reference assignment, so readers always see a complete bundle.
+    """
+
+    def __init__(self, model_dir=None, check_interval=None):
+        self.model_dir = model_dir or Config.MODEL_DIR
+        self.check_interval = Config.MODEL_RELOAD_INTERVAL if check_interval is None else check_interval
+        self._bundle = EMPTY_BUNDLE
+        self._signature = None
+        self._last_check = None
+        self._lock = threading.Lock()
+
+    def _paths(self):
+        current = os.path.join(self.model_dir, CURRENT_BUNDLE)
+        if os.path.lexists(current):
+            return [current]
+        return [os.path.join(self.model_dir, name) for name in MODEL_FILES]
+
+    def _current_signature(self):
+        """Return (inode, mtime_ns, size) for every artifact, or None if any is missing/empty"""
+        signature = []
+        for path in self._paths():
+            try:
+                # Follows the current link, so promoting another version changes the inode
+                stat = os.stat(path)
+            except OSError:
+                return None
+            if stat.st_size == 0:
+                return None
+            signature.append((stat.st_ino, stat.st_mtime_ns, stat.st_size))
+        return tuple(signature)
+
+    def _load(self, signature):
+        """Load the bundle (or the legacy artifacts); returns None if they cannot be read"""
+        paths = self._paths()
+        try:
+            if len(paths) == 1:
+                # One open and one mmap; forest arrays are shared page-cache pages
+                return read_bundle(paths[0])
+            import joblib
+            model, scaler, location_encoder, season_encoder = [joblib.load(path) for path in paths]
+        except Exception as e:
+            print(f"Error loading model files: {e}")
+            return None
+        version = max(mtime for _, mtime, _ in signature)
+        return ModelBundle(model, scaler, location_encoder, season_encoder, version,
+                           compile_model(model, scaler), None)
+
+    def get(self):
+        """Return the current ModelBundle, reloading it if the artifacts changed"""
+        now = time.monotonic()
+        if self._last_check is not None and now - self._last_check < self.check_interval:
+            return self._bundle
+
+        with self._lock:
+            # Another thread may have refreshed while we waited for the lock
+            if self._last_check is not None and time.monotonic() - self._last_check < self.check_interval:
+                return self._bundle
+            self._refresh()
+            self._last_check = time.monotonic()
+        return self._bundle
+
+    def reload(self):
+        """Force a re-check of the artifacts regardless of the check interval"""
+        with self._lock:
+            self._signature = None
+            self._refresh()
+            self._last_check = time.monotonic()
+        return self._bundle
+
+    def _refresh(self):
+        signature = self._current_signature()
+        if signature == self._signature:
+            return
+        if signature is None:
+            if self._signature is not None or self._last_check is None:
+                print(f"Model files missing or empty in {self.model_dir}")
+            self._bundle = EMPTY_BUNDLE
+            self._signature = None
+            return
+
+        bundle = self._load(signature)
+        # Only accept the bundle if nothing was promoted underneath us,
+        # otherwise retry on the next check.
+        if bundle is None or self._current_signature() != signature:
+            return
+        self._bundle = bundle
+        self._signature = signature
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_model_registry():
+    """Return the registry shared by every request handled in this worker"""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = ModelRegistry()
+    return _registry
+
+
+def save_model_components(model, scaler, location_encoder, season_encoder, model_dir=None,
+                          source_hash=None, metrics=None):
+    """Publish the model and its preprocessing as a new bundle version.
+
+    See ``app.models.bundle.publish_bundle``: one file is written, then
+    promoted atomically, so a registry never loads a mismatched set.
+    Returns the bundle manifest.
+    """
+    return publish_bundle(model, scaler, location_encoder, season_encoder, model_dir, source_hash, metrics)
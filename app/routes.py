@@ -1,12 +1,11 @@
-from flask import Blueprint, render_template, request, flash, jsonify, send_file
+from flask import Blueprint, render_template, request, flash, jsonify, Response, stream_with_context
 from datetime import datetime
 import os
 import json
-import csv
-import io
-import pandas as pd
 from config import Config
 from app.utils.data_processing import predict_rainfall, calculate_rain_probability, get_weather_description
+from app.utils.prediction_history import get_prediction_history
+from app.utils.prediction_log import get_prediction_log
 
 # Create a Blueprint for our routes
 main = Blueprint('main', __name__)
@@ -54,8 +53,8 @@ def predict():
             print(f"Prediction: {prediction}mm, Probability: {probability}%")
             
             # Store prediction in history
-            prediction_history.append({
-                'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            record_prediction({
+                'timestamp': datetime.now().timestamp(),
                 'location': location,
                 'temperature': temperature,
                 'humidity': humidity,
@@ -124,31 +123,108 @@ def get_current_weather(location):
             'message': str(e)
         })
 
-# Store predictions history in memory (in production, use a database)
-prediction_history = []
+@main.route('/api/upstream-status')
+def get_upstream_status():
+    """API endpoint exposing per-host HTTP latency, error counts and circuit state"""
+    from app.utils.http_client import get_http_client
+    return jsonify({'success': True, 'hosts': get_http_client().snapshot()})
+
+@main.route('/api/locations/suggest')
+def suggest_locations():
+    """API endpoint for location autocomplete from the offline gazetteer"""
+    from app.utils.gazetteer import get_gazetteer
+    
+    query = request.args.get('q', '')
+    limit = min(request.args.get('limit', 10, type=int), 50)
+    return jsonify({
+        'success': True,
+        'query': query,
+        'suggestions': get_gazetteer().suggest(query, limit)
+    })
+
+@main.route('/api/predict/batch', methods=['POST'])
+def predict_batch():
+    """API endpoint to score many rows in one vectorized pass (JSON or NDJSON body)"""
+    from app.utils.batch_prediction import score_rows
+    
+    try:
+        if request.mimetype in ('application/x-ndjson', 'application/ndjson'):
+            rows = [json.loads(line) for line in request.get_data(as_text=True).splitlines() if line.strip()]
+        else:
+            payload = request.get_json(silent=True)
+            rows = payload.get('rows') if isinstance(payload, dict) else payload
+        if not isinstance(rows, list):
+            raise ValueError('Request body must be a list of rows or an object with a "rows" list')
+        if len(rows) > Config.BATCH_PREDICTION_MAX_ROWS:
+            raise ValueError(f'At most {Config.BATCH_PREDICTION_MAX_ROWS} rows can be scored per request')
+        
+        results = score_rows(rows)
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+    
+    return jsonify({
+        'success': True,
+        'count': len(results),
+        'predictions': results
+    })
+
+def record_prediction(record):
+    """Keep a prediction in this worker's ring buffer and queue it for the durable log"""
+    get_prediction_history().append(record)
+    prediction_log = get_prediction_log()
+    if prediction_log is not None:
+        prediction_log.enqueue(record)
+
+def recent_predictions(n):
+    """Newest predictions from the durable log (all workers), or this worker's buffer"""
+    prediction_log = get_prediction_log()
+    if prediction_log is None:
+        return get_prediction_history().tail(n)
+    prediction_log.flush(timeout=1)
+    return prediction_log.tail(n)
 
 @main.route('/export-csv')
 def export_csv():
-    """Export prediction history to CSV"""
-    if not prediction_history:
+    """Stream prediction history as CSV, NDJSON or Parquet, optionally filtered and gzipped"""
+    from app.utils.prediction_export import EXPORT_FORMATS, check_export_format, export_stream, parse_time_bound
+    
+    fmt = request.args.get('format', 'csv').lower()
+    compress = request.args.get('compress', '').lower() == 'gzip'
+    location = request.args.get('location', '').strip() or None
+    try:
+        start = parse_time_bound(request.args.get('start'))
+        end = parse_time_bound(request.args.get('end'))
+        check_export_format(fmt)
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+    except ImportError:
+        return jsonify({'success': False, 'message': 'Parquet export requires pyarrow'}), 501
+    
+    prediction_log = get_prediction_log()
+    if prediction_log is not None:
+        prediction_log.flush(timeout=1)
+        has_predictions = prediction_log.has_records()
+    else:
+        has_predictions = len(get_prediction_history()) > 0
+    
+    if not has_predictions:
         flash('No predictions to export', 'warning')
         return render_template('predict.html', today_date=datetime.now().strftime('%Y-%m-%d'))
     
-    # Create CSV in memory
-    output = io.StringIO()
-    writer = csv.DictWriter(output, fieldnames=['timestamp', 'location', 'temperature', 'humidity', 
-                                                  'pressure', 'wind_speed', 'cloud_cover', 'season', 
-                                                  'predicted_rainfall', 'probability'])
-    writer.writeheader()
-    writer.writerows(prediction_history)
+    # Records are read and encoded chunk by chunk while the response is sent
+    if prediction_log is not None:
+        records = prediction_log.query(start=start, end=end, location=location)
+    else:
+        records = get_prediction_history().query(start=start, end=end, location=location)
     
-    # Create response
-    output.seek(0)
-    return send_file(
-        io.BytesIO(output.getvalue().encode()),
-        mimetype='text/csv',
-        as_attachment=True,
-        download_name=f'rainfall_predictions_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv'
+    mimetype, extension = EXPORT_FORMATS[fmt]
+    filename = f'rainfall_predictions_{datetime.now().strftime("%Y%m%d_%H%M%S")}.{extension}'
+    if compress:
+        mimetype, filename = 'application/gzip', filename + '.gz'
+    return Response(
+        stream_with_context(export_stream(records, fmt, compress)),
+        mimetype=mimetype,
+        headers={'Content-Disposition': f'attachment; filename={filename}'}
     )
 
 @main.route('/analytics')
@@ -160,23 +236,17 @@ def analytics():
 def get_analytics_data():
     """API endpoint for analytics data"""
     try:
-        # Load processed data for analytics
-        data_path = os.path.join('data', 'processed', 'combined_weather_data.csv')
-        if os.path.exists(data_path):
-            df = pd.read_csv(data_path)
-            
-            # Calculate statistics
-            monthly_rainfall = df.groupby('month')['precipitation_sum'].mean().to_dict()
-            seasonal_rainfall = df.groupby('season')['precipitation_sum'].mean().to_dict()
-            location_rainfall = df.groupby('location')['precipitation_sum'].mean().head(10).to_dict()
-            
+        # Aggregates are materialized when the data is processed and cached in memory
+        from app.utils.analytics_cache import get_analytics_cache
+        aggregates = get_analytics_cache().get()
+        if aggregates is not None:
             return jsonify({
                 'success': True,
-                'monthly_rainfall': monthly_rainfall,
-                'seasonal_rainfall': seasonal_rainfall,
-                'location_rainfall': location_rainfall,
-                'total_records': len(df),
-                'prediction_history': prediction_history[-50:]  # Last 50 predictions
+                'monthly_rainfall': aggregates['monthly_rainfall'],
+                'seasonal_rainfall': aggregates['seasonal_rainfall'],
+                'location_rainfall': aggregates['location_rainfall'],
+                'total_records': aggregates['total_records'],
+                'prediction_history': recent_predictions(50)  # Last 50 predictions
             })
         else:
             return jsonify({'success': False, 'message': 'Data not available'})
@@ -222,26 +222,34 @@ function initializeFormValidation() {
             });
         });
         
-        // Location input with auto-complete effect
+        // Location input with auto-complete from the offline gazetteer
         const locationInput = document.getElementById('location');
         if (locationInput) {
+            let suggestTimer = null;
             locationInput.addEventListener('input', function() {
-                if (this.value.length > 2) {
-                    // Simulate location search with loading effect
-                    const loadingIndicator = document.createElement('div');
-                    loadingIndicator.className = 'location-loading';
-                    loadingIndicator.innerHTML = '<span class="spinner-small"></span>';
-                    
-                    // Only add if not already present
-                    if (!this.parentElement.querySelector('.location-loading')) {
-                        this.parentElement.appendChild(loadingIndicator);
-                        
-                        // Remove after simulated search
-                        setTimeout(() => {
-                            loadingIndicator.remove();
-                        }, 800);
-                    }
+                const query = this.value.trim();
+                const datalist = document.getElementById('location-suggestions');
+                if (!datalist || query.length < 2) {
+                    return;
                 }
+                
+                clearTimeout(suggestTimer);
+                suggestTimer = setTimeout(() => {
+                    fetch(`/api/locations/suggest?q=${encodeURIComponent(query)}`)
+                        .then(response => response.json())
+                        .then(result => {
+                            datalist.innerHTML = '';
+                            (result.suggestions || []).forEach(place => {
+                                const option = document.createElement('option');
+                                option.value = place.name;
+                                if (place.district) {
+                                    option.label = `${place.name} (${place.district})`;
+                                }
+                                datalist.appendChild(option);
+                            });
+                        })
+                        .catch(error => console.log('Location suggestions unavailable', error));
+                }, 150);
             });
             
             // Auto-fill weather data when location is selected
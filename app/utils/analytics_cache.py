@@ -0,0 +1,149 @@
+import json
+import os
+import threading
+
+from config import Config
+from app.utils.weather_store import manifest_path, read_store
+
+# Columns the aggregates need; the rest of the store is never touched
+AGGREGATE_COLUMNS = ['month', 'season', 'location', 'precipitation_sum']
+
+
+def file_signature(path):
+    """(mtime_ns, size) of a file, or None if it does not exist"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def compute_aggregates(df):
+    """Monthly, seasonal and per-location mean rainfall for the analytics dashboard"""
+    return {
+        'monthly_rainfall': df.groupby('month', observed=True)['precipitation_sum'].mean().to_dict(),
+        'seasonal_rainfall': df.groupby('season', observed=True)['precipitation_sum'].mean().to_dict(),
+        'location_rainfall': df.groupby('location', observed=True)['precipitation_sum'].mean().head(10).to_dict(),
+        'total_records': len(df)
+    }
+
+
+def write_aggregates(df, data_root, sidecar_path=None):
+    """Materialize the aggregates of ``df`` (the contents of the store at ``data_root``).
+
+    The sidecar records the store manifest's signature so readers can tell
+    when it no longer matches the data.
+    """
+    aggregates = compute_aggregates(df)
+    _write_sidecar(sidecar_path or Config.ANALYTICS_AGGREGATES_PATH, aggregates,
+                   file_signature(manifest_path(data_root)))
+    return aggregates
+
+
+def partial_aggregates(df):
+    """Rainfall sums and counts per month, season and location for one slice of the data.
+
+    Partials of disjoint slices merge with ``merge_partial_aggregates`` into
+    the same result ``compute_aggregates`` gives for their union.
+    """
+    partials = {'rows': len(df)}
+    for column in ('month', 'season', 'location'):
+        grouped = df.groupby(column, observed=True)['precipitation_sum'].agg(['sum', 'count'])
+        partials[column] = {str(key): [float(total), int(count)]
+                            for key, (total, count) in zip(grouped.index, grouped.to_numpy())}
+    return partials
+
+
+def merge_partial_aggregates(partials):
+    """Combine ``partial_aggregates`` results into the ``compute_aggregates`` layout"""
+    totals = {'month': {}, 'season': {}, 'location': {}}
+    for partial in partials:
+        for column, groups in totals.items():
+            for key, (total, count) in partial[column].items():
+                previous_total, previous_count = groups.get(key, (0.0, 0))
+                groups[key] = (previous_total + total, previous_count + count)
+    means = {
+        column: {key: total / count for key, (total, count) in sorted(groups.items()) if count}
+        for column, groups in totals.items()
+    }
+    return {
+        'monthly_rainfall': {int(key): value for key, value in sorted(means['month'].items(), key=lambda item: int(item[0]))},
+        'seasonal_rainfall': means['season'],
+        'location_rainfall': dict(list(means['location'].items())[:10]),
+        'total_records': sum(partial['rows'] for partial in partials)
+    }
+
+
+def write_merged_aggregates(partials, data_root, sidecar_path=None):
+    """Like ``write_aggregates``, from per-partition partials instead of the full data"""
+    aggregates = merge_partial_aggregates(partials)
+    _write_sidecar(sidecar_path or Config.ANALYTICS_AGGREGATES_PATH, aggregates,
+                   file_signature(manifest_path(data_root)))
+    return aggregates
+
+
+def _write_sidecar(path, aggregates, signature):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(dict(aggregates, source=signature), f)
+    os.replace(tmp_path, path)
+
+
+class AnalyticsCache:
+    """In-memory analytics aggregates, invalidated when the processed data changes.
+
+    Each read only stats the combined store's manifest. On a change the
+    sidecar written by ``scripts/process_data.py`` is loaded; if it is
+    missing or was built from a different version of the data, the
+    aggregates are recomputed once and the sidecar rewritten.
+    """
+
+    def __init__(self, data_root=None, sidecar_path=None):
+        self.data_root = data_root or Config.COMBINED_DATA_DIR
+        self.sidecar_path = sidecar_path or Config.ANALYTICS_AGGREGATES_PATH
+        self._signature = None
+        self._aggregates = None
+        self._lock = threading.Lock()
+
+    def get(self):
+        """Return the aggregates dict, or None if the processed data is missing"""
+        signature = file_signature(manifest_path(self.data_root))
+        if signature is None:
+            return None
+        if signature == self._signature:
+            return self._aggregates
+        with self._lock:
+            if signature != self._signature:
+                self._aggregates = self._load(signature)
+                self._signature = signature
+            return self._aggregates
+
+    def _load(self, signature):
+        try:
+            with open(self.sidecar_path) as f:
+                payload = json.load(f)
+            if payload.pop('source', None) == signature:
+                return payload
+        except (OSError, ValueError):
+            pass
+        print("Analytics aggregates missing or stale; recomputing from processed data")
+        aggregates = compute_aggregates(read_store(self.data_root, columns=AGGREGATE_COLUMNS))
+        try:
+            _write_sidecar(self.sidecar_path, aggregates, signature)
+        except OSError as e:
+            print(f"Could not write analytics aggregates: {e}")
+        # Same key types as a sidecar round trip (JSON object keys are strings)
+        return json.loads(json.dumps(aggregates))
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_analytics_cache():
+    """Return the analytics cache shared by this process"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = AnalyticsCache()
+    return _cache
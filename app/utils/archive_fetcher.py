@@ -0,0 +1,263 @@
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+import requests
+from config import Config
+from app.utils.http_client import get_http_client
+from app.utils.location_catalog import calendar_features
+
+# Daily variables requested from the historical archive
+DAILY_VARIABLES = ['temperature_2m_mean', 'relative_humidity_2m_mean', 'surface_pressure_mean',
+                   'wind_speed_10m_mean', 'cloud_cover_mean', 'precipitation_sum']
+
+
+class TokenBucket:
+    """Thread-safe token bucket: ``rate`` tokens per second, bursts up to ``capacity``"""
+
+    def __init__(self, rate, capacity=1):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens=1):
+        """Take ``tokens`` tokens, sleeping until they are available"""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            # Reserve the tokens now, so waiting threads queue in arrival order
+            self.tokens -= tokens
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0
+        if wait:
+            time.sleep(wait)
+
+
+class FetchReport:
+    """Outcome of a fetch run: per-location failures, request counts and throughput"""
+
+    def __init__(self):
+        self.succeeded = []
+        self.skipped = []
+        self.failed = {}
+        self.requests = 0
+        self.rows = 0
+        self.started = time.monotonic()
+        self.elapsed = 0.0
+        self._lock = threading.Lock()
+
+    def record_request(self):
+        with self._lock:
+            self.requests += 1
+
+    def summary(self):
+        total = len(self.succeeded) + len(self.failed)
+        rate = self.requests / self.elapsed if self.elapsed else 0.0
+        return (f"{len(self.succeeded)}/{total} locations, {self.rows} rows, "
+                f"{self.requests} requests in {self.elapsed:.1f}s ({rate:.2f} req/s), "
+                f"{len(self.failed)} failed, {len(self.skipped)} already up to date")
+
+
+def daily_frames(dailies, locations, season_lut, extras=None):
+    """Build raw-data frames for several locations from archive ``daily`` blocks.
+
+    All blocks are concatenated into one set of columns so dates, months
+    and seasons are derived in single vectorized passes, then split back
+    into one frame per location. Returns a list in ``locations`` order.
+    """
+    lengths = np.array([len(daily['time']) for daily in dailies])
+    offsets = np.concatenate([[0], np.cumsum(lengths)])
+    columns = [name for name in dailies[0] if all(name in daily for daily in dailies)]
+    df = pd.DataFrame({
+        name: np.concatenate([np.asarray(daily[name], dtype=object if name == 'time' else float)
+                              for daily in dailies])
+        for name in columns
+    })
+    df['location'] = np.repeat(np.asarray(locations, dtype=object), lengths)
+    for column in (extras[0] if extras else {}):
+        df[column] = np.repeat(np.asarray([extra[column] for extra in extras], dtype=object), lengths)
+    dates = df['time'].to_numpy().astype('datetime64[D]')
+    df['date'] = dates.astype('datetime64[ns]')
+    df['month'], df['day'], df['season'] = calendar_features(dates, season_lut)
+    return [df.iloc[start:end].reset_index(drop=True) for start, end in zip(offsets[:-1], offsets[1:])]
+
+
+def daily_frame(daily, location, season_lut, extra=None):
+    """Build the raw-data frame for one location from an archive ``daily`` block"""
+    return daily_frames([daily], [location], season_lut, [extra or {}])[0]
+
+
+class ArchiveFetcher:
+    """Concurrent historical-archive fetcher with a shared rate limit.
+
+    Locations are fetched on a bounded thread pool, several coordinates per
+    request. Every HTTP attempt, including retries, takes one token per
+    location from one bucket, so the run as a whole stays within the
+    upstream quota however many workers there are. Failed locations are
+    retried with jittered backoff and reported, not raised.
+    """
+
+    def __init__(self, url=None, rate=None, burst=None, workers=None, retries=None, timeout=None,
+                 backoff_base=None, backoff_max=None, batch_size=None, client=None):
+        self.url = url or Config.WEATHER_API_URL
+        self.bucket = TokenBucket(rate or Config.ARCHIVE_RATE_LIMIT, burst or Config.ARCHIVE_RATE_BURST)
+        self.workers = workers or Config.ARCHIVE_FETCH_WORKERS
+        self.retries = Config.ARCHIVE_FETCH_RETRIES if retries is None else retries
+        self.timeout = timeout or Config.ARCHIVE_TIMEOUT
+        self.backoff_base = Config.HTTP_BACKOFF_BASE if backoff_base is None else backoff_base
+        self.backoff_max = Config.HTTP_BACKOFF_MAX if backoff_max is None else backoff_max
+        self.batch_size = batch_size or Config.ARCHIVE_BATCH_SIZE
+        self.client = client or get_http_client()
+
+    def _backoff(self, attempt, error):
+        response = getattr(error, 'response', None)
+        retry_after = response.headers.get('Retry-After') if response is not None else None
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), self.backoff_max)
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def get_json(self, params, report=None, weight=1):
+        """One rate-limited archive request with per-call retries.
+
+        ``weight`` is the number of locations in the request, which is what
+        the upstream quota counts.
+        """
+        for attempt in range(self.retries + 1):
+            self.bucket.acquire(weight)
+            if report is not None:
+                report.record_request()
+            try:
+                # Retries happen here, under the rate limit, not inside the HTTP client
+                return self.client.get_json(self.url, params=params, timeout=self.timeout, retries=0)
+            except (requests.RequestException, ValueError) as e:
+                response = getattr(e, 'response', None)
+                permanent = (response is not None and 400 <= response.status_code < 500
+                             and response.status_code != 429)
+                if permanent or attempt == self.retries:
+                    raise
+                time.sleep(self._backoff(attempt, e))
+
+    def _params(self, coordinates, start_date, end_date, timezone):
+        return {
+            'latitude': ','.join(str(lat) for lat, _ in coordinates),
+            'longitude': ','.join(str(lon) for _, lon in coordinates),
+            'start_date': start_date,
+            'end_date': end_date,
+            'daily': ','.join(DAILY_VARIABLES),
+            'timezone': timezone
+        }
+
+    def fetch_location(self, lat, lon, start_date, end_date, timezone='auto', report=None):
+        """Return the archive ``daily`` block for one coordinate"""
+        data = self.get_json(self._params([(lat, lon)], start_date, end_date, timezone), report)
+        if isinstance(data, list):
+            data = data[0] if len(data) == 1 else {}
+        if 'daily' not in data:
+            raise ValueError(f"Archive response has no daily data: {data.get('reason', data)}")
+        return data['daily']
+
+    def fetch_batch(self, coordinates, start_date, end_date, timezone='auto', report=None):
+        """Fetch several coordinates in one request, falling back to single requests.
+
+        Returns one entry per coordinate: its ``daily`` block, or the
+        exception raised by its single-coordinate retry.
+        """
+        if len(coordinates) == 1:
+            batch_error, data = None, None
+        else:
+            try:
+                data = self.get_json(self._params(coordinates, start_date, end_date, timezone),
+                                     report, weight=len(coordinates))
+                batch_error = None
+            except (requests.RequestException, ValueError) as e:
+                data, batch_error = None, e
+            if isinstance(data, dict):
+                data = [data]
+            if data is not None and len(data) != len(coordinates):
+                data, batch_error = None, ValueError(
+                    f"Archive returned {len(data)} locations for a batch of {len(coordinates)}")
+            if batch_error is not None:
+                print(f"[WARN] Batch of {len(coordinates)} failed ({batch_error}); fetching singly")
+
+        results = []
+        for i, (lat, lon) in enumerate(coordinates):
+            entry = data[i] if data is not None else None
+            if isinstance(entry, dict) and 'daily' in entry:
+                results.append(entry['daily'])
+                continue
+            # Partial error (or failed batch): retry this coordinate on its own
+            try:
+                results.append(self.fetch_location(lat, lon, start_date, end_date, timezone, report))
+            except (requests.RequestException, ValueError) as e:
+                results.append(e)
+        return results
+
+    def fetch_all(self, locations, start_date, end_date, season_lut, timezone='auto',
+                  on_frame=None, extra_columns=(), manifest=None):
+        """Fetch every location concurrently and return a FetchReport.
+
+        ``locations`` maps names to dicts with ``lat``/``lon`` (plus any of
+        ``extra_columns``, copied into the frame); ``season_lut`` maps month
+        numbers to season names (see ``build_season_lut``). Locations needing the same
+        date span are requested ``batch_size`` at a time. ``on_frame(name,
+        df)`` is called on the calling thread as each location completes, so
+        writes to the store are never concurrent. With a ``manifest`` only
+        spans not yet stored are requested, and each span is recorded once
+        ``on_frame`` has saved it.
+        """
+        report = FetchReport()
+        by_span = {}
+        for name in locations:
+            spans = manifest.missing_spans(name, start_date, end_date) if manifest else [(start_date, end_date)]
+            if not spans:
+                report.skipped.append(name)
+            for span_start, span_end in spans:
+                by_span.setdefault((str(span_start), str(span_end)), []).append(name)
+        batches = [
+            (span, names[i:i + self.batch_size])
+            for span, names in by_span.items()
+            for i in range(0, len(names), self.batch_size)
+        ]
+
+        fetched = set()
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='archive-fetch') as pool:
+            futures = {
+                pool.submit(self.fetch_batch, [(locations[name]['lat'], locations[name]['lon']) for name in names],
+                            span[0], span[1], timezone, report): (span, names)
+                for span, names in batches
+            }
+            for future in as_completed(futures):
+                (span_start, span_end), names = futures[future]
+                results = future.result()
+                good = [(name, daily) for name, daily in zip(names, results) if not isinstance(daily, Exception)]
+                for name, error in zip(names, results):
+                    if isinstance(error, Exception):
+                        report.failed[name] = repr(error)
+                        print(f"[ERROR] Error fetching {name} data ({span_start} to {span_end}): {error}")
+                if not good:
+                    continue
+                frames = daily_frames(
+                    [daily for _, daily in good], [name for name, _ in good], season_lut,
+                    [{column: locations[name][column] for column in extra_columns} for name, _ in good]
+                )
+                for (name, _), df in zip(good, frames):
+                    try:
+                        if on_frame is not None:
+                            on_frame(name, df)
+                        if manifest is not None:
+                            manifest.record(name, span_start, span_end)
+                    except (ValueError, KeyError, OSError) as e:
+                        report.failed[name] = repr(e)
+                        print(f"[ERROR] Error saving {name} data ({span_start} to {span_end}): {e}")
+                        continue
+                    fetched.add(name)
+                    report.rows += len(df)
+                    print(f"[OK] Saved {name} data ({span_start} to {span_end}, {len(df)} days)")
+        report.succeeded = [name for name in locations if name in fetched and name not in report.failed]
+        report.elapsed = time.monotonic() - report.started
+        return report
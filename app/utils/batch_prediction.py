@@ -0,0 +1,204 @@
+import numpy as np
+from config import Config
+from app.utils.data_processing import SEASON_MULTIPLIERS, get_keyword_multiplier, get_location_multiplier
+from app.utils.geocoding import geocode_offline
+from app.utils.location_features import get_location_feature_table
+
+# Fields every batch row must provide as numbers
+NUMERIC_FIELDS = ['temperature', 'humidity', 'pressure', 'wind_speed', 'cloud_cover']
+
+def round_half_even(values, decimals=2):
+    """Round like Python's built-in round() so batch results match the scalar path.
+
+    np.round scales by 10**decimals before rounding, which disagrees with
+    round() for values sitting on a .5 boundary; those few entries are
+    rounded with round() itself.
+    """
+    values = np.asarray(values, dtype=float)
+    rounded = np.round(values, decimals)
+    scaled = values * 10 ** decimals
+    near_half = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    if near_half.any():
+        rounded[near_half] = [round(v, decimals) for v in values[near_half].tolist()]
+    return rounded
+
+def rule_based_prediction_batch(humidity, cloud_cover, temperature, pressure):
+    """Vectorized rule_based_prediction over equally sized arrays"""
+    humidity = np.asarray(humidity, dtype=float)
+    cloud_cover = np.asarray(cloud_cover, dtype=float)
+    temperature = np.asarray(temperature, dtype=float)
+    pressure = np.asarray(pressure, dtype=float)
+
+    # Primary factor: humidity and cloud cover tiers (first matching tier wins)
+    base_prediction = np.select(
+        [
+            (humidity > 85) & (cloud_cover > 80),
+            (humidity > 75) & (cloud_cover > 70),
+            (humidity > 65) & (cloud_cover > 60),
+            (humidity > 50) & (cloud_cover > 40),
+        ],
+        [
+            12 + (humidity - 85) * 0.4 + (cloud_cover - 80) * 0.3,
+            6 + (humidity - 75) * 0.3 + (cloud_cover - 70) * 0.2,
+            2 + (humidity - 65) * 0.2 + (cloud_cover - 60) * 0.15,
+            0.5 + (humidity - 50) * 0.1 + (cloud_cover - 40) * 0.05,
+        ],
+        default=0.0
+    )
+
+    # Temperature adjustments (optimal rain temp 10-25°C)
+    temp_factor = np.select(
+        [
+            (temperature >= 10) & (temperature <= 25),
+            temperature < 10,
+            temperature > 25,
+        ],
+        [
+            1.0,
+            0.8 + (temperature / 50),
+            1.2 - ((temperature - 25) * 0.02),
+        ],
+        default=0.6
+    )
+    base_prediction = base_prediction * temp_factor
+
+    # Pressure adjustments (low pressure = more rain)
+    pressure_factor = np.select(
+        [pressure < 990, pressure < 1005, pressure < 1015, pressure < 1025],
+        [1.4, 1.2, 1.0, 0.8],
+        default=0.6
+    )
+    base_prediction = base_prediction * pressure_factor
+
+    # Same input-combination variability as the scalar rules
+    variability = np.mod(humidity + cloud_cover + np.abs(temperature - 20) + np.abs(pressure - 1013), 10)
+    base_prediction = base_prediction + variability * 0.1
+
+    return round_half_even(np.maximum(0, base_prediction))
+
+def calculate_rain_probability_batch(predictions):
+    """Vectorized calculate_rain_probability"""
+    predictions = np.asarray(predictions, dtype=float)
+    return np.select(
+        [predictions == 0, predictions < 1, predictions < 5, predictions < 10, predictions < 20],
+        [0, 20, 40, 60, 80],
+        default=95
+    )
+
+def get_weather_description_batch(predictions, cloud_cover):
+    """Vectorized get_weather_description"""
+    predictions = np.asarray(predictions, dtype=float)
+    cloud_cover = np.asarray(cloud_cover, dtype=float)
+    dry = predictions == 0
+    return np.select(
+        [
+            dry & (cloud_cover < 30),
+            dry & (cloud_cover < 60),
+            dry,
+            predictions < 1,
+            predictions < 5,
+            predictions < 15,
+        ],
+        [
+            "Clear skies",
+            "Partly cloudy",
+            "Cloudy but no rain expected",
+            "Light drizzle possible",
+            "Light rain expected",
+            "Moderate rain expected",
+        ],
+        default="Heavy rain expected"
+    )
+
+def rows_to_columns(rows):
+    """Convert a list of row dicts into column arrays, validating numeric fields.
+
+    Raises ValueError naming the first offending row.
+    """
+    columns = {field: np.empty(len(rows), dtype=float) for field in NUMERIC_FIELDS}
+    locations = []
+    seasons = []
+    dates = []
+    for i, row in enumerate(rows):
+        if not isinstance(row, dict):
+            raise ValueError(f"Row {i} must be an object")
+        try:
+            for field in NUMERIC_FIELDS:
+                columns[field][i] = float(row[field])
+        except (KeyError, TypeError, ValueError):
+            raise ValueError(f"Row {i} must provide numeric values for {', '.join(NUMERIC_FIELDS)}")
+        # JSON parsers accept NaN and Infinity, which would score as NaN
+        if not all(np.isfinite(columns[field][i]) for field in NUMERIC_FIELDS):
+            raise ValueError(f"Row {i} must provide finite values for {', '.join(NUMERIC_FIELDS)}")
+        # A JSON null is treated like a missing field, not the string 'None'
+        locations.append(str(row.get('location') or ''))
+        seasons.append(str(row.get('season') or ''))
+        dates.append(str(row.get('date') or ''))
+    columns['location'] = locations
+    columns['season'] = seasons
+    columns['date'] = dates
+    return columns
+
+def location_multipliers(locations):
+    """get_location_multiplier for each location, with at most BATCH_GEOCODE_LOOKUPS network geocodes.
+
+    Locations past the budget that neither the feature table, the
+    gazetteer nor the geocode cache knows are scored like an unresolved
+    location: climate factor 1.0 times the keyword multiplier.
+    """
+    table = get_location_feature_table()
+    lookups = 0
+    multipliers = []
+    for location in locations:
+        if table.location_multiplier(location) is None and geocode_offline(location) is None:
+            if lookups >= Config.BATCH_GEOCODE_LOOKUPS:
+                multipliers.append(get_keyword_multiplier(location))
+                continue
+            lookups += 1
+        multipliers.append(get_location_multiplier(location))
+    return np.array(multipliers, dtype=float)
+
+def predict_rainfall_batch(locations, seasons, temperature, humidity, pressure, cloud_cover):
+    """Vectorized predict_rainfall; returns an array of predictions in mm.
+
+    Location and season multipliers are resolved once per distinct value and
+    broadcast back to the rows, so geocoding cost scales with the number of
+    unique locations rather than rows.
+    """
+    prediction = rule_based_prediction_batch(humidity, cloud_cover, temperature, pressure)
+
+    unique_seasons, season_index = np.unique(np.asarray(seasons, dtype=str), return_inverse=True)
+    season_multiplier = np.array([SEASON_MULTIPLIERS.get(s.lower(), 1.0) for s in unique_seasons])[season_index]
+
+    unique_locations, location_index = np.unique(np.asarray(locations, dtype=str), return_inverse=True)
+    location_multiplier = location_multipliers(unique_locations)[location_index]
+
+    prediction = prediction * season_multiplier * location_multiplier
+
+    return round_half_even(np.maximum(0, prediction))
+
+def score_rows(rows):
+    """Score a list of row dicts and return one result dict per row"""
+    if not rows:
+        return []
+    columns = rows_to_columns(rows)
+    predictions = predict_rainfall_batch(
+        columns['location'], columns['season'], columns['temperature'],
+        columns['humidity'], columns['pressure'], columns['cloud_cover']
+    )
+    probabilities = calculate_rain_probability_batch(predictions)
+    descriptions = get_weather_description_batch(predictions, columns['cloud_cover'])
+
+    return [
+        {
+            'location': location,
+            'date': date,
+            'predicted_rainfall': prediction,
+            'probability': probability,
+            'description': description
+        }
+        for location, date, prediction, probability, description in zip(
+            columns['location'], columns['date'], predictions.tolist(),
+            probabilities.tolist(), descriptions.tolist()
+        )
+    ]
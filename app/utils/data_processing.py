@@ -1,33 +1,14 @@
-import pandas as pd
-import numpy as np
-import joblib
-import os
-import requests
-from config import Config
+from app.utils.geocoding import geocode
+from app.utils.keyword_matcher import get_keyword_regions
+
+# NumPy and the model stack (app.models, app.utils.location_features) are
+# imported on first use, so creating the app does not load them.
 
 def load_model_components():
-    """Load trained model and preprocessing components"""
-    try:
-        model_path = os.path.join(Config.MODEL_DIR, 'rainfall_model.pkl')
-        scaler_path = os.path.join(Config.MODEL_DIR, 'scaler.pkl')
-        location_encoder_path = os.path.join(Config.MODEL_DIR, 'location_encoder.pkl')
-        season_encoder_path = os.path.join(Config.MODEL_DIR, 'season_encoder.pkl')
-        
-        # Check if all files exist and are not empty
-        for path in [model_path, scaler_path, location_encoder_path, season_encoder_path]:
-            if not os.path.exists(path) or os.path.getsize(path) == 0:
-                print(f"Model file missing or empty: {path}")
-                return None, None, None, None
-        
-        model = joblib.load(model_path)
-        scaler = joblib.load(scaler_path)
-        location_encoder = joblib.load(location_encoder_path)
-        season_encoder = joblib.load(season_encoder_path)
-        
-        return model, scaler, location_encoder, season_encoder
-    except (FileNotFoundError, EOFError, Exception) as e:
-        print(f"Error loading model files: {e}")
-        return None, None, None, None
+    """Load trained model and preprocessing components from the in-process registry"""
+    from app.models.registry import get_model_registry
+    bundle = get_model_registry().get()
+    return bundle.model, bundle.scaler, bundle.location_encoder, bundle.season_encoder
 
 def preprocess_input(location, date, temperature, humidity, pressure, wind_speed, cloud_cover, season, time_of_day):
     """Preprocess user input for model prediction"""
@@ -38,24 +19,12 @@ def preprocess_input(location, date, temperature, humidity, pressure, wind_speed
     month = date_obj.month
     day = date_obj.day
     
-    # Load encoders
-    _, _, location_encoder, season_encoder = load_model_components()
-    
-    if location_encoder is None or season_encoder is None:
-        # Fallback encoding if models not available
-        location_encoded = hash(location.lower()) % 10
-        season_encoded = {'spring': 0, 'summer': 1, 'autumn': 2, 'winter': 3}.get(season.lower(), 0)
-    else:
-        # Use trained encoders
-        try:
-            location_encoded = location_encoder.transform([location.lower()])[0]
-        except ValueError:
-            location_encoded = 0  # Default for unknown location
-            
-        try:
-            season_encoded = season_encoder.transform([season.lower()])[0]
-        except ValueError:
-            season_encoded = 0  # Default for unknown season
+    # O(1) lookups in the precomputed per-location feature table
+    import numpy as np
+    from app.utils.location_features import get_location_feature_table
+    table = get_location_feature_table()
+    location_encoded = table.encode_location(location)
+    season_encoded = table.encode_season(season)
     
     # Create feature array
     features = np.array([[
@@ -73,84 +42,76 @@ def preprocess_input(location, date, temperature, humidity, pressure, wind_speed
     return features
 
 def get_location_coordinates(location_name):
-    """Get real coordinates for any location"""
-    try:
-        url = f"https://nominatim.openstreetmap.org/search?q={location_name}&format=json&limit=1"
-        response = requests.get(url, headers={'User-Agent': 'RainfallPredictor/1.0'}, timeout=5)
-        data = response.json()
-        if data:
-            return float(data[0]['lat']), float(data[0]['lon'])
-    except:
-        pass
-    return None, None
+    """Get real coordinates for any location (cached, see app.utils.geocoding)"""
+    return geocode(location_name)
+
+def get_climate_factor_for_latitude(lat):
+    """Latitude-based climate adjustment factor"""
+    if abs(lat) < 10:  # Tropical zone
+        return 1.4
+    elif abs(lat) < 23.5:  # Subtropical
+        return 1.2
+    elif abs(lat) < 35:  # Temperate
+        return 1.0
+    elif abs(lat) < 50:  # Cool temperate
+        return 0.9
+    else:  # Polar/subpolar
+        return 0.6
 
 def get_location_climate_factor(location_name):
     """Get climate adjustment factor based on real location data"""
     lat, lon = get_location_coordinates(location_name)
     
-    if lat and lon:
+    if lat is not None and lon is not None:
         # Latitude-based climate adjustments (more accurate)
-        if abs(lat) < 10:  # Tropical zone
-            return 1.4
-        elif abs(lat) < 23.5:  # Subtropical
-            return 1.2
-        elif abs(lat) < 35:  # Temperate
-            return 1.0
-        elif abs(lat) < 50:  # Cool temperate
-            return 0.9
-        else:  # Polar/subpolar
-            return 0.6
+        return get_climate_factor_for_latitude(lat)
     
     return 1.0  # Default if location not found
 
+# Seasonal adjustments (enhanced for Indian monsoon patterns)
+SEASON_MULTIPLIERS = {
+    'winter': 0.7,
+    'spring': 1.1, 
+    'summer': 0.8,
+    'autumn': 1.2,
+    'monsoon': 1.8,  # Peak monsoon season
+    'pre-monsoon': 1.3,
+    'post-monsoon': 1.1
+}
+
+def get_keyword_multiplier(location):
+    """Get keyword-based and regional rainfall adjustment for a location name.
+
+    Regions and keywords live in app/data/keyword_regions.json; the first
+    region (in file order) with a keyword contained in the name wins.
+    """
+    matcher, multipliers = get_keyword_regions()
+    priority = matcher.match(location.lower())
+    if priority is None:
+        return 1.0
+    return multipliers[priority]
+
+def get_location_multiplier(location):
+    """Combine the real location climate factor with keyword adjustments"""
+    # Catalog and encoder locations are precomputed
+    from app.utils.location_features import get_location_feature_table
+    multiplier = get_location_feature_table().location_multiplier(location)
+    if multiplier is not None:
+        return multiplier
+    
+    # Get real location-based climate factor
+    climate_factor = get_location_climate_factor(location)
+    
+    return climate_factor * get_keyword_multiplier(location)
+
 def predict_rainfall(location, date, temperature, humidity, pressure, wind_speed, cloud_cover, season, time_of_day):
     """Make rainfall prediction using enhanced location-aware system"""
     
     # Use improved rule-based prediction with real location data
     prediction = rule_based_prediction(humidity, cloud_cover, temperature, pressure)
     
-    # Add seasonal adjustments (enhanced for Indian monsoon patterns)
-    season_multiplier = {
-        'winter': 0.7,
-        'spring': 1.1, 
-        'summer': 0.8,
-        'autumn': 1.2,
-        'monsoon': 1.8,  # Peak monsoon season
-        'pre-monsoon': 1.3,
-        'post-monsoon': 1.1
-    }.get(season.lower(), 1.0)
-    
-    # Get real location-based climate factor
-    climate_factor = get_location_climate_factor(location)
-    
-    # Additional keyword-based and regional adjustments
-    location_lower = location.lower()
-    keyword_multiplier = 1.0
-    
-    # Karnataka-specific rainfall patterns
-    if any(word in location_lower for word in ['mangalore', 'udupi', 'karwar', 'byndoor', 'kundapur', 'honnavar', 'kumta', 'ankola', 'bhatkal']):
-        keyword_multiplier = 1.6  # Coastal Karnataka - high monsoon
-    elif any(word in location_lower for word in ['puttur', 'sullia', 'sirsi']):
-        keyword_multiplier = 1.5  # Western Ghats - very high rainfall
-    elif any(word in location_lower for word in ['chikmagalur', 'hassan', 'shimoga']):
-        keyword_multiplier = 1.4  # Hill stations - high rainfall
-    elif any(word in location_lower for word in ['bangalore', 'mysore', 'mandya', 'tumkur']):
-        keyword_multiplier = 1.2  # South Karnataka - moderate rainfall
-    elif any(word in location_lower for word in ['hubli', 'dharwad', 'belgaum', 'bagalkot']):
-        keyword_multiplier = 1.0  # North Karnataka - moderate rainfall
-    elif any(word in location_lower for word in ['bijapur', 'gulbarga', 'bidar', 'raichur', 'bellary']):
-        keyword_multiplier = 0.8  # North Karnataka plains - lower rainfall
-    elif any(word in location_lower for word in ['karnataka']):
-        keyword_multiplier = 1.2  # General Karnataka
-    elif any(word in location_lower for word in ['coast', 'beach', 'port', 'bay', 'island', 'sea']):
-        keyword_multiplier = 1.2
-    elif any(word in location_lower for word in ['mountain', 'hill', 'peak', 'valley']):
-        keyword_multiplier = 1.3
-    elif any(word in location_lower for word in ['desert', 'arid']):
-        keyword_multiplier = 0.3
-    
-    # Combine climate factor with keyword adjustments
-    location_multiplier = climate_factor * keyword_multiplier
+    season_multiplier = SEASON_MULTIPLIERS.get(season.lower(), 1.0)
+    location_multiplier = get_location_multiplier(location)
     
     prediction = prediction * season_multiplier * location_multiplier
     
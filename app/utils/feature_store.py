@@ -0,0 +1,124 @@
+import json
+import os
+import shutil
+import time
+from collections import namedtuple
+
+import numpy as np
+from config import Config
+
+# Bump when the matrix layout changes; readers refuse other versions
+FEATURE_STORE_VERSION = 1
+
+# Model input columns, in the order of the matrix columns
+FEATURE_COLUMNS = [
+    'temperature_2m_mean', 'relative_humidity_2m_mean', 'surface_pressure_mean',
+    'wind_speed_10m_mean', 'cloud_cover_mean', 'month', 'day',
+    'location_encoded', 'season_encoded'
+]
+
+MANIFEST_NAME = 'manifest.json'
+
+FeatureMatrix = namedtuple('FeatureMatrix', ['X', 'y', 'manifest'])
+
+
+def _fill(destination, tables, name):
+    start = 0
+    for table in tables:
+        for chunk in table.column(name).chunks:
+            destination[start:start + len(chunk)] = chunk.to_numpy(zero_copy_only=False)
+            start += len(chunk)
+
+
+def write_feature_matrix(tables, vocabulary, root=None, source_hash=None):
+    """Write the feature matrix and target from Arrow feature tables.
+
+    ``X.npy`` (rows x FEATURE_COLUMNS) and ``y.npy`` are float32 and filled
+    column by column straight from the tables into memory-mapped files,
+    so the matrix is never held in memory. Files go into a new generation
+    directory and the manifest naming it is replaced last, so a reader
+    never maps a half-written matrix. Older generations are removed;
+    processes still mapping them keep their pages until they let go.
+    Returns the manifest.
+    """
+    root = root or Config.FEATURE_STORE_DIR
+    rows = sum(table.num_rows for table in tables)
+    generation = f"{time.time_ns():x}"
+    directory = os.path.join(root, generation)
+    os.makedirs(directory)
+
+    X = np.lib.format.open_memmap(os.path.join(directory, 'X.npy'), mode='w+', dtype=np.float32,
+                                  shape=(rows, len(FEATURE_COLUMNS)))
+    for j, name in enumerate(FEATURE_COLUMNS):
+        _fill(X[:, j], tables, name)
+    y = np.lib.format.open_memmap(os.path.join(directory, 'y.npy'), mode='w+', dtype=np.float32, shape=(rows,))
+    _fill(y, tables, Config.TARGET_VARIABLE)
+    X.flush()
+    y.flush()
+    del X, y
+
+    manifest = {
+        'version': FEATURE_STORE_VERSION,
+        'generation': generation,
+        'feature_columns': FEATURE_COLUMNS,
+        'target': Config.TARGET_VARIABLE,
+        'rows': rows,
+        'dtype': 'float32',
+        'vocabulary': vocabulary,
+        'source_hash': source_hash,
+        'created_at': time.time()
+    }
+    path = os.path.join(root, MANIFEST_NAME)
+    with open(f"{path}.tmp", 'w') as f:
+        json.dump(manifest, f, indent=1)
+    os.replace(f"{path}.tmp", path)
+
+    for name in os.listdir(root):
+        if name != generation and os.path.isdir(os.path.join(root, name)):
+            shutil.rmtree(os.path.join(root, name), ignore_errors=True)
+    return manifest
+
+
+def load_feature_matrix(root=None):
+    """Memory-map the current feature matrix (read-only), or None if there is none.
+
+    Raises ValueError if the store was written by an incompatible version.
+    """
+    root = root or Config.FEATURE_STORE_DIR
+    try:
+        with open(os.path.join(root, MANIFEST_NAME)) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if manifest.get('version') != FEATURE_STORE_VERSION or manifest.get('feature_columns') != FEATURE_COLUMNS:
+        raise ValueError(f"Feature store in {root} has an incompatible layout; re-run scripts/process_data.py")
+    directory = os.path.join(root, manifest['generation'])
+    X = np.load(os.path.join(directory, 'X.npy'), mmap_mode='r')
+    y = np.load(os.path.join(directory, 'y.npy'), mmap_mode='r')
+    if X.shape != (manifest['rows'], len(FEATURE_COLUMNS)) or y.shape != (manifest['rows'],):
+        raise ValueError(f"Feature matrix in {directory} does not match its manifest")
+    return FeatureMatrix(X, y, manifest)
+
+
+def label_encoder(vocabulary):
+    """LabelEncoder whose codes are the positions in ``vocabulary``"""
+    from sklearn.preprocessing import LabelEncoder
+    encoder = LabelEncoder()
+    encoder.classes_ = np.array(vocabulary, dtype=object)
+    return encoder
+
+
+def predict_in_batches(model, scaler, X, rows=None, batch_rows=None):
+    """Score rows of a (memory-mapped) feature matrix a slice at a time.
+
+    ``rows`` selects row indices (default: all). Only one batch is scaled
+    in memory at a time; contiguous ranges are read as views of the map.
+    """
+    batch_rows = batch_rows or Config.FEATURE_BATCH_ROWS
+    count = len(X) if rows is None else len(rows)
+    predictions = np.empty(count, dtype=np.float64)
+    for start in range(0, count, batch_rows):
+        stop = min(start + batch_rows, count)
+        batch = X[start:stop] if rows is None else X[rows[start:stop]]
+        predictions[start:stop] = model.predict(scaler.transform(batch) if scaler is not None else batch)
+    return predictions
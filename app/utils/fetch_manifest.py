@@ -0,0 +1,85 @@
+import json
+import os
+import threading
+from datetime import date, timedelta
+
+from config import Config
+from app.utils.weather_store import location_slug
+
+ONE_DAY = timedelta(days=1)
+
+
+def _parse(value):
+    return value if isinstance(value, date) else date.fromisoformat(str(value))
+
+
+def merge_spans(spans):
+    """Merge overlapping or adjacent inclusive (start, end) date spans"""
+    merged = []
+    for start, end in sorted((_parse(s), _parse(e)) for s, e in spans):
+        if merged and start <= merged[-1][1] + ONE_DAY:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return [(start, end) for start, end in merged]
+
+
+def latest_archive_date(today=None):
+    """Most recent day the historical archive reliably has data for"""
+    return (today or date.today()) - timedelta(days=Config.ARCHIVE_LAG_DAYS)
+
+
+class FetchManifest:
+    """Record of the date spans already fetched and stored for each location.
+
+    Spans are inclusive, merged on write and saved atomically after every
+    update, so an interrupted fetch resumes from the last stored span.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or Config.FETCH_MANIFEST_PATH
+        self._lock = threading.Lock()
+        try:
+            with open(self.path) as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            stored = {}
+        self._spans = {location: merge_spans(spans) for location, spans in stored.items()}
+
+    def spans(self, location):
+        """Stored spans for a location as (start, end) date tuples"""
+        with self._lock:
+            return list(self._spans.get(location_slug(location), []))
+
+    def missing_spans(self, location, start_date, end_date):
+        """Sub-spans of [start_date, end_date] not yet stored for a location"""
+        start, end = _parse(start_date), _parse(end_date)
+        missing = []
+        cursor = start
+        for span_start, span_end in self.spans(location):
+            if span_end < cursor:
+                continue
+            if span_start > end:
+                break
+            if span_start > cursor:
+                missing.append((cursor, span_start - ONE_DAY))
+            cursor = span_end + ONE_DAY
+            if cursor > end:
+                break
+        if cursor <= end:
+            missing.append((cursor, end))
+        return missing
+
+    def record(self, location, start_date, end_date):
+        """Mark a span as stored and persist the manifest"""
+        slug = location_slug(location)
+        with self._lock:
+            self._spans[slug] = merge_spans(self._spans.get(slug, []) + [(start_date, end_date)])
+            payload = {
+                key: [[s.isoformat(), e.isoformat()] for s, e in spans]
+                for key, spans in sorted(self._spans.items())
+            }
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with open(f"{self.path}.tmp", 'w') as f:
+                json.dump(payload, f, indent=1)
+            os.replace(f"{self.path}.tmp", self.path)
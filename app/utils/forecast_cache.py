@@ -0,0 +1,86 @@
+import time
+from array import array
+from collections import OrderedDict, namedtuple
+from datetime import datetime, timedelta, timezone
+
+from config import Config
+
+# Hourly variables the form auto-fill actually reads
+CACHED_HOURLY_VARIABLES = ['relative_humidity_2m', 'surface_pressure', 'cloud_cover']
+
+ForecastEntry = namedtuple('ForecastEntry', [
+    'start', 'hourly', 'temperature', 'wind_speed', 'utc_offset', 'expires_at'
+])
+
+def next_update_boundary(now, interval=None):
+    """Epoch seconds of the next upstream model-update boundary after ``now``"""
+    interval = interval or Config.FORECAST_UPDATE_INTERVAL
+    return (int(now // interval) + 1) * interval
+
+def hour_index(entry, now):
+    """Index of the hour containing ``now`` in an entry's hourly arrays"""
+    return int((now - entry.start) // 3600)
+
+def hourly_value(entry, variable, now, default):
+    """Value of an hourly variable for the current hour, or ``default`` if out of range"""
+    values = entry.hourly.get(variable)
+    i = hour_index(entry, now)
+    if values is None or not 0 <= i < len(values) or values[i] != values[i]:
+        return default
+    return values[i]
+
+def local_date(entry, now):
+    """Calendar date at the forecast location"""
+    local = datetime.fromtimestamp(now, timezone.utc) + timedelta(seconds=entry.utc_offset)
+    return local.strftime('%Y-%m-%d')
+
+
+class ForecastCache:
+    """Forecast payloads keyed by rounded coordinates and valid-hour bucket.
+
+    Only the variables the app reads are kept, as float32 arrays. An entry
+    expires at the next model-update boundary, when upstream data may change.
+    """
+
+    def __init__(self, max_entries=None, update_interval=None):
+        self.max_entries = max_entries or Config.FORECAST_CACHE_ENTRIES
+        self.update_interval = update_interval or Config.FORECAST_UPDATE_INTERVAL
+        self._entries = OrderedDict()
+
+    def key(self, lat, lon, now):
+        return (round(lat, 2), round(lon, 2), int(now // self.update_interval))
+
+    def get(self, lat, lon, now=None):
+        """Return a cached ForecastEntry that is still valid, or None"""
+        now = time.time() if now is None else now
+        key = self.key(lat, lon, now)
+        entry = self._entries.get(key)
+        if entry is None or entry.expires_at <= now:
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def put(self, lat, lon, payload, now=None):
+        """Store the parts of an Open-Meteo payload (timeformat=unixtime) the app uses"""
+        now = time.time() if now is None else now
+        hourly = payload['hourly']
+        current = payload.get('current_weather', {})
+        entry = ForecastEntry(
+            start=hourly['time'][0],
+            hourly={
+                name: array('f', (float('nan') if v is None else v for v in hourly[name]))
+                for name in CACHED_HOURLY_VARIABLES if name in hourly
+            },
+            temperature=current.get('temperature'),
+            wind_speed=current.get('windspeed'),
+            utc_offset=payload.get('utc_offset_seconds', 0),
+            expires_at=next_update_boundary(now, self.update_interval)
+        )
+        self._entries[self.key(lat, lon, now)] = entry
+        self._entries.move_to_end(self.key(lat, lon, now))
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return entry
+
+    def __len__(self):
+        return len(self._entries)
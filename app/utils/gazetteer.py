@@ -0,0 +1,109 @@
+import csv
+import os
+import threading
+from array import array
+from bisect import bisect_left
+
+from config import Config
+from app.utils.geocoding import normalize_location_name
+
+def get_catalog_places():
+    """Places from the location catalog's gazetteer regions as (name, lat, lon, district) tuples"""
+    from app.utils.location_catalog import get_location_catalog
+
+    places = []
+    for region in get_location_catalog().values():
+        if region.gazetteer:
+            for name, coords in region.locations.items():
+                places.append((name, coords['lat'], coords['lon'], coords.get('district', '')))
+    return places
+
+def load_places_csv(path):
+    """Read places from a CSV with name, lat, lon and optional district columns"""
+    places = []
+    with open(path, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            try:
+                places.append((row['name'].strip(), float(row['lat']), float(row['lon']),
+                               (row.get('district') or '').strip()))
+            except (KeyError, TypeError, ValueError):
+                print(f"Skipping invalid gazetteer row: {row}")
+    return places
+
+
+class Gazetteer:
+    """Offline place table with a sorted-array prefix index over normalized names.
+
+    Places are stored column-wise (names, districts and float arrays for
+    coordinates) in normalized-name order, so exact lookups and prefix
+    scans are a binary search followed by a contiguous walk.
+    """
+
+    def __init__(self, places):
+        rows = {}
+        for name, lat, lon, district in places:
+            key = normalize_location_name(name)
+            if key:
+                # Later sources (e.g. an imported CSV) override earlier ones
+                rows[key] = (name, float(lat), float(lon), district or '')
+
+        self.keys = sorted(rows)
+        self.names = [rows[key][0] for key in self.keys]
+        self.districts = [rows[key][3] for key in self.keys]
+        self.lats = array('d', (rows[key][1] for key in self.keys))
+        self.lons = array('d', (rows[key][2] for key in self.keys))
+
+    def __len__(self):
+        return len(self.keys)
+
+    def _index(self, location_name):
+        key = normalize_location_name(location_name)
+        i = bisect_left(self.keys, key)
+        if key and i < len(self.keys) and self.keys[i] == key:
+            return i
+        return None
+
+    def lookup(self, location_name):
+        """Return (lat, lon) for a known place, or None"""
+        i = self._index(location_name)
+        if i is None:
+            return None
+        return self.lats[i], self.lons[i]
+
+    def suggest(self, query, limit=10):
+        """Return up to ``limit`` places whose normalized name starts with the query"""
+        prefix = normalize_location_name(query)
+        if not prefix:
+            return []
+        suggestions = []
+        i = bisect_left(self.keys, prefix)
+        while i < len(self.keys) and len(suggestions) < limit and self.keys[i].startswith(prefix):
+            suggestions.append({
+                'name': self.names[i],
+                'district': self.districts[i],
+                'lat': self.lats[i],
+                'lon': self.lons[i]
+            })
+            i += 1
+        return suggestions
+
+
+_gazetteer = None
+_gazetteer_lock = threading.Lock()
+
+def build_gazetteer(csv_path=None):
+    """Build a gazetteer from the catalogs plus the importable CSV, if present"""
+    csv_path = csv_path or Config.GAZETTEER_CSV
+    places = get_catalog_places()
+    if csv_path and os.path.exists(csv_path):
+        places.extend(load_places_csv(csv_path))
+    return Gazetteer(places)
+
+def get_gazetteer():
+    """Return the process-wide gazetteer, built on first use"""
+    global _gazetteer
+    if _gazetteer is None:
+        with _gazetteer_lock:
+            if _gazetteer is None:
+                _gazetteer = build_gazetteer()
+    return _gazetteer
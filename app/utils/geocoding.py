@@ -0,0 +1,179 @@
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from config import Config
+
+def normalize_location_name(location_name):
+    """Normalize a free-text location into a cache key ("  Udupi, KA " -> "udupi ka")"""
+    return ' '.join(re.sub(r'[^\w\s-]', ' ', str(location_name).lower()).split())
+
+def get_catalog_coordinates():
+    """Coordinates already hard-coded in the data fetch scripts, keyed by location name"""
+    from app.utils.gazetteer import get_catalog_places
+    return {name: (lat, lon) for name, lat, lon, _ in get_catalog_places()}
+
+
+class GeocodeCache:
+    """Two-level geocode cache: a bounded in-memory LRU in front of SQLite.
+
+    Entries are keyed by normalized location name. Hits store coordinates,
+    misses store (None, None) with a shorter TTL so unknown names are not
+    looked up again on every request. Seeded entries never expire. If the
+    database cannot be opened the cache falls back to an in-memory one,
+    and a failing read is treated as a miss, so geocoding never fails
+    because of its cache.
+    """
+
+    def __init__(self, db_path=None, ttl=None, negative_ttl=None, max_memory_entries=None):
+        self.db_path = db_path or Config.GEOCODE_CACHE_PATH
+        self.ttl = Config.GEOCODE_CACHE_TTL if ttl is None else ttl
+        self.negative_ttl = Config.GEOCODE_NEGATIVE_TTL if negative_ttl is None else negative_ttl
+        self.max_memory_entries = max_memory_entries or Config.GEOCODE_MEMORY_ENTRIES
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+            self._conn = self._open(self.db_path)
+        except (OSError, sqlite3.Error) as e:
+            print(f"[WARN] Geocode cache {self.db_path} unusable, keeping entries in memory only: {e}")
+            self._conn = self._open(':memory:')
+
+    @staticmethod
+    def _open(path):
+        conn = sqlite3.connect(path, check_same_thread=False)
+        try:
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS geocode ('
+                'key TEXT PRIMARY KEY, lat REAL, lon REAL, expires_at REAL)'
+            )
+            conn.commit()
+        except sqlite3.Error:
+            conn.close()
+            raise
+        return conn
+
+    def _remember(self, key, entry):
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, location_name):
+        """Return (lat, lon) for a cached name, (None, None) for a cached miss, or None if unknown"""
+        key = normalize_location_name(location_name)
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                lat, lon, expires_at = entry
+                if expires_at is None or expires_at > now:
+                    self._memory.move_to_end(key)
+                    return lat, lon
+                del self._memory[key]
+
+            try:
+                row = self._conn.execute(
+                    'SELECT lat, lon, expires_at FROM geocode WHERE key = ?', (key,)
+                ).fetchone()
+            except sqlite3.Error as e:
+                print(f"[WARN] Could not read the geocode cache {self.db_path}: {e}")
+                return None
+            if row is None or (row[2] is not None and row[2] <= now):
+                return None
+            self._remember(key, row)
+            return row[0], row[1]
+
+    def _write(self, rows):
+        # Best effort: a locked or read-only database must not fail the lookup being cached
+        try:
+            with self._conn:
+                self._conn.executemany(
+                    'INSERT OR REPLACE INTO geocode (key, lat, lon, expires_at) VALUES (?, ?, ?, ?)', rows
+                )
+        except sqlite3.OperationalError as e:
+            print(f"[WARN] Could not write {len(rows)} geocode cache entries to {self.db_path}: {e}")
+
+    def put(self, location_name, lat, lon, ttl=None):
+        """Store coordinates (or a miss when lat/lon are None).
+
+        If SQLite cannot be written the entry is still kept in memory.
+        """
+        key = normalize_location_name(location_name)
+        if ttl is None:
+            ttl = self.ttl if lat is not None else self.negative_ttl
+        entry = (lat, lon, time.time() + ttl)
+        with self._lock:
+            self._write([(key,) + entry])
+            self._remember(key, entry)
+
+    def seed(self, coordinates):
+        """Insert permanent entries from a {name: (lat, lon)} mapping"""
+        rows = [(normalize_location_name(name), lat, lon, None) for name, (lat, lon) in coordinates.items()]
+        with self._lock:
+            self._write(rows)
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM geocode').fetchone()[0]
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_geocode_cache():
+    """Return the process-wide geocode cache, seeded from the location catalogs"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                cache = GeocodeCache()
+                cache.seed(get_catalog_coordinates())
+                _cache = cache
+    return _cache
+
+def lookup_nominatim(location_name):
+    """Query Nominatim; returns (lat, lon), (None, None) for no match, or raises on network errors"""
+    from app.utils.http_client import get_http_client
+    data = get_http_client().get_json(
+        Config.GEOCODE_API_URL,
+        params={'q': location_name, 'format': 'json', 'limit': 1},
+        timeout=5
+    )
+    if data:
+        return float(data[0]['lat']), float(data[0]['lon'])
+    return None, None
+
+def geocode_offline(location_name):
+    """(lat, lon) from the gazetteer or the cache, (None, None) for a known miss, or None if only Nominatim can tell"""
+    if not normalize_location_name(location_name):
+        return None, None
+
+    from app.utils.gazetteer import get_gazetteer
+    known = get_gazetteer().lookup(location_name)
+    if known is not None:
+        return known
+    return get_geocode_cache().get(location_name)
+
+def geocode(location_name):
+    """Resolve a location name to (lat, lon) via the offline gazetteer, the cache, then Nominatim"""
+    cached = geocode_offline(location_name)
+    if cached is not None:
+        return cached
+    cache = get_geocode_cache()
+
+    # requests is only needed once a name has to go to the network
+    import requests
+    try:
+        lat, lon = lookup_nominatim(location_name)
+    except (requests.RequestException, ValueError, KeyError) as e:
+        # Transient failures are not cached so the next request retries
+        print(f"Error geocoding {location_name}: {e}")
+        return None, None
+
+    cache.put(location_name, lat, lon)
+    return lat, lon
@@ -0,0 +1,216 @@
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from config import Config
+
+# Status codes worth retrying: throttling and transient upstream failures
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+DEFAULT_HEADERS = {'User-Agent': 'RainfallPredictor/1.0'}
+
+
+class CircuitOpenError(requests.RequestException):
+    """Raised without touching the network while a host's circuit is open"""
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker for one upstream host.
+
+    After ``failure_threshold`` failed calls in a row the circuit opens and
+    calls fail fast for ``reset_timeout`` seconds. Then a single trial call
+    is let through: success closes the circuit, failure re-opens it.
+    """
+
+    def __init__(self, failure_threshold=None, reset_timeout=None):
+        self.failure_threshold = failure_threshold or Config.CIRCUIT_FAILURE_THRESHOLD
+        self.reset_timeout = reset_timeout or Config.CIRCUIT_RESET_TIMEOUT
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return 'closed'
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return 'half-open'
+        return 'open'
+
+    def allow(self):
+        """Return True if a call may go to the upstream now"""
+        with self._lock:
+            state = self.state
+            if state == 'closed':
+                return True
+            if state == 'half-open' and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self._trial_in_flight or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+            self._trial_in_flight = False
+
+
+class HostStats:
+    """Request, error and latency counters for one upstream host"""
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.short_circuited = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, latency, error=False):
+        with self._lock:
+            self.requests += 1
+            self.total_latency += latency
+            self.max_latency = max(self.max_latency, latency)
+            if error:
+                self.errors += 1
+
+    def record_retry(self):
+        with self._lock:
+            self.retries += 1
+
+    def record_short_circuit(self):
+        with self._lock:
+            self.short_circuited += 1
+
+    def as_dict(self):
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'errors': self.errors,
+                'retries': self.retries,
+                'short_circuited': self.short_circuited,
+                'avg_latency_ms': round(1000 * self.total_latency / self.requests, 2) if self.requests else 0.0,
+                'max_latency_ms': round(1000 * self.max_latency, 2)
+            }
+
+
+class HttpClient:
+    """Shared HTTP client: keep-alive pools, bounded retries and circuit breakers per host"""
+
+    def __init__(self, max_retries=None, backoff_base=None, backoff_max=None, pool_maxsize=None,
+                 failure_threshold=None, reset_timeout=None):
+        self.max_retries = Config.HTTP_MAX_RETRIES if max_retries is None else max_retries
+        self.backoff_base = Config.HTTP_BACKOFF_BASE if backoff_base is None else backoff_base
+        self.backoff_max = Config.HTTP_BACKOFF_MAX if backoff_max is None else backoff_max
+        self.pool_maxsize = pool_maxsize or Config.HTTP_POOL_MAXSIZE
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._sessions = {}
+        self._breakers = {}
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def _host_state(self, host):
+        """Return (session, breaker, stats) for a host, creating them on first use"""
+        with self._lock:
+            if host not in self._sessions:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_maxsize)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                session.headers.update(DEFAULT_HEADERS)
+                self._sessions[host] = session
+                self._breakers[host] = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+                self._stats[host] = HostStats()
+            return self._sessions[host], self._breakers[host], self._stats[host]
+
+    def breaker(self, host):
+        return self._host_state(host)[1]
+
+    def stats(self, host):
+        return self._host_state(host)[2]
+
+    def _backoff(self, attempt, response=None):
+        retry_after = response.headers.get('Retry-After') if response is not None else None
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), self.backoff_max)
+        # Full jitter: uniform over an exponentially growing window
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def get(self, url, params=None, headers=None, timeout=10, retries=None):
+        """GET with retries; raises CircuitOpenError, requests exceptions or HTTPError"""
+        host = urlsplit(url).netloc
+        session, breaker, stats = self._host_state(host)
+        retries = self.max_retries if retries is None else retries
+
+        for attempt in range(retries + 1):
+            if not breaker.allow():
+                stats.record_short_circuit()
+                raise CircuitOpenError(f"Circuit open for {host}")
+
+            start = time.monotonic()
+            try:
+                response = session.get(url, params=params, headers=headers, timeout=timeout)
+            except (requests.ConnectionError, requests.Timeout):
+                stats.record(time.monotonic() - start, error=True)
+                breaker.record_failure()
+                if attempt == retries:
+                    raise
+                response = None
+            except Exception:
+                # Not retried, but still a failed call: a half-open trial must end either way
+                stats.record(time.monotonic() - start, error=True)
+                breaker.record_failure()
+                raise
+            else:
+                failed = response.status_code in RETRY_STATUS_CODES
+                stats.record(time.monotonic() - start, error=failed or response.status_code >= 400)
+                if not failed:
+                    breaker.record_success()
+                    return response
+                breaker.record_failure()
+                if attempt == retries:
+                    response.raise_for_status()
+
+            stats.record_retry()
+            time.sleep(self._backoff(attempt, response))
+
+    def get_json(self, url, params=None, headers=None, timeout=10, retries=None):
+        """GET a URL and decode the JSON body, raising HTTPError for error statuses"""
+        response = self.get(url, params=params, headers=headers, timeout=timeout, retries=retries)
+        response.raise_for_status()
+        return response.json()
+
+    def snapshot(self):
+        """Per-host counters and circuit state, for monitoring"""
+        with self._lock:
+            hosts = list(self._sessions)
+        return {
+            host: dict(self._stats[host].as_dict(), circuit=self._breakers[host].state)
+            for host in hosts
+        }
+
+
+_client = None
+_client_lock = threading.Lock()
+
+def get_http_client():
+    """Return the HTTP client shared by this process"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = HttpClient()
+    return _client
@@ -0,0 +1,36 @@
+from config import Config
+from app.utils.archive_fetcher import ArchiveFetcher
+from app.utils.fetch_manifest import FetchManifest, latest_archive_date
+from app.utils.location_catalog import get_location_catalog
+from app.utils.weather_store import write_partitioned
+
+
+def ingest_regions(regions=None, end_date=None, catalog=None, fetcher=None, manifest=None, store_root=None):
+    """Fetch catalog regions into the raw store and return {region: FetchReport}.
+
+    Each region is fetched from its catalog start date up to ``end_date``
+    (default: the newest archived day), skipping spans the manifest already
+    records. Batches are written to the store as they arrive, so memory use
+    does not grow with the number of locations.
+    """
+    catalog = catalog or get_location_catalog()
+    fetcher = fetcher or ArchiveFetcher()
+    manifest = manifest or FetchManifest()
+    store_root = store_root or Config.RAW_DATA_DIR
+    end_date = end_date or latest_archive_date().isoformat()
+
+    unknown = [name for name in (regions or []) if name not in catalog]
+    if unknown:
+        raise ValueError(f"Unknown regions {unknown}; the catalog has {sorted(catalog)}")
+
+    reports = {}
+    for name in regions or list(catalog):
+        region = catalog[name]
+        print(f"Fetching weather data for {len(region.locations)} locations in {name}...")
+        reports[name] = fetcher.fetch_all(
+            region.locations, region.start_date, end_date, region.season_lut, timezone=region.timezone,
+            on_frame=lambda location, df: write_partitioned(df, store_root, append=True),
+            extra_columns=region.extra_columns, manifest=manifest
+        )
+        print(f"{name}: {reports[name].summary()}")
+    return reports
@@ -0,0 +1,96 @@
+import json
+import threading
+from collections import deque
+
+from config import Config
+
+
+class KeywordMatcher:
+    """Aho-Corasick automaton returning the highest-priority keyword found in a text.
+
+    Each keyword is tagged with a priority (lower wins). The automaton is
+    compiled once; matching walks the text a single time regardless of how
+    many keywords are loaded, and stops early once the top priority is seen.
+    """
+
+    def __init__(self, keywords):
+        # keywords: iterable of (keyword, priority)
+        self._goto = [{}]
+        self._best = [None]
+
+        for keyword, priority in keywords:
+            if not keyword:
+                continue
+            state = 0
+            for char in keyword:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._best.append(None)
+                state = next_state
+            if self._best[state] is None or priority < self._best[state]:
+                self._best[state] = priority
+
+        self._fail = [0] * len(self._goto)
+        self._top_priority = min((p for p in self._best if p is not None), default=None)
+        self._build_failure_links()
+
+    def _build_failure_links(self):
+        """Breadth-first pass linking each state to its longest proper suffix state"""
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                # A state also reports every keyword ending at its suffix states
+                inherited = self._best[self._fail[next_state]]
+                if inherited is not None and (self._best[next_state] is None or inherited < self._best[next_state]):
+                    self._best[next_state] = inherited
+
+    def match(self, text):
+        """Return the best (lowest) priority of any keyword contained in text, or None"""
+        goto, fail, best = self._goto, self._fail, self._best
+        state = 0
+        found = None
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            priority = best[state]
+            if priority is not None and (found is None or priority < found):
+                found = priority
+                if found == self._top_priority:
+                    break
+        return found
+
+
+def load_keyword_regions(path=None):
+    """Compile the region table into (matcher, multipliers indexed by priority)"""
+    with open(path or Config.KEYWORD_REGIONS_PATH, encoding='utf-8') as f:
+        regions = json.load(f)['regions']
+
+    keywords = []
+    multipliers = []
+    for priority, region in enumerate(regions):
+        multipliers.append(float(region['multiplier']))
+        keywords.extend((keyword.lower(), priority) for keyword in region['keywords'])
+    return KeywordMatcher(keywords), multipliers
+
+
+_regions = None
+_regions_lock = threading.Lock()
+
+def get_keyword_regions():
+    """Return the compiled region table shared by this process"""
+    global _regions
+    if _regions is None:
+        with _regions_lock:
+            if _regions is None:
+                _regions = load_keyword_regions()
+    return _regions
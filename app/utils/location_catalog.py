@@ -0,0 +1,75 @@
+import json
+import threading
+from collections import namedtuple
+
+import numpy as np
+from config import Config
+
+Region = namedtuple('Region', [
+    'name', 'season_lut', 'timezone', 'start_date', 'gazetteer', 'extra_columns', 'locations'
+])
+
+
+def build_season_lut(months):
+    """Season lookup table indexed by month number (index 0 is unused)"""
+    if len(months) != 12:
+        raise ValueError(f"A season scheme needs 12 months, got {len(months)}")
+    return np.array([''] + list(months), dtype=object)
+
+
+def calendar_features(dates, season_lut):
+    """Month, day and season arrays for an array of dates.
+
+    Works on datetime64 arithmetic and one fancy-index into the season
+    table, so there is no per-row Python call.
+    """
+    days = np.asarray(dates, dtype='datetime64[D]')
+    month_starts = days.astype('datetime64[M]')
+    month = (month_starts.astype(np.int64) % 12 + 1).astype(np.int8)
+    day = ((days - month_starts.astype('datetime64[D]')).astype(np.int64) + 1).astype(np.int8)
+    return month, day, season_lut[month]
+
+
+def load_location_catalog(path=None):
+    """Read the location catalog into Region tuples keyed by region name.
+
+    Raises ValueError for an unknown season scheme or a location listed
+    in more than one region, since the raw store is keyed by location.
+    """
+    from app.utils.weather_store import location_slug
+    with open(path or Config.LOCATION_CATALOG_PATH, encoding='utf-8') as f:
+        catalog = json.load(f)
+
+    schemes = {name: build_season_lut(months) for name, months in catalog['season_schemes'].items()}
+    regions = {}
+    owners = {}
+    for name, region in catalog['regions'].items():
+        if region['season_scheme'] not in schemes:
+            raise ValueError(f"Region {name} uses unknown season scheme {region['season_scheme']}")
+        for location in region['locations']:
+            if location_slug(location) in owners:
+                raise ValueError(f"Location {location} is in both {owners[location_slug(location)]} and {name}")
+            owners[location_slug(location)] = name
+        regions[name] = Region(
+            name=name,
+            season_lut=schemes[region['season_scheme']],
+            timezone=region.get('timezone', 'auto'),
+            start_date=region['start_date'],
+            gazetteer=bool(region.get('gazetteer', False)),
+            extra_columns=tuple(region.get('extra_columns', [])),
+            locations=region['locations']
+        )
+    return regions
+
+
+_catalog = None
+_catalog_lock = threading.Lock()
+
+def get_location_catalog():
+    """Return the location catalog shared by this process"""
+    global _catalog
+    if _catalog is None:
+        with _catalog_lock:
+            if _catalog is None:
+                _catalog = load_location_catalog()
+    return _catalog
@@ -0,0 +1,109 @@
+import threading
+import zlib
+
+import numpy as np
+
+from app.models.registry import get_model_registry
+from app.utils.gazetteer import get_catalog_places
+from app.utils.geocoding import normalize_location_name
+
+# Season codes used when no trained season encoder is available
+FALLBACK_SEASON_CODES = {'spring': 0, 'summer': 1, 'autumn': 2, 'winter': 3}
+
+def stable_location_code(location, buckets=10):
+    """Deterministic fallback location code (unlike hash(), identical in every worker)"""
+    return zlib.crc32(normalize_location_name(location).encode('utf-8')) % buckets
+
+
+class LocationFeatureTable:
+    """Per-location features precomputed from the encoders and location catalogs.
+
+    Rows are addressed through a dict keyed by normalized name and stored
+    in parallel NumPy arrays: encoded id (-1 when the encoder has not seen
+    the name), climate factor and coordinates (NaN when unknown) and the
+    keyword multiplier.
+    """
+
+    def __init__(self, location_classes=None, season_classes=None, places=(), version=None):
+        from app.utils.data_processing import get_climate_factor_for_latitude, get_keyword_multiplier
+
+        self.version = version
+        # An encoder fitted on nothing gives no codes; use the fallbacks instead
+        if location_classes is not None and len(location_classes) == 0:
+            location_classes = None
+        if season_classes is not None and len(season_classes) == 0:
+            season_classes = None
+        self.has_encoders = location_classes is not None and season_classes is not None
+
+        names = {}
+        for code, name in enumerate(location_classes if location_classes is not None else []):
+            key = normalize_location_name(name)
+            if key and key not in names:
+                names[key] = (name, code, np.nan, np.nan)
+        for name, lat, lon, _ in places:
+            key = normalize_location_name(name)
+            if key:
+                code = names[key][1] if key in names else -1
+                names[key] = (names[key][0] if key in names else name, code, lat, lon)
+
+        self.index = {key: i for i, key in enumerate(names)}
+        rows = list(names.values())
+        self.encoded_ids = np.array([row[1] for row in rows], dtype=np.int32)
+        self.lats = np.array([row[2] for row in rows], dtype=np.float64)
+        self.lons = np.array([row[3] for row in rows], dtype=np.float64)
+        # 0.0 is a real coordinate (equator, prime meridian); only NaN means unknown
+        self.climate_factors = np.array([
+            np.nan if np.isnan(lat) or np.isnan(lon) else get_climate_factor_for_latitude(lat)
+            for lat, lon in zip(self.lats, self.lons)
+        ], dtype=np.float64)
+        self.keyword_multipliers = np.array([get_keyword_multiplier(row[0]) for row in rows], dtype=np.float64)
+
+        if season_classes is not None:
+            self.season_codes = {str(name).lower(): code for code, name in enumerate(season_classes)}
+        else:
+            self.season_codes = FALLBACK_SEASON_CODES
+
+    def __len__(self):
+        return len(self.index)
+
+    def row(self, location):
+        """Return the row index for a location, or None if it is not in the table"""
+        return self.index.get(normalize_location_name(location))
+
+    def encode_location(self, location):
+        """Encoded location id as the model expects it"""
+        i = self.row(location)
+        if not self.has_encoders:
+            return stable_location_code(location)
+        if i is None or self.encoded_ids[i] < 0:
+            return 0  # Default for unknown location
+        return int(self.encoded_ids[i])
+
+    def encode_season(self, season):
+        """Encoded season id (0 for unknown seasons)"""
+        return self.season_codes.get(season.lower(), 0)
+
+    def location_multiplier(self, location):
+        """Climate factor times keyword multiplier, or None if coordinates are unknown"""
+        i = self.row(location)
+        if i is None or np.isnan(self.climate_factors[i]):
+            return None
+        return float(self.climate_factors[i]) * float(self.keyword_multipliers[i])
+
+
+_table = None
+_table_lock = threading.Lock()
+
+def get_location_feature_table():
+    """Return the feature table for the current model bundle, rebuilding it after a reload"""
+    global _table
+    bundle = get_model_registry().get()
+    table = _table
+    if table is None or table.version != bundle.version:
+        with _table_lock:
+            if _table is None or _table.version != bundle.version:
+                location_classes = getattr(bundle.location_encoder, 'classes_', None)
+                season_classes = getattr(bundle.season_encoder, 'classes_', None)
+                _table = LocationFeatureTable(location_classes, season_classes, get_catalog_places(), bundle.version)
+            table = _table
+    return table
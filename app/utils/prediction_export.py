@@ -0,0 +1,155 @@
+import csv
+import io
+import json
+import zlib
+from datetime import datetime
+
+from app.utils.prediction_history import FIELDNAMES, FLOAT_FIELDS
+
+# format -> (mimetype, file extension)
+EXPORT_FORMATS = {
+    'csv': ('text/csv', 'csv'),
+    'ndjson': ('application/x-ndjson', 'ndjson'),
+    'parquet': ('application/vnd.apache.parquet', 'parquet'),
+}
+
+# Records buffered per emitted chunk (and per Parquet row group)
+CHUNK_ROWS = 1000
+
+TIME_FORMATS = ['%Y-%m-%d %H:%M:%S', '%Y-%m-%dT%H:%M:%S', '%Y-%m-%d']
+
+
+def parse_time_bound(value):
+    """Parse an epoch number or local date/datetime string into epoch seconds.
+
+    Returns None for an empty value; raises ValueError for anything else
+    that cannot be parsed.
+    """
+    if value is None or str(value).strip() == '':
+        return None
+    value = str(value).strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    for fmt in TIME_FORMATS:
+        try:
+            return datetime.strptime(value, fmt).timestamp()
+        except ValueError:
+            continue
+    raise ValueError(f'Invalid time "{value}"; use YYYY-MM-DD, YYYY-MM-DD HH:MM:SS or epoch seconds')
+
+
+def _chunked(records, size):
+    chunk = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def iter_csv(records, chunk_rows=CHUNK_ROWS):
+    """Yield CSV bytes, one chunk per ``chunk_rows`` records"""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=FIELDNAMES)
+    writer.writeheader()
+    for chunk in _chunked(records, chunk_rows):
+        writer.writerows(chunk)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+def iter_ndjson(records, chunk_rows=CHUNK_ROWS):
+    """Yield newline-delimited JSON bytes, one chunk per ``chunk_rows`` records"""
+    for chunk in _chunked(records, chunk_rows):
+        yield ''.join(json.dumps(record) + '\n' for record in chunk).encode()
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file object that hands written bytes back to a generator"""
+
+    def __init__(self):
+        self._parts = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._parts.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def drain(self):
+        data = b''.join(self._parts)
+        self._parts = []
+        return data
+
+
+def iter_parquet(records, chunk_rows=CHUNK_ROWS):
+    """Yield a Parquet file as bytes, writing one row group per ``chunk_rows`` records.
+
+    Requires pyarrow; raises ImportError if it is not installed.
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+
+    schema = pa.schema(
+        [('timestamp', pa.timestamp('s')), ('location', pa.string()), ('season', pa.string())]
+        + [(field, pa.float32()) for field in FLOAT_FIELDS]
+    )
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema, compression='snappy')
+    try:
+        for chunk in _chunked(records, chunk_rows):
+            columns = {
+                'timestamp': pc.strptime(pa.array([r['timestamp'] for r in chunk], pa.string()),
+                                         format='%Y-%m-%d %H:%M:%S', unit='s'),
+                'location': pa.array([r['location'] for r in chunk], pa.string()),
+                'season': pa.array([r['season'] for r in chunk], pa.string()),
+            }
+            for field in FLOAT_FIELDS:
+                columns[field] = pa.array([r[field] for r in chunk], pa.float32())
+            writer.write_table(pa.table(columns, schema=schema))
+            data = sink.drain()
+            if data:
+                yield data
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+def gzip_chunks(chunks, level=6):
+    """Gzip-compress a byte-chunk stream without buffering the whole payload"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def check_export_format(fmt):
+    """Raise ValueError for an unknown format, ImportError if Parquet lacks pyarrow"""
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f'Unsupported export format "{fmt}"; choose one of {", ".join(EXPORT_FORMATS)}')
+    if fmt == 'parquet':
+        # Fail before a response starts rather than part-way through the stream
+        import pyarrow  # noqa: F401
+
+
+def export_stream(records, fmt='csv', compress=False):
+    """Return a generator of encoded bytes for ``records`` in the given format"""
+    check_export_format(fmt)
+    chunks = {'csv': iter_csv, 'ndjson': iter_ndjson, 'parquet': iter_parquet}[fmt](records)
+    return gzip_chunks(chunks) if compress else chunks
@@ -0,0 +1,157 @@
+import threading
+import time
+from datetime import datetime
+
+from config import Config
+
+# Weather inputs and outputs stored as float32 columns, in export order
+FLOAT_FIELDS = ['temperature', 'humidity', 'pressure', 'wind_speed', 'cloud_cover',
+                'predicted_rainfall', 'probability']
+
+FIELDNAMES = ['timestamp', 'location', 'temperature', 'humidity', 'pressure', 'wind_speed',
+              'cloud_cover', 'season', 'predicted_rainfall', 'probability']
+
+
+def location_key(location):
+    """Form locations are compared in, by this history and the SQLite prediction log alike"""
+    return None if location is None else str(location).casefold()
+
+
+class PredictionHistory:
+    """Fixed-capacity ring buffer of predictions backed by typed NumPy columns.
+
+    Location and season strings are interned to small integer ids. Appends
+    overwrite the oldest record once full, and reading the newest ``n``
+    records touches only those rows. All access is serialized by a lock, so
+    threaded request handlers can share one instance. NumPy is imported by
+    the methods that use it, so importing this module stays cheap.
+    """
+
+    def __init__(self, capacity=None):
+        import numpy as np
+        capacity = capacity or Config.PREDICTION_HISTORY_CAPACITY
+        self.capacity = capacity
+        self.timestamps = np.zeros(capacity, dtype=np.float64)
+        self.location_ids = np.zeros(capacity, dtype=np.int32)
+        self.season_ids = np.zeros(capacity, dtype=np.int32)
+        self.values = {field: np.zeros(capacity, dtype=np.float32) for field in FLOAT_FIELDS}
+        self._strings = []
+        self._string_ids = {}
+        self._next = 0
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def _intern(self, value):
+        value = str(value)
+        string_id = self._string_ids.get(value)
+        if string_id is None:
+            string_id = len(self._strings)
+            self._strings.append(value)
+            self._string_ids[value] = string_id
+        return string_id
+
+    def _compact_strings(self):
+        import numpy as np
+        live = np.unique(np.concatenate([self.location_ids[:self._size], self.season_ids[:self._size]]))
+        remap = np.zeros(len(self._strings), dtype=np.int32)
+        remap[live] = np.arange(len(live), dtype=np.int32)
+        self._strings = [self._strings[i] for i in live.tolist()]
+        self._string_ids = {value: i for i, value in enumerate(self._strings)}
+        self.location_ids[:self._size] = remap[self.location_ids[:self._size]]
+        self.season_ids[:self._size] = remap[self.season_ids[:self._size]]
+
+    def append(self, record):
+        """Record one prediction given as a dict with the FIELDNAMES keys"""
+        timestamp = record.get('timestamp')
+        if isinstance(timestamp, str):
+            timestamp = datetime.strptime(timestamp, '%Y-%m-%d %H:%M:%S').timestamp()
+        with self._lock:
+            # Free-text locations are unbounded; drop strings no live row uses
+            if len(self._strings) >= 4 * self.capacity + 16:
+                self._compact_strings()
+            i = self._next
+            self.timestamps[i] = time.time() if timestamp is None else timestamp
+            self.location_ids[i] = self._intern(record.get('location', ''))
+            self.season_ids[i] = self._intern(record.get('season', ''))
+            for field in FLOAT_FIELDS:
+                self.values[field][i] = record.get(field, 0)
+            self._next = (i + 1) % self.capacity
+            self._size = min(self._size + 1, self.capacity)
+
+    def __len__(self):
+        return self._size
+
+    def _rows(self, positions):
+        """Materialize dicts for buffer positions (caller holds the lock)"""
+        timestamps = self.timestamps[positions]
+        locations = self.location_ids[positions]
+        seasons = self.season_ids[positions]
+        # str() of a float32 is its shortest repr, so 20.1 reads back as 20.1
+        columns = {field: [float(str(v)) for v in self.values[field][positions]] for field in FLOAT_FIELDS}
+        rows = []
+        for j in range(len(positions)):
+            row = {
+                'timestamp': datetime.fromtimestamp(timestamps[j]).strftime('%Y-%m-%d %H:%M:%S'),
+                'location': self._strings[locations[j]],
+                'season': self._strings[seasons[j]],
+            }
+            for field in FLOAT_FIELDS:
+                row[field] = columns[field][j]
+            rows.append({name: row[name] for name in FIELDNAMES})
+        return rows
+
+    def tail(self, n):
+        """Return the newest ``n`` records, oldest first"""
+        import numpy as np
+        with self._lock:
+            n = max(0, min(n, self._size))
+            positions = (np.arange(self._next - n, self._next)) % self.capacity
+            return self._rows(positions)
+
+    def records(self):
+        """Return every retained record, oldest first"""
+        return self.tail(self.capacity)
+
+    def query(self, start=None, end=None, location=None):
+        """Return retained records matching the filters, oldest first.
+
+        Mirrors ``PredictionLog.query``: ``start``/``end`` are epoch seconds
+        (inclusive start, exclusive end) and ``location`` matches ignoring case.
+        """
+        import numpy as np
+        with self._lock:
+            positions = (np.arange(self._next - self._size, self._next)) % self.capacity
+            mask = np.ones(len(positions), dtype=bool)
+            if start is not None:
+                mask &= self.timestamps[positions] >= start
+            if end is not None:
+                mask &= self.timestamps[positions] < end
+            if location:
+                wanted = location_key(location)
+                ids = [i for i, value in enumerate(self._strings) if location_key(value) == wanted]
+                mask &= np.isin(self.location_ids[positions], ids)
+            return self._rows(positions[mask])
+
+    def __iter__(self):
+        return iter(self.records())
+
+    def clear(self):
+        with self._lock:
+            self._next = 0
+            self._size = 0
+            self._strings = []
+            self._string_ids = {}
+
+
+_history = None
+_history_lock = threading.Lock()
+
+
+def get_prediction_history():
+    """Return this worker's prediction ring buffer, allocated on first use"""
+    global _history
+    if _history is None:
+        with _history_lock:
+            if _history is None:
+                _history = PredictionHistory()
+    return _history
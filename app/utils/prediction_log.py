@@ -0,0 +1,191 @@
+import os
+import queue
+import sqlite3
+import threading
+from datetime import datetime
+
+from config import Config
+from app.utils.prediction_history import FIELDNAMES, location_key
+
+COLUMNS = ['timestamp', 'location', 'season', 'temperature', 'humidity', 'pressure',
+           'wind_speed', 'cloud_cover', 'predicted_rainfall', 'probability']
+
+# Locations are matched on a location_key() column, since SQLite's NOCASE only folds ASCII
+TABLE = ('CREATE TABLE IF NOT EXISTS predictions ('
+         'id INTEGER PRIMARY KEY, timestamp REAL NOT NULL, location TEXT, location_key TEXT, season TEXT, '
+         'temperature REAL, humidity REAL, pressure REAL, wind_speed REAL, cloud_cover REAL, '
+         'predicted_rainfall REAL, probability REAL)')
+INDEXES = [
+    'CREATE INDEX IF NOT EXISTS idx_predictions_timestamp ON predictions (timestamp)',
+    'CREATE INDEX IF NOT EXISTS idx_predictions_location_key ON predictions (location_key, timestamp)',
+]
+
+
+class PredictionLog:
+    """Durable append-only prediction log in SQLite (WAL mode).
+
+    Request handlers only enqueue records; a background writer thread
+    drains the queue and inserts up to ``batch_size`` records per
+    transaction. Readers open their own connections, which WAL lets run
+    alongside the writer in this and other worker processes.
+    """
+
+    def __init__(self, path=None, batch_size=None, flush_interval=None, queue_size=None):
+        self.path = path or Config.PREDICTION_LOG_PATH
+        self.batch_size = batch_size or Config.PREDICTION_LOG_BATCH_SIZE
+        self.flush_interval = flush_interval or Config.PREDICTION_LOG_FLUSH_INTERVAL
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize=queue_size or Config.PREDICTION_LOG_QUEUE_SIZE)
+        self._writer = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        conn = self._connect()
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute(TABLE)
+        if 'location_key' not in {row[1] for row in conn.execute('PRAGMA table_info(predictions)')}:
+            # Log written before location_key existed: fill it in and drop the NOCASE index
+            conn.create_function('location_key', 1, location_key)
+            conn.execute('ALTER TABLE predictions ADD COLUMN location_key TEXT')
+            conn.execute('UPDATE predictions SET location_key = location_key(location)')
+            conn.execute('DROP INDEX IF EXISTS idx_predictions_location')
+        for statement in INDEXES:
+            conn.execute(statement)
+        conn.commit()
+        conn.close()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute('PRAGMA synchronous=NORMAL')
+        return conn
+
+    def _ensure_writer(self):
+        # The writer thread does not survive fork(); start one per worker process
+        if self._writer is not None and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._writer is None or self._pid != os.getpid():
+                self._pid = os.getpid()
+                self._writer = threading.Thread(target=self._run, name='prediction-log-writer', daemon=True)
+                self._writer.start()
+
+    def enqueue(self, record):
+        """Queue a record for writing; never blocks the caller"""
+        self._ensure_writer()
+        row = tuple(record.get(column) for column in COLUMNS) + (location_key(record.get('location')),)
+        try:
+            self._queue.put_nowait(row)
+        except queue.Full:
+            self.dropped += 1
+
+    def flush(self, timeout=5):
+        """Wait until everything queued so far has been written; False if that took too long.
+
+        Best effort: when the queue stays full for ``timeout`` the marker is
+        never queued and False is returned instead of raising.
+        """
+        self._ensure_writer()
+        done = threading.Event()
+        try:
+            self._queue.put(done, timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def _run(self):
+        conn = self._connect()
+        while True:
+            batch, markers = [], []
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+            while True:
+                if isinstance(item, threading.Event):
+                    markers.append(item)
+                else:
+                    batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            if batch:
+                try:
+                    with conn:
+                        conn.executemany(
+                            f'INSERT INTO predictions ({", ".join(COLUMNS)}, location_key) '
+                            f'VALUES ({", ".join("?" * (len(COLUMNS) + 1))})', batch
+                        )
+                except sqlite3.Error as e:
+                    print(f"Error writing prediction log batch of {len(batch)}: {e}")
+            for marker in markers:
+                marker.set()
+
+    def query(self, start=None, end=None, location=None, limit=None, newest_first=False, chunk_size=1000):
+        """Yield records (export field layout) using the timestamp/location indexes.
+
+        ``start`` and ``end`` are epoch seconds (inclusive start, exclusive end);
+        ``location`` matches ignoring case, as in ``PredictionHistory.query``.
+        """
+        clauses, params = [], []
+        if location:
+            clauses.append('location_key = ?')
+            params.append(location_key(location))
+        if start is not None:
+            clauses.append('timestamp >= ?')
+            params.append(start)
+        if end is not None:
+            clauses.append('timestamp < ?')
+            params.append(end)
+        sql = f'SELECT {", ".join(COLUMNS)} FROM predictions'
+        if clauses:
+            sql += ' WHERE ' + ' AND '.join(clauses)
+        sql += ' ORDER BY timestamp DESC, id DESC' if newest_first else ' ORDER BY timestamp, id'
+        if limit is not None:
+            sql += ' LIMIT ?'
+            params.append(int(limit))
+
+        conn = self._connect()
+        try:
+            cursor = conn.execute(sql, params)
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield _to_record(row)
+        finally:
+            conn.close()
+
+    def tail(self, n):
+        """Return the newest ``n`` records, oldest first"""
+        return list(self.query(limit=n, newest_first=True))[::-1]
+
+    def has_records(self):
+        conn = self._connect()
+        try:
+            return conn.execute('SELECT 1 FROM predictions LIMIT 1').fetchone() is not None
+        finally:
+            conn.close()
+
+
+def _to_record(row):
+    record = dict(zip(COLUMNS, row))
+    record['timestamp'] = datetime.fromtimestamp(record['timestamp']).strftime('%Y-%m-%d %H:%M:%S')
+    return {name: record[name] for name in FIELDNAMES}
+
+
+_log = None
+_log_lock = threading.Lock()
+
+def get_prediction_log():
+    """Return the process-wide prediction log, or None if PREDICTION_LOG_PATH is unset"""
+    global _log
+    if _log is None and Config.PREDICTION_LOG_PATH:
+        with _log_lock:
+            if _log is None:
+                _log = PredictionLog()
+    return _log
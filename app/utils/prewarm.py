@@ -0,0 +1,62 @@
+import importlib
+import time
+
+
+def _import(name):
+    return lambda: importlib.import_module(name)
+
+
+def _model_bundle():
+    from app.models.registry import get_model_registry
+    return get_model_registry().get()
+
+
+def _location_features():
+    from app.utils.location_features import get_location_feature_table
+    return get_location_feature_table()
+
+
+def _keyword_regions():
+    from app.utils.keyword_matcher import get_keyword_regions
+    return get_keyword_regions()
+
+
+def _gazetteer():
+    from app.utils.gazetteer import get_gazetteer
+    return get_gazetteer()
+
+
+def _prediction_history():
+    from app.utils.prediction_history import get_prediction_history
+    return get_prediction_history()
+
+
+# What the first requests would otherwise pay for, in dependency order
+PREWARM_STEPS = [
+    ('model bundle', _model_bundle),
+    ('location features', _location_features),
+    ('keyword regions', _keyword_regions),
+    ('gazetteer', _gazetteer),
+    ('prediction history', _prediction_history),
+    ('pandas', _import('pandas')),
+    ('requests', _import('requests')),
+]
+
+
+def prewarm():
+    """Load the lazily imported dependencies and shared tables up front.
+
+    Creating the app imports none of them; each is otherwise loaded by the
+    first request that needs it. Returns [(step, seconds)]. A failing step
+    is reported and skipped, since its request will simply load it later.
+    """
+    timings = []
+    for name, step in PREWARM_STEPS:
+        start = time.perf_counter()
+        try:
+            step()
+        except Exception as e:
+            print(f"[WARN] Prewarm step '{name}' failed: {e}")
+            continue
+        timings.append((name, time.perf_counter() - start))
+    return timings
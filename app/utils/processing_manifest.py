@@ -0,0 +1,77 @@
+import hashlib
+import json
+import os
+
+import pandas as pd
+from config import Config
+from app.utils.analytics_cache import file_signature
+
+# Bump when processing logic changes, so the next run rebuilds every partition
+PROCESSING_VERSION = 1
+
+HASH_CHUNK_BYTES = 1 << 20
+
+
+def content_hash(path):
+    """SHA-256 of a file's contents"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_BYTES), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ProcessingManifest:
+    """Content hashes and aggregates behind each processed partition.
+
+    ``scripts/process_data.py`` compares the hashes of each partition's raw
+    inputs with the ones recorded here to find what needs rebuilding, and
+    merges the per-partition aggregates instead of re-reading processed
+    data. Hashes are cached by (mtime, size), so unchanged files are not
+    read again just to hash them. Category vocabularies only ever grow, so
+    codes already written to the features store stay valid.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or Config.PROCESSING_MANIFEST_PATH
+        try:
+            with open(self.path) as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            stored = {}
+        if stored.get('version') != PROCESSING_VERSION:
+            stored = {}
+        self.hashes = stored.get('hashes', {})
+        self.legacy_files = stored.get('legacy_files', {})
+        self.partitions = stored.get('partitions', {})
+        self.vocabulary = stored.get('vocabulary', {'location': [], 'season': []})
+
+    def hash_file(self, path, name):
+        """Content hash of ``path``, reusing the cached one if the file is unchanged"""
+        signature = file_signature(path)
+        cached = self.hashes.get(name)
+        if cached is not None and cached['signature'] == signature:
+            return cached['hash']
+        digest = content_hash(path)
+        self.hashes[name] = {'signature': signature, 'hash': digest}
+        return digest
+
+    def encode(self, column, values):
+        """Integer codes for ``values``; unseen values are appended to the vocabulary"""
+        vocabulary = self.vocabulary.setdefault(column, [])
+        unseen = set(pd.unique(values)) - set(vocabulary)
+        vocabulary.extend(sorted(unseen))
+        return pd.Categorical(values, categories=vocabulary).codes
+
+    def save(self):
+        payload = {
+            'version': PROCESSING_VERSION,
+            'hashes': self.hashes,
+            'legacy_files': self.legacy_files,
+            'partitions': self.partitions,
+            'vocabulary': self.vocabulary
+        }
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with open(f"{self.path}.tmp", 'w') as f:
+            json.dump(payload, f, indent=1, sort_keys=True)
+        os.replace(f"{self.path}.tmp", self.path)
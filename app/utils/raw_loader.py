@@ -0,0 +1,143 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+from config import Config
+from app.utils.weather_store import location_slug, to_table
+
+
+def legacy_csv_files(root):
+    """CSV files left in ``root`` by fetches from before the columnar store"""
+    if not os.path.isdir(root):
+        return []
+    return [os.path.join(root, name) for name in sorted(os.listdir(root)) if name.endswith('.csv')]
+
+
+def source_columns(path):
+    """Column names of an Arrow partition or CSV file, read from its schema or header only"""
+    if path.endswith('.arrow'):
+        return set(pa.ipc.open_file(pa.memory_map(path)).schema.names)
+    names = set(pd.read_csv(path, nrows=0).columns)
+    # to_table derives 'date' from 'time'
+    return names | {'date'} if 'time' in names else names
+
+
+def validate_sources(paths, required):
+    """Raise ValueError naming every file that lacks a required column"""
+    problems = []
+    for path in paths:
+        missing = [column for column in required if column not in source_columns(path)]
+        if missing:
+            problems.append(f"{os.path.basename(path)}: {missing}")
+    if problems:
+        raise ValueError(f"Raw data files missing required columns: {'; '.join(problems)}")
+
+
+def parse_csv(path, columns=None, locations=None, years=None):
+    """Parse one CSV into a compact Arrow table (pruned, downcast and filtered).
+
+    Runs in pool workers; the table travels back as Arrow buffers, already
+    at its final compact size.
+    """
+    usecols = None
+    if columns is not None:
+        keep = set(columns) | {'location', 'time', 'date'}
+        usecols = lambda name: name in keep
+    df = pd.read_csv(path, usecols=usecols)
+    if locations:
+        slugs = {location: location_slug(location) for location in df['location'].unique()}
+        df = df[df['location'].map(slugs).isin({location_slug(l) for l in locations})]
+    table = to_table(df)
+    if years:
+        table = table.filter(pc.is_in(pc.year(table.column('date')), value_set=pa.array(sorted({int(y) for y in years}))))
+    if columns is not None:
+        table = table.select([c for c in columns if c in table.column_names])
+    return table
+
+
+def parse_csvs(paths, columns=None, locations=None, years=None, workers=None):
+    """Parse CSV files in parallel on a process pool; returns tables in ``paths`` order"""
+    workers = workers or Config.DATA_LOAD_WORKERS
+    if len(paths) < 2 or workers < 2:
+        return [parse_csv(path, columns, locations, years) for path in paths]
+    with ProcessPoolExecutor(max_workers=min(workers, len(paths))) as pool:
+        futures = [pool.submit(parse_csv, path, columns, locations, years) for path in paths]
+        return [future.result() for future in futures]
+
+
+def _codes_dtype(categories):
+    # Same widths pandas picks for categorical codes, so from_codes does not copy
+    if len(categories) < np.iinfo(np.int8).max:
+        return np.int8
+    if len(categories) < np.iinfo(np.int16).max:
+        return np.int16
+    return np.int32
+
+
+def _chunk_slices(tables, offsets, name):
+    for table, start in zip(tables, offsets):
+        if name not in table.column_names:
+            continue
+        for chunk in table.column(name).chunks:
+            yield start, chunk
+            start += len(chunk)
+
+
+def _fill_categorical(tables, offsets, total, name):
+    chunks = []
+    for start, chunk in _chunk_slices(tables, offsets, name):
+        if not pa.types.is_dictionary(chunk.type):
+            chunk = chunk.cast(pa.string()).dictionary_encode()
+        chunks.append((start, chunk))
+    categories = pd.Index(sorted({value for _, chunk in chunks for value in chunk.dictionary.to_pylist()
+                                  if value is not None}))
+    codes = np.full(total, -1, dtype=_codes_dtype(categories))
+    for start, chunk in chunks:
+        # Last entry catches nulls (filled with -1 below)
+        lookup = np.append(categories.get_indexer(chunk.dictionary.to_pylist()), -1).astype(codes.dtype)
+        codes[start:start + len(chunk)] = lookup[pc.fill_null(chunk.indices, -1).to_numpy()]
+    return pd.Categorical.from_codes(codes, categories)
+
+
+def frame_from_tables(tables, columns=None):
+    """Build one DataFrame from Arrow tables in preallocated columns.
+
+    Each output column is allocated once at its final size and every
+    table's chunks are copied straight into their slice, instead of
+    converting each table to a frame and concatenating (which holds two
+    copies of the data at the peak). Memory-mapped chunks are read in
+    place. Columns missing from some tables are filled with nulls.
+    """
+    tables = [table for table in tables if table.num_rows]
+    names = []
+    for table in tables:
+        names.extend(name for name in table.column_names if name not in names)
+    if columns is not None:
+        names = [name for name in columns if name in names]
+    total = sum(table.num_rows for table in tables)
+    offsets = np.cumsum([0] + [table.num_rows for table in tables])[:-1]
+
+    data = {}
+    for name in names:
+        present = [table for table in tables if name in table.column_names]
+        arrow_type = present[0].schema.field(name).type
+        if pa.types.is_dictionary(arrow_type) or pa.types.is_string(arrow_type):
+            data[name] = _fill_categorical(tables, offsets, total, name)
+            continue
+        if pa.types.is_date(arrow_type) or pa.types.is_timestamp(arrow_type):
+            values = np.full(total, np.datetime64('NaT'), dtype='datetime64[ns]')
+        else:
+            complete = len(present) == len(tables) and all(table.column(name).null_count == 0 for table in present)
+            dtype = np.dtype(arrow_type.to_pandas_dtype())
+            if complete:
+                values = np.empty(total, dtype=dtype)
+            else:
+                # Integers cannot hold nulls; fall back to float32
+                values = np.full(total, np.nan, dtype=dtype if dtype.kind == 'f' else np.float32)
+        for start, chunk in _chunk_slices(tables, offsets, name):
+            values[start:start + len(chunk)] = chunk.to_numpy(zero_copy_only=False)
+        data[name] = values
+    return pd.DataFrame(data, columns=names, copy=False)
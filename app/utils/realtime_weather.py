@@ -1,82 +1,233 @@
-import requests
-from datetime import datetime
+import asyncio
+import os
+import threading
+import time
+from urllib.parse import urlsplit
 
-def get_current_weather_data(location_name):
-    """Get current weather data for auto-filling the form"""
-    try:
-        # Get coordinates first
-        geocode_url = f"https://nominatim.openstreetmap.org/search?q={location_name}&format=json&limit=1"
-        geo_response = requests.get(geocode_url, headers={'User-Agent': 'RainfallPredictor/1.0'}, timeout=5)
-        geo_data = geo_response.json()
-        
-        if not geo_data:
-            return None
-            
-        lat = float(geo_data[0]['lat'])
-        lon = float(geo_data[0]['lon'])
-        
-        # Get current weather
-        weather_url = "https://api.open-meteo.com/v1/forecast"
+import aiohttp
+from config import Config
+from app.utils.geocoding import geocode_offline, get_geocode_cache
+from app.utils.http_client import get_http_client, CircuitOpenError, RETRY_STATUS_CODES
+from app.utils.forecast_cache import (
+    ForecastCache, CACHED_HOURLY_VARIABLES, hourly_value, local_date
+)
+
+
+class AsyncWeatherClient:
+    """asyncio HTTP client for the realtime weather APIs.
+
+    A single event loop runs in a background thread with one pooled
+    aiohttp session, so Flask request threads submit coroutines instead of
+    each holding their own blocking connection. Concurrent requests for the
+    same URL and parameters share one upstream call. Forecasts are cached
+    per location until the next upstream model update.
+    """
+
+    def __init__(self, pool_size=None):
+        self.pool_size = pool_size or Config.REALTIME_POOL_SIZE
+        self.forecasts = ForecastCache()
+        self._loop = None
+        self._session = None
+        self._inflight = {}
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def _ensure_loop(self):
+        # Workers forked after first use must not share the parent's loop thread
+        if self._loop is not None and self._pid == os.getpid():
+            return self._loop
+        with self._lock:
+            if self._loop is None or self._pid != os.getpid():
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name='realtime-weather', daemon=True).start()
+                self._loop = loop
+                self._session = None
+                self._inflight = {}
+                self._pid = os.getpid()
+        return self._loop
+
+    def _get_session(self):
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.pool_size, ttl_dns_cache=300)
+            self._session = aiohttp.ClientSession(
+                connector=connector, headers={'User-Agent': 'RainfallPredictor/1.0'}
+            )
+        return self._session
+
+    async def _get(self, url, params, timeout):
+        # Share circuit state and counters with the synchronous HTTP client
+        http = get_http_client()
+        host = urlsplit(url).netloc
+        breaker, stats = http.breaker(host), http.stats(host)
+        if not breaker.allow():
+            stats.record_short_circuit()
+            raise CircuitOpenError(f"Circuit open for {host}")
+
+        start = time.monotonic()
+        status = None
+        try:
+            async with self._get_session().get(url, params=params,
+                                               timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+                status = response.status
+                response.raise_for_status()
+                return await response.json(content_type=None)
+        finally:
+            # Connection errors, timeouts and 5xx/429 count against the host; other 4xx do not
+            healthy = status is not None and status not in RETRY_STATUS_CODES
+            stats.record(time.monotonic() - start, error=status is None or status >= 400)
+            if healthy:
+                breaker.record_success()
+            else:
+                breaker.record_failure()
+
+    async def get_json(self, url, params=None, timeout=10):
+        """GET a JSON document, joining an identical in-flight request if there is one"""
+        params = _encode_params(params or {})
+        key = (url, tuple(sorted(params.items())))
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._get(url, params, timeout))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # shield() keeps one caller's deadline from cancelling the shared call
+        return await asyncio.wait_for(asyncio.shield(task), timeout)
+
+    def run(self, coro, timeout):
+        """Run a coroutine on the client loop from synchronous code, with a deadline"""
+        future = asyncio.run_coroutine_threadsafe(coro, self._ensure_loop())
+        try:
+            return future.result(timeout)
+        except BaseException:
+            future.cancel()
+            raise
+
+    def close(self):
+        """Close the pooled session and stop the loop thread"""
+        loop = self._loop
+        if loop is None or self._pid != os.getpid():
+            return
+        if self._session is not None:
+            asyncio.run_coroutine_threadsafe(self._session.close(), loop).result(5)
+        loop.call_soon_threadsafe(loop.stop)
+        self._loop = None
+        self._session = None
+
+
+def _encode_params(params):
+    """Flatten params the way the Open-Meteo/Nominatim query strings expect"""
+    encoded = {}
+    for key, value in params.items():
+        if isinstance(value, bool):
+            value = 'true' if value else 'false'
+        elif isinstance(value, (list, tuple)):
+            value = ','.join(str(v) for v in value)
+        encoded[key] = value if isinstance(value, str) else str(value)
+    return encoded
+
+
+_client = AsyncWeatherClient()
+
+def get_weather_client():
+    """Return the shared realtime weather client"""
+    return _client
+
+async def geocode_async(client, location_name, timeout):
+    """Resolve coordinates via the gazetteer and geocode cache, then Nominatim.
+
+    The offline lookups and the cache write can block on SQLite, so they
+    run in the loop's executor rather than stalling every request on it.
+    """
+    loop = asyncio.get_running_loop()
+    cached = await loop.run_in_executor(None, geocode_offline, location_name)
+    if cached is not None:
+        return cached
+
+    data = await client.get_json(Config.GEOCODE_API_URL,
+                                 {'q': location_name, 'format': 'json', 'limit': 1}, timeout)
+    lat, lon = (float(data[0]['lat']), float(data[0]['lon'])) if data else (None, None)
+    await loop.run_in_executor(None, get_geocode_cache().put, location_name, lat, lon)
+    return lat, lon
+
+async def fetch_current_weather(location_name, timeout=None, client=None):
+    """Coroutine returning current weather for auto-filling the form, or None"""
+    client = client or get_weather_client()
+    timeout = timeout or Config.REALTIME_WEATHER_TIMEOUT
+
+    # Get coordinates first (shared geocode cache)
+    lat, lon = await geocode_async(client, location_name, timeout)
+    if lat is None or lon is None:
+        return None
+
+    # Forecast arrays only change at upstream model updates; reuse them until then
+    now = time.time()
+    entry = client.forecasts.get(lat, lon, now)
+    if entry is None:
         params = {
             'latitude': lat,
             'longitude': lon,
             'current_weather': True,
-            'hourly': ['temperature_2m', 'relative_humidity_2m', 'surface_pressure', 
-                      'wind_speed_10m', 'cloud_cover'],
+            'hourly': CACHED_HOURLY_VARIABLES,
+            'forecast_days': 2,
+            'timeformat': 'unixtime',
             'timezone': 'auto'
         }
-        
-        weather_response = requests.get(weather_url, params=params, timeout=10)
-        weather_data = weather_response.json()
-        
-        if 'current_weather' in weather_data and 'hourly' in weather_data:
-            current = weather_data['current_weather']
-            hourly = weather_data['hourly']
-            
-            # Get current hour index
-            current_time = datetime.now().hour
-            
-            return {
-                'temperature': round(current.get('temperature', 20), 1),
-                'humidity': round(hourly['relative_humidity_2m'][current_time] if current_time < len(hourly['relative_humidity_2m']) else 70, 1),
-                'pressure': round(hourly['surface_pressure'][current_time] if current_time < len(hourly['surface_pressure']) else 1013, 1),
-                'wind_speed': round(current.get('windspeed', 10), 1),
-                'cloud_cover': round(hourly['cloud_cover'][current_time] if current_time < len(hourly['cloud_cover']) else 50, 1),
-                'location': location_name,
-                'date': datetime.now().strftime('%Y-%m-%d')
-            }
-            
+        weather_data = await client.get_json(Config.FORECAST_API_URL, params, timeout)
+        if 'current_weather' not in weather_data or 'hourly' not in weather_data:
+            return None
+        entry = client.forecasts.put(lat, lon, weather_data, now)
+
+    # Hourly times are UTC instants, so the index is the current hour at the location
+    temperature = entry.temperature if entry.temperature is not None else 20
+    wind_speed = entry.wind_speed if entry.wind_speed is not None else 10
+    return {
+        'temperature': round(temperature, 1),
+        'humidity': round(hourly_value(entry, 'relative_humidity_2m', now, 70), 1),
+        'pressure': round(hourly_value(entry, 'surface_pressure', now, 1013), 1),
+        'wind_speed': round(wind_speed, 1),
+        'cloud_cover': round(hourly_value(entry, 'cloud_cover', now, 50), 1),
+        'location': location_name,
+        'date': local_date(entry, now)
+    }
+
+async def fetch_weather_alerts(lat, lon, timeout=None, client=None):
+    """Coroutine returning weather alerts and warnings for coordinates"""
+    client = client or get_weather_client()
+    timeout = timeout or Config.REALTIME_ALERTS_TIMEOUT
+
+    # Using Open-Meteo alerts (if available)
+    params = {
+        'latitude': lat,
+        'longitude': lon,
+        'daily': ['precipitation_sum', 'precipitation_probability_max'],
+        'timezone': 'auto'
+    }
+    data = await client.get_json(Config.FORECAST_API_URL, params, timeout)
+
+    alerts = []
+    if 'daily' in data:
+        today_precip = data['daily']['precipitation_sum'][0]
+        today_prob = data['daily']['precipitation_probability_max'][0]
+
+        if today_precip > 50:
+            alerts.append("Heavy rainfall expected today")
+        elif today_prob > 80:
+            alerts.append("High probability of rain today")
+    return alerts
+
+def get_current_weather_data(location_name, timeout=None):
+    """Get current weather data for auto-filling the form"""
+    timeout = timeout or Config.REALTIME_WEATHER_TIMEOUT
+    try:
+        return get_weather_client().run(fetch_current_weather(location_name, timeout), timeout)
     except Exception as e:
-        print(f"Error fetching real-time weather: {e}")
+        print(f"Error fetching real-time weather: {e!r}")
         return None
 
-def get_weather_alerts(lat, lon):
+def get_weather_alerts(lat, lon, timeout=None):
     """Get weather alerts and warnings"""
+    timeout = timeout or Config.REALTIME_ALERTS_TIMEOUT
     try:
-        # Using Open-Meteo alerts (if available)
-        url = "https://api.open-meteo.com/v1/forecast"
-        params = {
-            'latitude': lat,
-            'longitude': lon,
-            'daily': ['precipitation_sum', 'precipitation_probability_max'],
-            'timezone': 'auto'
-        }
-        
-        response = requests.get(url, params=params, timeout=5)
-        data = response.json()
-        
-        if 'daily' in data:
-            today_precip = data['daily']['precipitation_sum'][0]
-            today_prob = data['daily']['precipitation_probability_max'][0]
-            
-            alerts = []
-            if today_precip > 50:
-                alerts.append("Heavy rainfall expected today")
-            elif today_prob > 80:
-                alerts.append("High probability of rain today")
-                
-            return alerts
-            
-    except:
-        pass
-    return []
\ No newline at end of file
+        return get_weather_client().run(fetch_weather_alerts(lat, lon, timeout), timeout)
+    except Exception as e:
+        print(f"Error fetching weather alerts: {e!r}")
+        return []
@@ -0,0 +1,221 @@
+import json
+import os
+import re
+import threading
+import time
+
+import pandas as pd
+import pyarrow as pa
+
+# Daily measurements stored as float32
+MEASUREMENT_COLUMNS = ['temperature_2m_mean', 'relative_humidity_2m_mean', 'surface_pressure_mean',
+                       'wind_speed_10m_mean', 'cloud_cover_mean', 'precipitation_sum']
+
+# Columns with a fixed compact type; other numeric columns become float32 and
+# other text columns dictionary-encoded strings
+COLUMN_TYPES = {
+    'date': pa.date32(),
+    'month': pa.int8(),
+    'day': pa.int8(),
+    'location': pa.dictionary(pa.int32(), pa.string()),
+    'district': pa.dictionary(pa.int32(), pa.string()),
+    'season': pa.dictionary(pa.int32(), pa.string()),
+    'location_encoded': pa.int16(),
+    'season_encoded': pa.int8(),
+}
+COLUMN_TYPES.update({column: pa.float32() for column in MEASUREMENT_COLUMNS})
+
+# Redundant with 'date' once parsed
+DROPPED_COLUMNS = ['time']
+
+MANIFEST_NAME = '_manifest.json'
+
+_manifest_lock = threading.Lock()
+
+
+def location_slug(location):
+    """Filesystem-safe partition name for a location"""
+    return re.sub(r'[^a-z0-9]+', '_', str(location).strip().lower()).strip('_') or 'unknown'
+
+
+def _arrow_column(name, series):
+    arrow_type = COLUMN_TYPES.get(name)
+    if arrow_type is None:
+        if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+            arrow_type = pa.float32()
+        else:
+            arrow_type = pa.dictionary(pa.int32(), pa.string())
+    if name == 'date':
+        return pa.array(pd.to_datetime(series).dt.date, type=arrow_type)
+    if pa.types.is_dictionary(arrow_type):
+        return pa.array(series.astype(str), type=pa.string()).dictionary_encode()
+    return pa.array(series, type=arrow_type, from_pandas=True)
+
+
+def to_table(df):
+    """Convert a weather DataFrame to an Arrow table with compact column types"""
+    df = df.reset_index(drop=True)
+    if 'date' not in df.columns and 'time' in df.columns:
+        df = df.assign(date=df['time'])
+    df = df.drop(columns=[c for c in DROPPED_COLUMNS if c in df.columns])
+    return pa.table({name: _arrow_column(name, df[name]) for name in df.columns})
+
+
+def to_frame(table):
+    """Arrow table to pandas, with sorted categoricals for dictionary columns"""
+    df = table.to_pandas(date_as_object=False)
+    for name in df.columns:
+        if isinstance(df[name].dtype, pd.CategoricalDtype):
+            df[name] = df[name].cat.set_categories(sorted(df[name].cat.categories))
+    return df
+
+
+def manifest_path(root):
+    """Path of the store manifest, rewritten on every write (usable as a change signal)"""
+    return os.path.join(root, MANIFEST_NAME)
+
+
+def read_manifest(root):
+    try:
+        with open(manifest_path(root)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {'partitions': {}}
+
+
+def _write_manifest(root, manifest):
+    path = manifest_path(root)
+    manifest['updated_at'] = time.time()
+    with open(f"{path}.tmp", 'w') as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(f"{path}.tmp", path)
+
+
+def partition_path(location, year):
+    """Store-relative path of the partition holding ``location``'s rows for ``year``"""
+    return os.path.join(location_slug(location), f'{int(year)}.arrow')
+
+
+def write_partitioned(df, root, replace=False, append=False):
+    """Write ``df`` as Arrow IPC files partitioned by location and year.
+
+    Partitions present in ``df`` are replaced atomically; others are kept
+    unless ``replace`` is set, in which case the store ends up holding
+    exactly ``df``. With ``append`` the rows are merged into the existing
+    partitions instead, newer rows winning on duplicate dates. Files are
+    uncompressed so readers can memory-map them without copying. Returns
+    the relative paths written.
+    """
+    if df.empty and not replace:
+        return []
+    dates = pd.to_datetime(df['date'] if 'date' in df.columns else df['time'])
+    keys = pd.DataFrame({'slug': df['location'].map(location_slug).values, 'year': dates.dt.year.values})
+
+    written = {}
+    for (slug, year), index in keys.groupby(['slug', 'year']).groups.items():
+        relative = partition_path(slug, year)
+        path = os.path.join(root, relative)
+        part = df.iloc[index]
+        if append and os.path.exists(path):
+            existing = to_frame(pa.ipc.open_file(pa.memory_map(path)).read_all())
+            part = pd.concat([existing, to_frame(to_table(part))], ignore_index=True)
+            part = part.drop_duplicates(subset=['date'], keep='last').sort_values('date')
+        table = to_table(part)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with pa.OSFile(f"{path}.tmp", 'wb') as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(f"{path}.tmp", path)
+        written[relative] = {'location': slug, 'year': int(year), 'rows': table.num_rows}
+
+    with _manifest_lock:
+        manifest = read_manifest(root)
+        stale = [relative for relative in manifest['partitions'] if relative not in written] if replace else []
+        for relative in stale:
+            del manifest['partitions'][relative]
+        manifest['partitions'].update(written)
+        os.makedirs(root, exist_ok=True)
+        _write_manifest(root, manifest)
+    for relative in stale:
+        try:
+            os.remove(os.path.join(root, relative))
+        except OSError:
+            pass
+    return sorted(written)
+
+
+def remove_partitions(root, relatives):
+    """Delete partitions (store-relative paths) and drop them from the manifest"""
+    if not relatives:
+        return
+    with _manifest_lock:
+        manifest = read_manifest(root)
+        for relative in relatives:
+            manifest['partitions'].pop(relative, None)
+        os.makedirs(root, exist_ok=True)
+        _write_manifest(root, manifest)
+    for relative in relatives:
+        try:
+            os.remove(os.path.join(root, relative))
+        except OSError:
+            pass
+
+
+def list_partitions(root, locations=None, years=None):
+    """Absolute paths of partitions matching the location names and years given"""
+    slugs = {location_slug(location) for location in locations} if locations else None
+    years = {int(year) for year in years} if years else None
+    paths = []
+    for relative, info in sorted(read_manifest(root)['partitions'].items()):
+        if slugs is not None and info['location'] not in slugs:
+            continue
+        if years is not None and info['year'] not in years:
+            continue
+        paths.append(os.path.join(root, relative))
+    return paths
+
+
+def read_table(root, columns=None, locations=None, years=None):
+    """Memory-map the matching partitions and return one Arrow table.
+
+    Only ``columns`` are materialized; pages of other columns are never read.
+    """
+    tables = []
+    for path in list_partitions(root, locations, years):
+        table = pa.ipc.open_file(pa.memory_map(path)).read_all()
+        if columns is not None:
+            table = table.select([c for c in columns if c in table.column_names])
+        tables.append(table)
+    if not tables:
+        return None
+    # Partitions may differ in optional columns (e.g. district); missing ones read as null
+    return pa.concat_tables(tables, promote_options='default')
+
+
+def read_store(root, columns=None, locations=None, years=None):
+    """Read matching partitions as a DataFrame (empty if the store has none)"""
+    table = read_table(root, columns, locations, years)
+    if table is None:
+        return pd.DataFrame(columns=columns or [])
+    return to_frame(table)
+
+
+def export_csv(root, path, columns=None, locations=None, years=None):
+    """Write matching partitions to a CSV file one partition at a time.
+
+    Returns False if no partition matched (nothing is written).
+    """
+    partitions = list_partitions(root, locations, years)
+    if not partitions:
+        return False
+    # Header is the union of partition columns, so every chunk lines up
+    header = []
+    for partition in partitions:
+        for name in pa.ipc.open_file(pa.memory_map(partition)).schema.names:
+            if name not in header and (columns is None or name in columns):
+                header.append(name)
+    for i, partition in enumerate(partitions):
+        table = pa.ipc.open_file(pa.memory_map(partition)).read_all()
+        frame = to_frame(table).reindex(columns=header)
+        frame.to_csv(path, mode='w' if i == 0 else 'a', header=i == 0, index=False)
+    return True
@@ -9,12 +9,86 @@ class Config:
     
     # Open-source weather data configuration
     WEATHER_API_URL = 'https://archive-api.open-meteo.com/v1/archive'
+    FORECAST_API_URL = 'https://api.open-meteo.com/v1/forecast'
+    GEOCODE_API_URL = 'https://nominatim.openstreetmap.org/search'
+    
+    # Shared HTTP client: connection pools, retries with jittered backoff, circuit breakers
+    HTTP_POOL_MAXSIZE = 10
+    HTTP_MAX_RETRIES = 2
+    HTTP_BACKOFF_BASE = 0.25
+    HTTP_BACKOFF_MAX = 4
+    CIRCUIT_FAILURE_THRESHOLD = 5
+    CIRCUIT_RESET_TIMEOUT = 30
+    
+    # Historical archive fetcher: token bucket sized to the free-tier quota
+    # (5,000 calls/hour), bounded worker pool and per-location retries
+    ARCHIVE_RATE_LIMIT = 5000 / 3600
+    ARCHIVE_RATE_BURST = 10
+    ARCHIVE_FETCH_WORKERS = 8
+    ARCHIVE_FETCH_RETRIES = 3
+    ARCHIVE_TIMEOUT = 30
+    # Coordinates per archive request (comma-separated latitude/longitude lists)
+    ARCHIVE_BATCH_SIZE = 10
+    # Days the archive trails today; incremental fetches stop there
+    ARCHIVE_LAG_DAYS = 5
+    
+    # Realtime weather client (pooled connections and per-call deadlines in seconds)
+    REALTIME_POOL_SIZE = 20
+    REALTIME_WEATHER_TIMEOUT = 10
+    REALTIME_ALERTS_TIMEOUT = 5
+    
+    # Forecast cache: entries expire at the next upstream model update (seconds)
+    FORECAST_UPDATE_INTERVAL = 3600
+    FORECAST_CACHE_ENTRIES = 1024
     
     # Data paths
     BASE_DIR = os.path.abspath(os.path.dirname(__file__))
     RAW_DATA_DIR = os.path.join(BASE_DIR, 'data', 'raw')
     PROCESSED_DATA_DIR = os.path.join(BASE_DIR, 'data', 'processed')
     MODEL_DIR = os.path.join(BASE_DIR, 'models')
+    # Columnar stores: Arrow IPC files partitioned by location and year
+    COMBINED_DATA_DIR = os.path.join(PROCESSED_DATA_DIR, 'combined')
+    FEATURES_DATA_DIR = os.path.join(PROCESSED_DATA_DIR, 'features')
+    # Date spans already stored in the raw store, per location (incremental fetches)
+    FETCH_MANIFEST_PATH = os.path.join(RAW_DATA_DIR, '_fetch_manifest.json')
+    # Feature matrix and target as memory-mappable .npy files, shared by training and scoring
+    FEATURE_STORE_DIR = os.path.join(PROCESSED_DATA_DIR, 'feature_matrix')
+    FEATURE_BATCH_ROWS = 65536
+    # Input content hashes and per-partition statistics (incremental processing)
+    PROCESSING_MANIFEST_PATH = os.path.join(PROCESSED_DATA_DIR, '_processing_manifest.json')
+    # Processes parsing raw CSV files in parallel
+    DATA_LOAD_WORKERS = os.cpu_count() or 1
+    # Also write CSV copies of the processed data (for spreadsheets and other tools)
+    DATA_CSV_EXPORT = False
+    
+    # Dashboard aggregates materialized by scripts/process_data.py
+    ANALYTICS_AGGREGATES_PATH = os.path.join(PROCESSED_DATA_DIR, 'analytics_aggregates.json')
+    
+    # Locations to ingest, grouped by region with their season scheme and timezone
+    LOCATION_CATALOG_PATH = os.path.join(BASE_DIR, 'app', 'data', 'location_catalog.json')
+    
+    # Region/keyword rainfall multipliers, compiled once at startup
+    KEYWORD_REGIONS_PATH = os.path.join(BASE_DIR, 'app', 'data', 'keyword_regions.json')
+    
+    # Geocoding cache (SQLite on disk with an in-memory LRU in front)
+    GEOCODE_CACHE_PATH = os.path.join(BASE_DIR, 'data', 'geocode_cache.sqlite3')
+    GEOCODE_CACHE_TTL = 30 * 24 * 3600
+    GEOCODE_NEGATIVE_TTL = 24 * 3600
+    GEOCODE_MEMORY_ENTRIES = 4096
+    
+    # Optional extra places (name, lat, lon, district) for the offline gazetteer
+    GAZETTEER_CSV = os.path.join(BASE_DIR, 'data', 'gazetteer.csv')
+    
+    # Bundle tree models as a compact memory-mapped forest shared by all workers;
+    # splits whose leaf values differ by at most the tolerance (mm) are pruned
+    MODEL_COMPACT = True
+    MODEL_PRUNE_TOLERANCE = 0.0
+    
+    # Model bundle versions kept in models/versions for rollback
+    MODEL_KEEP_VERSIONS = 5
+    
+    # Seconds between checks for a newly promoted model bundle (hot reload)
+    MODEL_RELOAD_INTERVAL = 5
     
     # Model parameters
     MODEL_FEATURES = [
@@ -25,6 +99,27 @@ class Config:
     TEST_SIZE = 0.2
     RANDOM_STATE = 42
     
+    # Number of recent predictions kept in memory per worker
+    PREDICTION_HISTORY_CAPACITY = 10000
+    
+    # Durable prediction log (SQLite, WAL) written in batches by a background thread;
+    # set PREDICTION_LOG_PATH to None to keep history in memory only
+    PREDICTION_LOG_PATH = os.path.join(BASE_DIR, 'data', 'predictions.sqlite3')
+    PREDICTION_LOG_BATCH_SIZE = 500
+    PREDICTION_LOG_FLUSH_INTERVAL = 1.0
+    PREDICTION_LOG_QUEUE_SIZE = 10000
+    
+    # Upper bound on rows accepted by /api/predict/batch
+    BATCH_PREDICTION_MAX_ROWS = 10000
+    # Network geocodes allowed per batch; further unknown locations get climate factor 1.0
+    BATCH_GEOCODE_LOOKUPS = 25
+    
+    # Heavy dependencies (pandas, NumPy, the model) load on first use; set
+    # PREWARM=1 to load them in create_app instead (e.g. with gunicorn --preload)
+    PREWARM = os.environ.get('PREWARM', '0') == '1'
+    # Import-time budget for create_app, checked by scripts/startup_benchmark.py
+    STARTUP_IMPORT_BUDGET_MS = 350
+    
     # Ensure directories exist
     @classmethod
     def create_directories(cls):
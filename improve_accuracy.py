@@ -3,19 +3,21 @@ Script to improve accuracy for small towns by fetching real weather data
 """
 import requests
 import json
+from config import Config
+from app.utils.http_client import get_http_client
 
 def get_coordinates(location_name):
     """Get latitude/longitude for any location using geocoding API"""
     try:
         # Using OpenStreetMap Nominatim (free geocoding)
-        url = f"https://nominatim.openstreetmap.org/search?q={location_name}&format=json&limit=1"
-        response = requests.get(url, headers={'User-Agent': 'RainfallPredictor/1.0'})
-        data = response.json()
+        params = {'q': location_name, 'format': 'json', 'limit': 1}
+        data = get_http_client().get_json(Config.GEOCODE_API_URL, params=params, timeout=5)
         
         if data:
             return float(data[0]['lat']), float(data[0]['lon'])
         return None, None
-    except:
+    except (requests.RequestException, ValueError, KeyError) as e:
+        print(f"Geocoding failed for {location_name}: {e}")
         return None, None
 
 def get_real_weather_data(lat, lon, date='2024-01-01'):
@@ -31,13 +33,13 @@ def get_real_weather_data(lat, lon, date='2024-01-01'):
                      'surface_pressure_mean', 'precipitation_sum']
         }
         
-        response = requests.get(url, params=params)
-        data = response.json()
+        data = get_http_client().get_json(url, params=params, timeout=10)
         
         if 'daily' in data:
             return data['daily']
         return None
-    except:
+    except (requests.RequestException, ValueError) as e:
+        print(f"Historical weather unavailable: {e}")
         return None
 
 def predict_with_real_data(location_name, user_params):
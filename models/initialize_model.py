@@ -1,5 +1,4 @@
 import numpy as np
-import joblib
 import os
 import sys
 from sklearn.ensemble import RandomForestRegressor
@@ -8,6 +7,7 @@ from sklearn.preprocessing import StandardScaler, LabelEncoder
 # Add parent directory to path to import config
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config import Config
+from app.models.registry import save_model_components
 
 # Initialize model and preprocessing components for the rainfall predictor
 print("Initializing rainfall prediction model...")
@@ -29,12 +29,8 @@ location_encoder.fit(['london', 'new york', 'tokyo', 'sydney'])
 season_encoder = LabelEncoder()
 season_encoder.fit(['spring', 'summer', 'autumn', 'winter', 'monsoon', 'pre-monsoon', 'post-monsoon'])
 
-# Save all components
-os.makedirs(Config.MODEL_DIR, exist_ok=True)
-joblib.dump(model, os.path.join(Config.MODEL_DIR, 'rainfall_model.pkl'))
-joblib.dump(scaler, os.path.join(Config.MODEL_DIR, 'scaler.pkl'))
-joblib.dump(location_encoder, os.path.join(Config.MODEL_DIR, 'location_encoder.pkl'))
-joblib.dump(season_encoder, os.path.join(Config.MODEL_DIR, 'season_encoder.pkl'))
+# Save all components as one bundle and promote it
+save_model_components(model, scaler, location_encoder, season_encoder, Config.MODEL_DIR)
 
 print("Model initialization completed successfully!")
 print("You can now run the app with: python run.py")
\ No newline at end of file
@@ -6,6 +6,7 @@ import sys
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config import Config
+from app.utils.http_client import get_http_client
 
 def get_real_time_weather(location):
     """Get current weather from OpenWeatherMap API (free tier)"""
@@ -19,11 +20,9 @@ def get_real_time_weather(location):
             'hourly': ['temperature_2m', 'relative_humidity_2m', 'precipitation']
         }
         
-        response = requests.get(url, params=params, timeout=5)
-        if response.status_code == 200:
-            return response.json()
-    except:
-        pass
+        return get_http_client().get_json(url, params=params, timeout=5)
+    except (requests.RequestException, ValueError) as e:
+        print(f"Real-time weather unavailable: {e}")
     return None
 
 def get_elevation_data(lat, lon):
@@ -32,13 +31,11 @@ def get_elevation_data(lat, lon):
         url = f"https://api.open-elevation.com/api/v1/lookup"
         params = {'locations': f"{lat},{lon}"}
         
-        response = requests.get(url, params=params, timeout=5)
-        if response.status_code == 200:
-            data = response.json()
-            if data['results']:
-                return data['results'][0]['elevation']
-    except:
-        pass
+        data = get_http_client().get_json(url, params=params, timeout=5)
+        if data['results']:
+            return data['results'][0]['elevation']
+    except (requests.RequestException, ValueError, KeyError) as e:
+        print(f"Elevation data unavailable: {e}")
     return None
 
 def get_air_quality_data(lat, lon):
@@ -51,11 +48,9 @@ def get_air_quality_data(lat, lon):
             'appid': 'demo'  # Demo key - replace with real key
         }
         
-        response = requests.get(url, params=params, timeout=5)
-        if response.status_code == 200:
-            return response.json()
-    except:
-        pass
+        return get_http_client().get_json(url, params=params, timeout=5)
+    except (requests.RequestException, ValueError) as e:
+        print(f"Air quality data unavailable: {e}")
     return None
 
 def get_satellite_data():
@@ -63,11 +58,11 @@ def get_satellite_data():
     try:
         # NASA GIBS API for satellite imagery
         url = "https://gibs.earthdata.nasa.gov/wmts/epsg4326/best/MODIS_Terra_CorrectedReflectance_TrueColor/default/2023-01-01/250m/0/0/0.jpg"
-        response = requests.get(url, timeout=10)
+        response = get_http_client().get(url, timeout=10)
         if response.status_code == 200:
             return "Satellite data available"
-    except:
-        pass
+    except requests.RequestException as e:
+        print(f"Satellite data unavailable: {e}")
     return None
 
 def enhance_predictions():
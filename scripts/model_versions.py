@@ -0,0 +1,45 @@
+import argparse
+import os
+import sys
+from datetime import datetime
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import Config
+from app.models.bundle import current_version, list_versions, promote, read_manifest, rollback, version_path
+
+def print_versions(model_dir=None):
+    """List stored model versions with their metrics, marking the current one"""
+    current = current_version(model_dir)
+    versions = list_versions(model_dir)
+    if not versions:
+        print(f"No model versions in {model_dir or Config.MODEL_DIR}")
+    for version in versions:
+        manifest = read_manifest(version_path(version, model_dir))
+        created = datetime.fromtimestamp(manifest['created_at']).strftime('%Y-%m-%d %H:%M:%S')
+        metrics = ' '.join(f"{name}={value:.3f}" for name, value in (manifest['metrics'] or {}).items())
+        marker = '*' if version == current else ' '
+        print(f"{marker} {version}  {created}  {manifest['model_type']:<6}  {metrics}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Manage the stored model bundle versions')
+    parser.add_argument('--model-dir', help='Model directory (default: MODEL_DIR)')
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('list', help='List versions; * marks the current one')
+    promote_parser = commands.add_parser('promote', help='Make a stored version current')
+    promote_parser.add_argument('version')
+    rollback_parser = commands.add_parser('rollback', help='Promote the version before the current one')
+    rollback_parser.add_argument('version', nargs='?', help='Version to roll back to (default: previous)')
+    args = parser.parse_args()
+
+    try:
+        if args.command == 'list':
+            print_versions(args.model_dir)
+        elif args.command == 'promote':
+            promote(args.version, args.model_dir)
+            print(f"Promoted model version {args.version}")
+        else:
+            print(f"Rolled back to model version {rollback(args.model_dir, args.version)}")
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
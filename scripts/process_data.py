@@ -1,94 +1,177 @@
 import pandas as pd
+import pyarrow as pa
+import hashlib
+import json
 import os
 import sys
-from sklearn.preprocessing import StandardScaler, LabelEncoder
 
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config import Config
+from app.utils.analytics_cache import partial_aggregates, write_merged_aggregates
+from app.utils.feature_store import FEATURE_COLUMNS, write_feature_matrix
+from app.utils.processing_manifest import ProcessingManifest
+from app.utils.raw_loader import frame_from_tables, legacy_csv_files, parse_csvs, validate_sources
+from app.utils.weather_store import (
+    list_partitions, location_slug, manifest_path, remove_partitions, write_partitioned, export_csv
+)
+
+NUMERICAL_COLUMNS = ['temperature_2m_mean', 'relative_humidity_2m_mean',
+                     'surface_pressure_mean', 'wind_speed_10m_mean', 'cloud_cover_mean']
+REQUIRED_COLUMNS = NUMERICAL_COLUMNS + ['precipitation_sum']
+
+def _split_legacy(table):
+    """Split a parsed legacy CSV into one Arrow table per processed partition"""
+    df = frame_from_tables([table])
+    slugs = df['location'].astype(str).map(location_slug)
+    keys = slugs + os.sep + df['date'].dt.year.astype(str) + '.arrow'
+    return {key: table.take(index) for key, index in keys.groupby(keys).indices.items()}
+
+def _hash_sources(manifest, raw_root):
+    """Map each processed partition to the content hashes of its raw inputs.
+
+    A raw store partition feeds the processed partition with the same path.
+    Legacy CSVs can feed many; the ones that changed are parsed here (in
+    parallel) to find which, and returned split by partition so they are
+    not parsed twice.
+    """
+    sources, legacy_tables, seen = {}, {}, set()
+    for path in list_partitions(raw_root):
+        relative = os.path.relpath(path, raw_root)
+        seen.add(relative)
+        sources.setdefault(relative, {})[relative] = manifest.hash_file(path, relative)
+
+    digests = {}
+    for path in legacy_csv_files(raw_root):
+        name = os.path.basename(path)
+        seen.add(name)
+        digests[name] = manifest.hash_file(path, name)
+    changed = [name for name, digest in digests.items()
+               if manifest.legacy_files.get(name, {}).get('hash') != digest]
+    for name, table in zip(changed, parse_csvs([os.path.join(raw_root, name) for name in changed])):
+        legacy_tables[name] = _split_legacy(table)
+        manifest.legacy_files[name] = {'hash': digests[name], 'partitions': sorted(legacy_tables[name])}
+    for name, digest in digests.items():
+        for key in manifest.legacy_files[name]['partitions']:
+            sources.setdefault(key, {})[name] = digest
+
+    # Forget files that are gone
+    manifest.hashes = {name: value for name, value in manifest.hashes.items() if name in seen}
+    manifest.legacy_files = {name: value for name, value in manifest.legacy_files.items() if name in seen}
+    return sources, legacy_tables
+
+def _load_partition(key, sources, raw_root, legacy_tables):
+    """Rows of one processed partition from all of its raw inputs"""
+    tables = []
+    for name in sources:
+        if name.endswith('.arrow'):
+            tables.append(pa.ipc.open_file(pa.memory_map(os.path.join(raw_root, name))).read_all())
+            continue
+        if name not in legacy_tables:
+            # Unchanged CSV feeding a partition that changed for another reason
+            legacy_tables[name] = _split_legacy(parse_csvs([os.path.join(raw_root, name)])[0])
+        tables.append(legacy_tables[name][key])
+    return frame_from_tables(tables)
+
+def _write_feature_matrix(manifest):
+    """Rebuild the memory-mappable feature matrix from the features store"""
+    columns = FEATURE_COLUMNS + [Config.TARGET_VARIABLE]
+    tables = [pa.ipc.open_file(pa.memory_map(path)).read_all().select(columns)
+              for path in list_partitions(Config.FEATURES_DATA_DIR)]
+    # Identifies the training data: the content hashes of every raw input
+    sources = sorted((key, sorted(info['sources'].items())) for key, info in manifest.partitions.items() if info['rows'])
+    source_hash = hashlib.sha256(json.dumps(sources).encode('utf-8')).hexdigest()
+    return write_feature_matrix(tables, manifest.vocabulary, source_hash=source_hash)
 
 def process_weather_data():
-    """Process raw weather data and save to processed folder"""
-    
-    # Get all CSV files from raw data directory
-    raw_files = [f for f in os.listdir(Config.RAW_DATA_DIR) if f.endswith('.csv')]
-    
-    if not raw_files:
+    """Bring the processed stores up to date with the raw data.
+
+    Only partitions whose raw inputs changed (by content hash) are rebuilt,
+    so a nightly run costs time in proportion to the new data. Dashboard
+    aggregates are merged from per-partition aggregates kept in the
+    processing manifest.
+    """
+    manifest = ProcessingManifest()
+    sources, legacy_tables = _hash_sources(manifest, Config.RAW_DATA_DIR)
+
+    if not sources:
         print("No raw data files found!")
         return
-    
-    all_data = []
-    
-    # Process each file
-    for file in raw_files:
-        filepath = os.path.join(Config.RAW_DATA_DIR, file)
-        print(f"Processing {file}...")
-        
-        df = pd.read_csv(filepath)
-        
-        # Clean and standardize columns
-        if 'time' in df.columns and 'date' not in df.columns:
-            df['date'] = df['time']
-        
-        # Ensure required columns exist
-        required_cols = ['temperature_2m_mean', 'relative_humidity_2m_mean', 
-                        'surface_pressure_mean', 'wind_speed_10m_mean', 
-                        'cloud_cover_mean', 'precipitation_sum']
-        
-        if all(col in df.columns for col in required_cols):
-            all_data.append(df)
-        else:
-            print(f"Skipping {file} - missing required columns")
-    
-    if not all_data:
-        print("No valid data files to process!")
+
+    changed = [key for key in sorted(sources) if manifest.partitions.get(key, {}).get('sources') != sources[key]]
+    removed = [key for key in sorted(manifest.partitions) if key not in sources]
+    if not changed and not removed and os.path.exists(manifest_path(Config.COMBINED_DATA_DIR)):
+        manifest.save()
+        print(f"[OK] Processed data is up to date ({len(sources)} partitions)")
+        return
+    print(f"Processing {len(changed)} changed partitions of {len(sources)} ({len(removed)} removed)")
+
+    for key in removed:
+        del manifest.partitions[key]
+    empty = list(removed)
+    for key in changed:
+        # Ensure required columns exist before reading any rows
+        try:
+            validate_sources([os.path.join(Config.RAW_DATA_DIR, name) for name in sources[key]], REQUIRED_COLUMNS)
+            df = _load_partition(key, sources[key], Config.RAW_DATA_DIR, legacy_tables)
+        except ValueError as e:
+            print(f"[WARN] Skipping {key} - {e}")
+            df = pd.DataFrame()
+
+        # Remove duplicates and handle missing values
+        df = df.drop_duplicates().dropna().reset_index(drop=True)
+        if df.empty:
+            manifest.partitions[key] = {'sources': sources[key], 'rows': 0}
+            empty.append(key)
+            continue
+
+        write_partitioned(df, Config.COMBINED_DATA_DIR)
+
+        # Codes are stable across runs; numerical columns are stored unscaled,
+        # since rescaling would rewrite every partition whenever the statistics move
+        features = df.assign(
+            location_encoded=manifest.encode('location', df['location'].astype(str).str.lower()),
+            season_encoded=manifest.encode('season', df['season'].astype(str).str.lower())
+        )
+        write_partitioned(features, Config.FEATURES_DATA_DIR)
+
+        manifest.partitions[key] = {
+            'sources': sources[key],
+            'rows': len(df),
+            'rainfall': partial_aggregates(df),
+            'dates': [str(df['date'].min().date()), str(df['date'].max().date())]
+        }
+    remove_partitions(Config.COMBINED_DATA_DIR, empty)
+    remove_partitions(Config.FEATURES_DATA_DIR, empty)
+
+    processed = [info for info in manifest.partitions.values() if info['rows']]
+    if not processed:
+        manifest.save()
+        print("No valid data to process")
         return
-    
-    # Combine all data
-    combined_df = pd.concat(all_data, ignore_index=True)
-    
-    # Remove duplicates and handle missing values
-    combined_df = combined_df.drop_duplicates()
-    combined_df = combined_df.dropna()
-    
-    # Save combined raw data
-    combined_raw_path = os.path.join(Config.PROCESSED_DATA_DIR, 'combined_weather_data.csv')
-    combined_df.to_csv(combined_raw_path, index=False)
-    print(f"[OK] Saved combined data: {combined_raw_path}")
-    
-    # Create processed features
-    processed_df = combined_df.copy()
-    
-    # Encode categorical variables
-    location_encoder = LabelEncoder()
-    season_encoder = LabelEncoder()
-    
-    processed_df['location_encoded'] = location_encoder.fit_transform(processed_df['location'].str.lower())
-    processed_df['season_encoded'] = season_encoder.fit_transform(processed_df['season'].str.lower())
-    
-    # Scale numerical features
-    scaler = StandardScaler()
-    numerical_cols = ['temperature_2m_mean', 'relative_humidity_2m_mean', 
-                     'surface_pressure_mean', 'wind_speed_10m_mean', 'cloud_cover_mean']
-    
-    processed_df[numerical_cols] = scaler.fit_transform(processed_df[numerical_cols])
-    
-    # Save processed data
-    processed_path = os.path.join(Config.PROCESSED_DATA_DIR, 'processed_weather_data.csv')
-    processed_df.to_csv(processed_path, index=False)
-    print(f"[OK] Saved processed data: {processed_path}")
-    
-    # Save encoders and scaler for later use
-    import joblib
-    joblib.dump(location_encoder, os.path.join(Config.PROCESSED_DATA_DIR, 'location_encoder.pkl'))
-    joblib.dump(season_encoder, os.path.join(Config.PROCESSED_DATA_DIR, 'season_encoder.pkl'))
-    joblib.dump(scaler, os.path.join(Config.PROCESSED_DATA_DIR, 'feature_scaler.pkl'))
-    
+    print(f"[OK] Saved combined data: {Config.COMBINED_DATA_DIR}")
+    print(f"[OK] Saved processed data: {Config.FEATURES_DATA_DIR}")
+    if Config.DATA_CSV_EXPORT:
+        export_csv(Config.COMBINED_DATA_DIR, os.path.join(Config.PROCESSED_DATA_DIR, 'combined_weather_data.csv'))
+        export_csv(Config.FEATURES_DATA_DIR, os.path.join(Config.PROCESSED_DATA_DIR, 'processed_weather_data.csv'))
+
+    # Materialize dashboard aggregates so /api/analytics-data never re-reads the data
+    write_merged_aggregates([info['rainfall'] for info in processed], Config.COMBINED_DATA_DIR)
+    print(f"[OK] Saved analytics aggregates: {Config.ANALYTICS_AGGREGATES_PATH}")
+
+    # Feature matrix, target and encoder vocabularies for training
+    feature_manifest = _write_feature_matrix(manifest)
+    print(f"[OK] Saved feature matrix: {Config.FEATURE_STORE_DIR} ({feature_manifest['rows']} rows)")
+
+    # Recorded last: an interrupted run just redoes the partitions it had not recorded
+    manifest.save()
+
+    cities = sorted({name for info in processed for name in info['rainfall']['location']})
     print("[OK] Data processing completed!")
-    print(f"Total records: {len(processed_df)}")
-    print(f"Cities: {processed_df['location'].unique()}")
-    print(f"Date range: {processed_df['date'].min()} to {processed_df['date'].max()}")
+    print(f"Total records: {feature_manifest['rows']}")
+    print(f"Cities: {cities}")
+    print(f"Date range: {min(info['dates'][0] for info in processed)} to {max(info['dates'][1] for info in processed)}")
 
 if __name__ == "__main__":
     Config.create_directories()
-    process_weather_data()
\ No newline at end of file
+    process_weather_data()
@@ -0,0 +1,69 @@
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+# Add parent directory to path
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+from config import Config
+
+# Imported on first use by the endpoints that need them, never by create_app()
+LAZY_MODULES = ('pandas', 'numpy', 'joblib', 'requests', 'sklearn', 'pyarrow', 'aiohttp')
+
+STARTUP_CODE = 'from app import create_app; create_app()'
+
+def parse_importtime(output):
+    """{module: (self_us, cumulative_us)} from ``python -X importtime`` output"""
+    modules = {}
+    for line in output.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        modules[name.strip()] = (int(self_us), int(cumulative_us))
+    return modules
+
+def measure_startup():
+    """Import timings of one fresh interpreter creating the app"""
+    env = dict(os.environ, PREWARM='0')
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', STARTUP_CODE], cwd=ROOT, env=env,
+                            capture_output=True, text=True, check=True)
+    return parse_importtime(result.stderr)
+
+def eager_lazy_modules(modules):
+    """LAZY_MODULES (top-level packages) that startup imported anyway"""
+    return sorted(name for name in LAZY_MODULES if name in modules)
+
+def run_benchmark(runs=5, budget_ms=None, top=10):
+    """Print the median startup import time and its slowest top-level imports; returns True within budget"""
+    budget_ms = Config.STARTUP_IMPORT_BUDGET_MS if budget_ms is None else budget_ms
+    samples = [measure_startup() for _ in range(runs)]
+    totals = [sum(self_us for self_us, _ in modules.values()) / 1000 for modules in samples]
+    total_ms = statistics.median(totals)
+    last = samples[-1]
+
+    print(f"create_app imports: {len(last)} modules, median {total_ms:.1f} ms over {runs} runs "
+          f"(budget {budget_ms} ms)")
+    top_level = sorted(((cumulative, name) for name, (_, cumulative) in last.items() if '.' not in name),
+                       reverse=True)
+    for cumulative, name in top_level[:top]:
+        print(f"  {cumulative / 1000:8.1f} ms  {name}")
+
+    ok = True
+    eager = eager_lazy_modules(last)
+    if eager:
+        print(f"[FAIL] Imported at startup, should be lazy: {', '.join(eager)}")
+        ok = False
+    if total_ms > budget_ms:
+        print(f"[FAIL] Startup imports take {total_ms:.1f} ms, over the {budget_ms} ms budget")
+        ok = False
+    return ok
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Measure create_app import time (python -X importtime)')
+    parser.add_argument('--runs', type=int, default=5, help='Fresh interpreters to time (default: 5)')
+    parser.add_argument('--budget-ms', type=float, help='Budget in ms (default: STARTUP_IMPORT_BUDGET_MS)')
+    args = parser.parse_args()
+
+    sys.exit(0 if run_benchmark(args.runs, args.budget_ms) else 1)
@@ -2,80 +2,69 @@ import pandas as pd
 import numpy as np
 from sklearn.model_selection import train_test_split
 from sklearn.ensemble import RandomForestRegressor
-from sklearn.preprocessing import StandardScaler, LabelEncoder
+from sklearn.preprocessing import StandardScaler
 from sklearn.metrics import mean_squared_error, r2_score, mean_absolute_error
-import joblib
 import os
 import sys
 
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config import Config
+from app.models.registry import save_model_components
+from app.utils.feature_store import load_feature_matrix, label_encoder, predict_in_batches
 
 def load_and_prepare_data():
-    """Load and prepare data for training"""
-    
-    # Load all CSV files from raw data directory
-    data_files = []
-    for filename in os.listdir(Config.RAW_DATA_DIR):
-        if filename.endswith('.csv'):
-            filepath = os.path.join(Config.RAW_DATA_DIR, filename)
-            df = pd.read_csv(filepath)
-            data_files.append(df)
-    
-    if not data_files:
-        print("No data files found. Please run fetch_data.py first.")
-        return None, None
-    
-    # Combine all data
-    df = pd.concat(data_files, ignore_index=True)
-    
-    # Handle missing values
-    df = df.dropna()
-    
-    # Encode categorical variables
-    le_location = LabelEncoder()
-    le_season = LabelEncoder()
-    
-    df['location_encoded'] = le_location.fit_transform(df['location'])
-    df['season_encoded'] = le_season.fit_transform(df['season'])
-    
-    # Select features
-    feature_columns = [
-        'temperature_2m_mean', 'relative_humidity_2m_mean', 'surface_pressure_mean',
-        'wind_speed_10m_mean', 'cloud_cover_mean', 'month', 'day',
-        'location_encoded', 'season_encoded'
-    ]
+    """Map the feature matrix written by process_data.py (no features are rebuilt here)"""
+    
+    try:
+        matrix = load_feature_matrix()
+    except ValueError as e:
+        print(f"Cannot train: {e}")
+        return None, None, None, None, None
     
-    X = df[feature_columns]
-    y = df[Config.TARGET_VARIABLE]
+    if matrix is None or not matrix.manifest['rows']:
+        print("No feature matrix found. Please run fetch_data.py and process_data.py first.")
+        return None, None, None, None, None
     
-    # Save encoders
-    joblib.dump(le_location, os.path.join(Config.MODEL_DIR, 'location_encoder.pkl'))
-    joblib.dump(le_season, os.path.join(Config.MODEL_DIR, 'season_encoder.pkl'))
+    # The encoders that produced the matrix's location/season codes
+    le_location = label_encoder(matrix.manifest['vocabulary']['location'])
+    le_season = label_encoder(matrix.manifest['vocabulary']['season'])
     
-    print(f"Dataset shape: {X.shape}")
-    print(f"Features: {feature_columns}")
+    print(f"Dataset shape: {matrix.X.shape}")
+    print(f"Features: {matrix.manifest['feature_columns']}")
     
-    return X, y
+    return matrix.X, matrix.y, le_location, le_season, matrix.manifest['source_hash']
+
+def evaluate_model(model, scaler, X, y, rows=None):
+    """RMSE, MAE and R² over rows of the mapped feature matrix, scored in batches"""
+    y_true = np.asarray(y if rows is None else y[rows], dtype=np.float64)
+    y_pred = predict_in_batches(model, scaler, X, rows)
+    mse = mean_squared_error(y_true, y_pred)
+    return {
+        'rmse': float(np.sqrt(mse)),
+        'mae': float(mean_absolute_error(y_true, y_pred)),
+        'r2': float(r2_score(y_true, y_pred))
+    }
 
 def train_model():
     """Train the rainfall prediction model"""
     
     # Load and prepare data
-    X, y = load_and_prepare_data()
+    X, y, le_location, le_season, source_hash = load_and_prepare_data()
     if X is None:
         return
     
-    # Split the data
-    X_train, X_test, y_train, y_test = train_test_split(
-        X, y, test_size=Config.TEST_SIZE, random_state=Config.RANDOM_STATE
+    # Split row indices; only the training rows are copied out of the map
+    train_rows, test_rows = train_test_split(
+        np.arange(len(X)), test_size=Config.TEST_SIZE, random_state=Config.RANDOM_STATE
     )
+    train_rows.sort()
+    test_rows.sort()
+    X_train, y_train = X[train_rows], y[train_rows]
     
     # Scale features
     scaler = StandardScaler()
     X_train_scaled = scaler.fit_transform(X_train)
-    X_test_scaled = scaler.transform(X_test)
     
     # Train Random Forest model
     print("Training Random Forest model...")
@@ -88,19 +77,13 @@ def train_model():
     
     model.fit(X_train_scaled, y_train)
     
-    # Make predictions
-    y_pred = model.predict(X_test_scaled)
-    
     # Evaluate model
-    mse = mean_squared_error(y_test, y_pred)
-    rmse = np.sqrt(mse)
-    mae = mean_absolute_error(y_test, y_pred)
-    r2 = r2_score(y_test, y_pred)
+    metrics = evaluate_model(model, scaler, X, y, test_rows)
     
     print(f"\nModel Performance:")
-    print(f"RMSE: {rmse:.2f}")
-    print(f"MAE: {mae:.2f}")
-    print(f"R² Score: {r2:.3f}")
+    print(f"RMSE: {metrics['rmse']:.2f}")
+    print(f"MAE: {metrics['mae']:.2f}")
+    print(f"R² Score: {metrics['r2']:.3f}")
     
     # Feature importance
     feature_names = [
@@ -116,12 +99,11 @@ def train_model():
     print(f"\nFeature Importance:")
     print(importance_df)
     
-    # Save model and scaler
-    os.makedirs(Config.MODEL_DIR, exist_ok=True)
-    joblib.dump(model, os.path.join(Config.MODEL_DIR, 'rainfall_model.pkl'))
-    joblib.dump(scaler, os.path.join(Config.MODEL_DIR, 'scaler.pkl'))
+    # One bundle (model, scaler, encoders, data hash, metrics), promoted atomically for running workers
+    manifest = save_model_components(model, scaler, le_location, le_season, Config.MODEL_DIR,
+                                     source_hash=source_hash, metrics=metrics)
     
-    print(f"\nModel saved to {Config.MODEL_DIR}")
+    print(f"\nModel version {manifest['version']} saved to {Config.MODEL_DIR}")
     
     return model, scaler
 
@@ -20,12 +20,15 @@ def install_requirements():
     return True
 
 def fetch_sample_data():
-    """Fetch sample weather data"""
+    """Fetch and process sample weather data"""
     print("Fetching sample weather data...")
     try:
         from scripts.fetch_data import fetch_weather_data
-        # Fetch data for London only (smaller dataset for demo)
-        fetch_weather_data('London', '2022-01-01', '2023-12-31')
+        from scripts.process_data import process_weather_data
+        # Fetch the small 'global' catalog region only (London, New York, ...) for the demo
+        fetch_weather_data(['global'])
+        # Training reads the feature matrix written by processing
+        process_weather_data()
         print("✓ Sample data fetched successfully!")
     except Exception as e:
         print(f"✗ Failed to fetch data: {e}")
@@ -0,0 +1,66 @@
+import unittest
+import os
+import shutil
+import tempfile
+import numpy as np
+import pandas as pd
+from unittest.mock import patch
+from config import Config
+from app.utils import geocoding
+
+# Daily measurements as the archive API returns them
+MEASUREMENTS = ['temperature_2m_mean', 'relative_humidity_2m_mean', 'surface_pressure_mean',
+                'wind_speed_10m_mean', 'cloud_cover_mean', 'precipitation_sum']
+
+def make_weather_frame(location, start='2022-12-30', periods=4, district=None, offset=0.1):
+    """Daily rows for one location with distinct values per measurement"""
+    dates = pd.date_range(start, periods=periods)
+    df = pd.DataFrame({'time': dates.strftime('%Y-%m-%d')})
+    for i, column in enumerate(MEASUREMENTS):
+        df[column] = np.arange(periods, dtype=float) + 10 * i + offset
+    df['location'] = location
+    if district:
+        df['district'] = district
+    df['date'] = dates
+    df['month'] = dates.month
+    df['day'] = dates.day
+    df['season'] = 'winter'
+    return df
+
+def make_prediction_record(i, location='Mangalore'):
+    """Prediction record ``i`` hours after a fixed start, with rainfall ``i``"""
+    return {
+        'timestamp': 1718409600 + i * 3600,
+        'location': location,
+        'temperature': 20.1,
+        'humidity': 85,
+        'pressure': 1008.5,
+        'wind_speed': 12,
+        'cloud_cover': 80,
+        'season': 'monsoon',
+        'predicted_rainfall': float(i),
+        'probability': 80
+    }
+
+def isolate_geocode_cache(test_case):
+    """Give ``test_case`` a fresh geocode cache under a temporary GEOCODE_CACHE_PATH"""
+    directory = tempfile.mkdtemp()
+    test_case.addCleanup(shutil.rmtree, directory)
+    for patcher in (patch.object(Config, 'GEOCODE_CACHE_PATH', os.path.join(directory, 'geocode_cache.sqlite3')),
+                    patch.object(geocoding, '_cache', None)):
+        patcher.start()
+        test_case.addCleanup(patcher.stop)
+
+class TempDirTestCase(unittest.TestCase):
+    """Test case with a fresh temporary directory in ``self.test_dir``"""
+    
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.test_dir)
+    
+    def patch_config(self, **values):
+        """Override Config attributes until the test ends"""
+        for name, value in values.items():
+            patcher = patch.object(Config, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
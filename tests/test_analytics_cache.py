@@ -0,0 +1,79 @@
+import unittest
+import os
+import json
+from unittest.mock import patch
+import pandas as pd
+from app.utils.analytics_cache import (
+    AnalyticsCache, write_aggregates, compute_aggregates, partial_aggregates, merge_partial_aggregates
+)
+from app.utils.weather_store import write_partitioned
+from tests.helpers import TempDirTestCase
+
+def make_frame(scale=1.0):
+    return pd.DataFrame({
+        'date': ['2023-07-01', '2023-01-01', '2023-07-01', '2023-01-01'],
+        'location': ['Udupi', 'Udupi', 'Mysore', 'Mysore'],
+        'season': ['monsoon', 'winter', 'monsoon', 'winter'],
+        'month': [7, 1, 7, 1],
+        'precipitation_sum': [30.0 * scale, 2.0 * scale, 10.0 * scale, 0.0]
+    })
+
+class TestAnalyticsCache(TempDirTestCase):
+    
+    def setUp(self):
+        super().setUp()
+        self.data_root = os.path.join(self.test_dir, 'combined')
+        self.sidecar_path = os.path.join(self.test_dir, 'analytics_aggregates.json')
+        self.cache = AnalyticsCache(self.data_root, self.sidecar_path)
+    
+    def write_data(self, df):
+        write_partitioned(df, self.data_root, replace=True)
+        return df
+    
+    def test_missing_data(self):
+        """Test None is returned when the processed data does not exist"""
+        self.assertIsNone(self.cache.get())
+    
+    def test_materialized_sidecar_is_served_without_reading_csv(self):
+        """Test aggregates written at processing time are used as-is"""
+        df = self.write_data(make_frame())
+        write_aggregates(df, self.data_root, self.sidecar_path)
+        with patch('app.utils.analytics_cache.read_store') as mock_read:
+            aggregates = self.cache.get()
+            self.cache.get()
+        mock_read.assert_not_called()
+        self.assertEqual(aggregates['total_records'], 4)
+        self.assertEqual(aggregates['monthly_rainfall'], {'1': 1.0, '7': 20.0})
+        self.assertEqual(aggregates['seasonal_rainfall'], {'monsoon': 20.0, 'winter': 1.0})
+        self.assertEqual(aggregates['location_rainfall'], {'Mysore': 5.0, 'Udupi': 16.0})
+    
+    def test_stale_sidecar_is_rebuilt_once(self):
+        """Test a missing sidecar is recomputed and persisted, then served from memory"""
+        self.write_data(make_frame())
+        first = self.cache.get()
+        self.assertTrue(os.path.exists(self.sidecar_path))
+        with patch('app.utils.analytics_cache.read_store') as mock_read:
+            self.assertIs(self.cache.get(), first)
+        mock_read.assert_not_called()
+        with open(self.sidecar_path) as f:
+            self.assertEqual(json.load(f)['total_records'], 4)
+    
+    def test_data_change_invalidates(self):
+        """Test rewriting the store invalidates the in-memory aggregates"""
+        df = self.write_data(make_frame())
+        write_aggregates(df, self.data_root, self.sidecar_path)
+        self.assertEqual(self.cache.get()['monthly_rainfall']['7'], 20.0)
+        
+        self.write_data(pd.concat([make_frame(2.0), make_frame(2.0)], ignore_index=True))
+        aggregates = self.cache.get()
+        self.assertEqual(aggregates['total_records'], 8)
+        self.assertEqual(aggregates['monthly_rainfall']['7'], 40.0)
+    
+    def test_partial_aggregates_merge_to_full_result(self):
+        """Test partials of disjoint slices merge into the aggregates of the whole"""
+        df = make_frame()
+        partials = [partial_aggregates(df.iloc[:1]), partial_aggregates(df.iloc[1:])]
+        self.assertEqual(merge_partial_aggregates(partials), compute_aggregates(df))
+
+if __name__ == '__main__':
+    unittest.main()
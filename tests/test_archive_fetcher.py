@@ -0,0 +1,217 @@
+import unittest
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs
+import pandas as pd
+from app.utils.archive_fetcher import ArchiveFetcher, TokenBucket, DAILY_VARIABLES
+from app.utils.http_client import HttpClient
+from app.utils.fetch_manifest import FetchManifest
+from app.utils.location_catalog import build_season_lut
+from app.utils.weather_store import write_partitioned, read_store
+
+class StubArchiveHandler(BaseHTTPRequestHandler):
+    """Minimal Open-Meteo archive: daily series for the requested range.
+    
+    Comma-separated coordinates get a list with one entry per location.
+    ``server.failures`` maps a latitude parameter to the status codes it
+    answers with before succeeding; latitudes in ``server.partial`` get an
+    error entry when requested as part of a batch.
+    """
+    
+    def do_GET(self):
+        query = parse_qs(urlsplit(self.path).query)
+        lat_param = query['latitude'][0]
+        lats = lat_param.split(',')
+        with self.server.lock:
+            self.server.hits += 1
+            self.server.requested.append((lat_param, query['start_date'][0], query['end_date'][0]))
+            self.server.in_flight += 1
+            self.server.max_in_flight = max(self.server.max_in_flight, self.server.in_flight)
+            script = self.server.failures.get(lat_param, [])
+            status = script.pop(0) if script else 200
+        time.sleep(0.02)
+        
+        if status == 200:
+            dates = pd.date_range(query['start_date'][0], query['end_date'][0]).strftime('%Y-%m-%d').tolist()
+            entries = []
+            for lat in lats:
+                if len(lats) > 1 and lat in self.server.partial:
+                    entries.append({'error': True, 'reason': 'stub partial failure'})
+                    continue
+                daily = {'time': dates}
+                for variable in query['daily'][0].split(','):
+                    daily[variable] = [float(lat)] * len(dates)
+                entries.append({'latitude': float(lat), 'daily': daily})
+            payload = json.dumps(entries if len(lats) > 1 else entries[0]).encode()
+        else:
+            payload = json.dumps({'error': True, 'reason': 'stub failure'}).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+        with self.server.lock:
+            self.server.in_flight -= 1
+    
+    def log_message(self, format, *args):
+        pass
+
+season = build_season_lut(['dry'] * 5 + ['monsoon'] * 4 + ['dry'] * 3)
+
+class TestArchiveFetcher(unittest.TestCase):
+    
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), StubArchiveHandler)
+        self.server.daemon_threads = True
+        self.server.lock = threading.Lock()
+        self.server.hits = 0
+        self.server.requested = []
+        self.server.in_flight = 0
+        self.server.max_in_flight = 0
+        self.server.failures = {}
+        self.server.partial = set()
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f'http://127.0.0.1:{self.server.server_address[1]}/v1/archive'
+        self.client = HttpClient(failure_threshold=1000)
+        self.locations = {f'Town {i}': {'lat': float(i), 'lon': 75.0, 'district': f'D{i % 3}'} for i in range(1, 21)}
+    
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+    
+    def make_fetcher(self, **kwargs):
+        options = dict(url=self.url, rate=1000, burst=1000, workers=4, retries=2,
+                       backoff_base=0.001, backoff_max=0.01, batch_size=1, client=self.client)
+        options.update(kwargs)
+        return ArchiveFetcher(**options)
+    
+    def test_fetches_all_locations_concurrently(self):
+        """Test every location is fetched, framed and handed back, with bounded concurrency"""
+        frames = {}
+        report = self.make_fetcher().fetch_all(
+            self.locations, '2023-06-29', '2023-07-02', season,
+            on_frame=lambda name, df: frames.setdefault(name, df), extra_columns=['district']
+        )
+        self.assertEqual(len(report.succeeded), 20)
+        self.assertEqual(report.failed, {})
+        self.assertEqual(report.requests, 20)
+        self.assertEqual(report.rows, 80)
+        self.assertGreater(self.server.max_in_flight, 1)
+        self.assertLessEqual(self.server.max_in_flight, 4)
+        
+        df = frames['Town 7']
+        self.assertEqual(df['season'].tolist(), ['monsoon', 'monsoon', 'monsoon', 'monsoon'])
+        self.assertEqual(df['month'].tolist(), [6, 6, 7, 7])
+        self.assertEqual(df['district'].iloc[0], 'D1')
+        self.assertEqual(df['precipitation_sum'].iloc[0], 7.0)
+        self.assertTrue(set(DAILY_VARIABLES) <= set(df.columns))
+        self.assertIn('20/20 locations', report.summary())
+    
+    def test_retries_and_reports_failures(self):
+        """Test transient errors are retried per location and permanent ones reported"""
+        self.server.failures = {'3.0': [503, 429], '5.0': [500, 500, 500], '8.0': [400]}
+        report = self.make_fetcher().fetch_all(self.locations, '2023-01-01', '2023-01-02', season)
+        self.assertIn('Town 3', report.succeeded)
+        self.assertEqual(sorted(report.failed), ['Town 5', 'Town 8'])
+        # 17 clean + 3 for Town 3 + 3 for Town 5 + 1 for Town 8 (4xx is not retried)
+        self.assertEqual(report.requests, 24)
+        self.assertEqual(self.server.hits, 24)
+    
+    def test_rate_limit_is_shared_across_workers(self):
+        """Test the token bucket caps request rate regardless of worker count"""
+        fetcher = self.make_fetcher(rate=100, burst=1, workers=8)
+        start = time.monotonic()
+        report = fetcher.fetch_all(self.locations, '2023-01-01', '2023-01-01', season)
+        elapsed = time.monotonic() - start
+        self.assertEqual(len(report.succeeded), 20)
+        # 20 requests at 100/s with a burst of 1 need at least 0.19s
+        self.assertGreaterEqual(elapsed, 0.18)
+
+    def test_incremental_and_resumable(self):
+        """Test only missing spans are fetched, appended, and a failed span is retried next run"""
+        store = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, store)
+        manifest_path = os.path.join(store, '_fetch_manifest.json')
+        locations = {name: self.locations[name] for name in ('Town 1', 'Town 2')}
+        save = lambda name, df: write_partitioned(df, store, append=True)
+        
+        # First run: Town 2 fails permanently, as if the run had been interrupted
+        self.server.failures = {'2.0': [400]}
+        report = self.make_fetcher().fetch_all(locations, '2023-12-30', '2024-01-02', season,
+                                               on_frame=save, manifest=FetchManifest(manifest_path))
+        self.assertEqual(list(report.failed), ['Town 2'])
+        
+        # Next day: Town 1 only needs the new day, Town 2 its whole range
+        self.server.requested = []
+        report = self.make_fetcher().fetch_all(locations, '2023-12-30', '2024-01-03', season,
+                                               on_frame=save, manifest=FetchManifest(manifest_path))
+        self.assertEqual(sorted(report.succeeded), ['Town 1', 'Town 2'])
+        self.assertEqual(sorted(self.server.requested),
+                         [('1.0', '2024-01-03', '2024-01-03'), ('2.0', '2023-12-30', '2024-01-03')])
+        df = read_store(store, locations=['Town 1'])
+        self.assertEqual(df['date'].dt.strftime('%Y-%m-%d').tolist(),
+                         ['2023-12-30', '2023-12-31', '2024-01-01', '2024-01-02', '2024-01-03'])
+        
+        # Nothing left to do
+        self.server.requested = []
+        report = self.make_fetcher().fetch_all(locations, '2023-12-30', '2024-01-03', season,
+                                               on_frame=save, manifest=FetchManifest(manifest_path))
+        self.assertEqual(self.server.requested, [])
+        self.assertEqual(sorted(report.skipped), ['Town 1', 'Town 2'])
+
+    def test_batched_requests(self):
+        """Test locations sharing a span are fetched several per request and split back"""
+        frames = {}
+        report = self.make_fetcher(batch_size=8).fetch_all(
+            self.locations, '2023-06-29', '2023-07-02', season,
+            on_frame=lambda name, df: frames.setdefault(name, df), extra_columns=['district']
+        )
+        self.assertEqual(len(report.succeeded), 20)
+        self.assertEqual(report.requests, 3)
+        self.assertEqual(self.server.hits, 3)
+        for name, info in self.locations.items():
+            df = frames[name]
+            self.assertEqual(len(df), 4)
+            self.assertEqual(set(df['location']), {name})
+            self.assertEqual(set(df['precipitation_sum']), {info['lat']})
+            self.assertEqual(set(df['district']), {info['district']})
+        self.assertEqual(frames['Town 9']['season'].tolist(), ['monsoon'] * 4)
+    
+    def test_batch_falls_back_to_single_requests(self):
+        """Test partial errors and failed batches are retried one location at a time"""
+        self.server.partial = {'2.0'}
+        self.server.failures = {'5.0,6.0': [400]}
+        locations = {name: self.locations[name] for name in ('Town 1', 'Town 2', 'Town 3', 'Town 4', 'Town 5', 'Town 6')}
+        report = self.make_fetcher(batch_size=4).fetch_all(locations, '2023-01-01', '2023-01-02', season)
+        self.assertEqual(sorted(report.succeeded), sorted(locations))
+        self.assertEqual(sorted(lat for lat, _, _ in self.server.requested),
+                         ['1.0,2.0,3.0,4.0', '2.0', '5.0', '5.0,6.0', '6.0'])
+    
+    def test_batches_weigh_on_rate_limit_per_location(self):
+        """Test a batch takes one token per location from the bucket"""
+        fetcher = self.make_fetcher(rate=100, burst=1, batch_size=10)
+        start = time.monotonic()
+        fetcher.fetch_all(self.locations, '2023-01-01', '2023-01-01', season)
+        self.assertGreaterEqual(time.monotonic() - start, 0.18)
+        self.assertEqual(self.server.hits, 2)
+
+class TestTokenBucket(unittest.TestCase):
+    
+    def test_burst_then_rate(self):
+        """Test a full bucket allows a burst, then refills at the configured rate"""
+        bucket = TokenBucket(rate=50, capacity=5)
+        start = time.monotonic()
+        for _ in range(5):
+            bucket.acquire()
+        self.assertLess(time.monotonic() - start, 0.05)
+        for _ in range(5):
+            bucket.acquire()
+        self.assertGreaterEqual(time.monotonic() - start, 0.09)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+import unittest
+import numpy as np
+from unittest.mock import patch
+from config import Config
+from app.utils.data_processing import (
+    rule_based_prediction, predict_rainfall, calculate_rain_probability, get_weather_description
+)
+from app.utils.batch_prediction import (
+    rule_based_prediction_batch, predict_rainfall_batch, rows_to_columns, score_rows, round_half_even
+)
+from tests.helpers import isolate_geocode_cache
+
+LOCATIONS = ['Mangalore', 'Bijapur', 'Desert Town', 'London', 'Hill Valley', 'Karnataka coast']
+SEASONS = ['monsoon', 'winter', 'Summer', 'pre-monsoon', 'unknown', '']
+COORDINATES = {
+    'Mangalore': (12.9, 74.8),
+    'Bijapur': (16.8, 75.7),
+    'London': (51.5, -0.1),
+    'Hill Valley': (40.0, -100.0),
+}
+
+def fake_coordinates(location):
+    return COORDINATES.get(location, (None, None))
+
+class TestBatchPrediction(unittest.TestCase):
+    
+    def setUp(self):
+        """Generate random weather rows covering every rule branch"""
+        isolate_geocode_cache(self)
+        rng = np.random.default_rng(42)
+        n = 5000
+        self.humidity = np.round(rng.uniform(20, 100, n), 1)
+        self.cloud_cover = np.round(rng.uniform(0, 100, n), 1)
+        self.temperature = np.round(rng.uniform(-10, 45, n), 1)
+        self.pressure = np.round(rng.uniform(970, 1040, n), 1)
+        self.locations = rng.choice(LOCATIONS, n)
+        self.seasons = rng.choice(SEASONS, n)
+    
+    def test_rule_based_matches_scalar(self):
+        """Test vectorized rules match the scalar function row for row"""
+        batch = rule_based_prediction_batch(self.humidity, self.cloud_cover, self.temperature, self.pressure)
+        scalar = [rule_based_prediction(h, c, t, p) for h, c, t, p in 
+                  zip(self.humidity.tolist(), self.cloud_cover.tolist(), 
+                      self.temperature.tolist(), self.pressure.tolist())]
+        np.testing.assert_array_equal(batch, np.array(scalar, dtype=float))
+    
+    @patch('app.utils.data_processing.get_location_coordinates', side_effect=fake_coordinates)
+    def test_predict_rainfall_matches_scalar(self, mock_coords):
+        """Test batch predictions including season and location multipliers match scalar predictions"""
+        batch = predict_rainfall_batch(self.locations, self.seasons, self.temperature,
+                                       self.humidity, self.pressure, self.cloud_cover)
+        # Geocoding happens once per distinct non-catalog location, not once per row
+        self.assertEqual(mock_coords.call_count, len(LOCATIONS) - 2)
+        scalar = [predict_rainfall(l, '2024-06-15', t, h, p, 10, c, s, 'morning') for l, s, t, h, p, c in
+                  zip(self.locations.tolist(), self.seasons.tolist(), self.temperature.tolist(),
+                      self.humidity.tolist(), self.pressure.tolist(), self.cloud_cover.tolist())]
+        np.testing.assert_array_equal(batch, np.array(scalar, dtype=float))
+    
+    @patch('app.utils.data_processing.get_location_coordinates', side_effect=fake_coordinates)
+    def test_score_rows_probability_and_description(self, mock_coords):
+        """Test scored rows carry the same probability and description as the scalar helpers"""
+        rows = [
+            {'location': 'Mangalore', 'date': '2024-07-01', 'temperature': 24, 'humidity': 92,
+             'pressure': 998, 'wind_speed': 12, 'cloud_cover': 90, 'season': 'monsoon'},
+            {'location': 'Bijapur', 'date': '2024-04-01', 'temperature': '38', 'humidity': '30',
+             'pressure': '1012', 'wind_speed': '5', 'cloud_cover': '10', 'season': 'summer'},
+        ]
+        results = score_rows(rows)
+        self.assertEqual(len(results), 2)
+        for row, result in zip(rows, results):
+            expected = predict_rainfall(row['location'], row['date'], float(row['temperature']),
+                                        float(row['humidity']), float(row['pressure']),
+                                        float(row['wind_speed']), float(row['cloud_cover']),
+                                        row['season'], '')
+            self.assertEqual(result['predicted_rainfall'], expected)
+            self.assertEqual(result['probability'], calculate_rain_probability(expected))
+            self.assertEqual(result['description'], 
+                             get_weather_description(expected, float(row['humidity']), float(row['cloud_cover'])))
+    
+    def test_score_rows_rejects_invalid_row(self):
+        """Test invalid numeric values are reported with the row index"""
+        with self.assertRaisesRegex(ValueError, 'Row 0'):
+            score_rows([{'location': 'London', 'temperature': 'hot'}])
+    
+    def test_score_rows_rejects_non_finite_values(self):
+        """Test NaN and infinity (accepted by JSON parsers) are rejected with the row index"""
+        row = {'location': 'London', 'temperature': 20, 'humidity': 80, 'pressure': 1000,
+               'wind_speed': 5, 'cloud_cover': 50}
+        for value in (float('nan'), float('inf'), '-Infinity'):
+            with self.assertRaisesRegex(ValueError, 'Row 1 must provide finite'):
+                score_rows([row, dict(row, humidity=value)])
+    
+    @patch('app.utils.geocoding.lookup_nominatim')
+    def test_null_fields_are_treated_as_missing(self, mock_lookup):
+        """Test JSON null location, season and date become empty strings, not 'None'"""
+        row = {'location': None, 'season': None, 'date': None, 'temperature': 20, 'humidity': 80,
+               'pressure': 1000, 'wind_speed': 5, 'cloud_cover': 50}
+        columns = rows_to_columns([row])
+        self.assertEqual((columns['location'], columns['season'], columns['date']), ([''], [''], ['']))
+        self.assertEqual(score_rows([row])[0]['location'], '')
+        mock_lookup.assert_not_called()
+    
+    @patch('app.utils.geocoding.lookup_nominatim', return_value=(None, None))
+    def test_network_geocodes_are_capped_per_batch(self, mock_lookup):
+        """Test unknown locations past the budget are scored without a network lookup"""
+        rows = [{'location': f'Nowhere {i}', 'temperature': 20, 'humidity': 90, 'pressure': 1000,
+                 'wind_speed': 5, 'cloud_cover': 90} for i in range(8)]
+        with patch.object(Config, 'BATCH_GEOCODE_LOOKUPS', 3):
+            results = score_rows(rows)
+            self.assertEqual(mock_lookup.call_count, 3)
+            # The misses are cached now, so a repeat batch needs no lookups for them
+            score_rows(rows[:3])
+            self.assertEqual(mock_lookup.call_count, 3)
+        self.assertEqual(len({result['predicted_rainfall'] for result in results}), 1)
+    
+    def test_round_half_even_matches_builtin(self):
+        """Test rounding agrees with round() on .5 boundaries"""
+        values = np.array([0.125, 0.135, 2.675, 1.005, 0.5, 7.245])
+        np.testing.assert_array_equal(round_half_even(values), [round(v, 2) for v in values.tolist()])
+
+if __name__ == '__main__':
+    unittest.main()
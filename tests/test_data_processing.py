@@ -5,9 +5,13 @@ from app.utils.data_processing import (
     rule_based_prediction, calculate_rain_probability, 
     get_weather_description, predict_rainfall, preprocess_input
 )
+from tests.helpers import isolate_geocode_cache
 
 class TestDataProcessing(unittest.TestCase):
     
+    def setUp(self):
+        isolate_geocode_cache(self)
+    
     def test_rule_based_prediction_high_humidity_cloud(self):
         """Test rule-based prediction with high humidity and cloud cover"""
         result = rule_based_prediction(90, 85, 20, 1000)
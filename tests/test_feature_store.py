@@ -0,0 +1,99 @@
+import unittest
+import os
+import json
+import numpy as np
+import pandas as pd
+from unittest.mock import patch
+from sklearn.preprocessing import StandardScaler
+from sklearn.ensemble import RandomForestRegressor
+from config import Config
+from app.models.bundle import CURRENT_BUNDLE, VERSIONS_DIR, read_bundle
+from app.utils.feature_store import (
+    FEATURE_COLUMNS, write_feature_matrix, load_feature_matrix, label_encoder, predict_in_batches
+)
+from app.utils.weather_store import to_table
+from scripts import train_model
+from tests.helpers import TempDirTestCase
+
+def make_table(rows, offset=0):
+    values = np.arange(rows, dtype=float) + offset
+    df = pd.DataFrame({column: values * (j + 1) for j, column in enumerate(FEATURE_COLUMNS)})
+    df['month'] = (values % 12 + 1).astype(int)
+    df['day'] = (values % 28 + 1).astype(int)
+    df['location_encoded'] = (values % 3).astype(int)
+    df['season_encoded'] = (values % 2).astype(int)
+    df['precipitation_sum'] = values / 2
+    return to_table(df)
+
+class TestFeatureStore(TempDirTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.vocabulary = {'location': ['udupi', 'mysore', 'hassan'], 'season': ['winter', 'monsoon']}
+    
+    def test_round_trip_is_memory_mapped(self):
+        """Test the matrix is written in feature order and mapped read-only"""
+        tables = [make_table(5), make_table(3, offset=100)]
+        write_feature_matrix(tables, self.vocabulary, self.test_dir, source_hash='abc')
+        matrix = load_feature_matrix(self.test_dir)
+        self.assertIsInstance(matrix.X, np.memmap)
+        self.assertFalse(matrix.X.flags.writeable)
+        self.assertEqual(matrix.X.dtype, np.float32)
+        self.assertEqual(matrix.X.shape, (8, len(FEATURE_COLUMNS)))
+        self.assertEqual(matrix.X[6, 0], 101.0)
+        self.assertEqual(matrix.X[6, FEATURE_COLUMNS.index('location_encoded')], 101 % 3)
+        self.assertEqual(list(matrix.y[:2]), [0.0, 0.5])
+        self.assertEqual(matrix.manifest['source_hash'], 'abc')
+        self.assertEqual(list(label_encoder(matrix.manifest['vocabulary']['location']).transform(['mysore'])), [1])
+    
+    def test_new_generation_replaces_old(self):
+        """Test rewriting swaps the manifest and removes the previous files"""
+        first = write_feature_matrix([make_table(5)], self.vocabulary, self.test_dir)
+        old = load_feature_matrix(self.test_dir)
+        second = write_feature_matrix([make_table(7)], self.vocabulary, self.test_dir)
+        self.assertFalse(os.path.exists(os.path.join(self.test_dir, first['generation'])))
+        self.assertEqual(len(load_feature_matrix(self.test_dir).X), 7)
+        # A process still holding the old map keeps reading it
+        self.assertEqual(len(old.X), 5)
+        self.assertNotEqual(first['generation'], second['generation'])
+    
+    def test_missing_and_incompatible(self):
+        """Test a missing store reads as None and an old layout is refused"""
+        self.assertIsNone(load_feature_matrix(self.test_dir))
+        write_feature_matrix([make_table(2)], self.vocabulary, self.test_dir)
+        path = os.path.join(self.test_dir, 'manifest.json')
+        with open(path) as f:
+            manifest = json.load(f)
+        manifest['version'] = 0
+        with open(path, 'w') as f:
+            json.dump(manifest, f)
+        with self.assertRaises(ValueError):
+            load_feature_matrix(self.test_dir)
+    
+    def test_predict_in_batches_matches_model(self):
+        """Test batched scoring over the map equals one predict call"""
+        write_feature_matrix([make_table(50)], self.vocabulary, self.test_dir)
+        matrix = load_feature_matrix(self.test_dir)
+        scaler = StandardScaler().fit(matrix.X)
+        model = RandomForestRegressor(n_estimators=5, random_state=0).fit(scaler.transform(matrix.X), matrix.y)
+        rows = np.array([3, 7, 11, 40, 49])
+        np.testing.assert_allclose(predict_in_batches(model, scaler, matrix.X, batch_rows=7),
+                                   model.predict(scaler.transform(matrix.X)))
+        np.testing.assert_allclose(predict_in_batches(model, scaler, matrix.X, rows, batch_rows=2),
+                                   model.predict(scaler.transform(matrix.X[rows])))
+    
+    def test_training_uses_feature_matrix_and_its_encoders(self):
+        """Test training maps the matrix and bundles the processing encoders with the model"""
+        write_feature_matrix([make_table(40)], self.vocabulary, self.test_dir, source_hash='abc')
+        model_dir = os.path.join(self.test_dir, 'models')
+        with patch.object(Config, 'FEATURE_STORE_DIR', self.test_dir), patch.object(Config, 'MODEL_DIR', model_dir):
+            model, scaler = train_model.train_model()
+        self.assertEqual(model.n_features_in_, len(FEATURE_COLUMNS))
+        self.assertEqual(sorted(os.listdir(model_dir)), [CURRENT_BUNDLE, VERSIONS_DIR])
+        bundle = read_bundle(os.path.join(model_dir, CURRENT_BUNDLE))
+        self.assertEqual(list(bundle.location_encoder.classes_), self.vocabulary['location'])
+        self.assertEqual(bundle.manifest['source_hash'], 'abc')
+        self.assertEqual(set(bundle.manifest['metrics']), {'rmse', 'mae', 'r2'})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+import os
+import shutil
+import tempfile
+from datetime import date
+from unittest.mock import patch
+from config import Config
+from app.utils.fetch_manifest import FetchManifest, merge_spans, latest_archive_date
+
+class TestFetchManifest(unittest.TestCase):
+    
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.test_dir, '_fetch_manifest.json')
+    
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+    
+    def test_merge_spans(self):
+        """Test overlapping and adjacent spans merge, gaps stay separate"""
+        self.assertEqual(merge_spans([('2023-01-05', '2023-01-10'), ('2023-01-01', '2023-01-04'),
+                                      ('2023-01-08', '2023-01-12'), ('2023-02-01', '2023-02-02')]),
+                         [(date(2023, 1, 1), date(2023, 1, 12)), (date(2023, 2, 1), date(2023, 2, 2))])
+    
+    def test_missing_spans(self):
+        """Test gaps are computed against the requested range"""
+        manifest = FetchManifest(self.path)
+        self.assertEqual(manifest.missing_spans('Udupi', '2023-01-01', '2023-01-31'),
+                         [(date(2023, 1, 1), date(2023, 1, 31))])
+        manifest.record('Udupi', '2023-01-05', '2023-01-10')
+        manifest.record('Udupi', '2023-01-20', '2023-02-10')
+        self.assertEqual(manifest.missing_spans('udupi', '2023-01-01', '2023-01-31'),
+                         [(date(2023, 1, 1), date(2023, 1, 4)), (date(2023, 1, 11), date(2023, 1, 19))])
+        self.assertEqual(manifest.missing_spans('Udupi', '2023-01-06', '2023-01-09'), [])
+        self.assertEqual(manifest.missing_spans('Udupi', '2023-02-01', '2023-02-12'),
+                         [(date(2023, 2, 11), date(2023, 2, 12))])
+    
+    def test_persists_across_runs(self):
+        """Test recorded spans survive a restart"""
+        FetchManifest(self.path).record('Navi Mumbai', '2022-01-01', '2023-12-31')
+        manifest = FetchManifest(self.path)
+        self.assertEqual(manifest.spans('Navi Mumbai'), [(date(2022, 1, 1), date(2023, 12, 31))])
+        self.assertEqual(manifest.missing_spans('Navi Mumbai', '2022-01-01', '2024-01-01'),
+                         [(date(2024, 1, 1), date(2024, 1, 1))])
+    
+    def test_latest_archive_date(self):
+        """Test incremental fetches stop at the archive's lag"""
+        with patch.object(Config, 'ARCHIVE_LAG_DAYS', 5):
+            self.assertEqual(latest_archive_date(date(2024, 3, 10)), date(2024, 3, 5))
+
+if __name__ == '__main__':
+    unittest.main()
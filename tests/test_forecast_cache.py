@@ -0,0 +1,68 @@
+import unittest
+from app.utils.forecast_cache import (
+    ForecastCache, next_update_boundary, hourly_value, hour_index, local_date
+)
+
+# 2024-06-15 00:00 UTC
+BASE = 1718409600
+
+def make_payload(start, utc_offset=0):
+    return {
+        'utc_offset_seconds': utc_offset,
+        'current_weather': {'temperature': 25.0, 'windspeed': 8.0},
+        'hourly': {
+            'time': [start + i * 3600 for i in range(48)],
+            'relative_humidity_2m': [float(i) for i in range(48)],
+            'surface_pressure': [1000.0 + i for i in range(48)],
+            'cloud_cover': [None] + [10.0] * 47,
+            'temperature_2m': [20.0] * 48,
+        }
+    }
+
+class TestForecastCache(unittest.TestCase):
+    
+    def setUp(self):
+        self.cache = ForecastCache(max_entries=2, update_interval=3600)
+    
+    def test_next_update_boundary(self):
+        """Test entries expire at the top of the next update interval"""
+        self.assertEqual(next_update_boundary(BASE + 10, 3600), BASE + 3600)
+        self.assertEqual(next_update_boundary(BASE, 3600), BASE + 3600)
+    
+    def test_hit_within_bucket_and_expiry(self):
+        """Test entries are served within their hour bucket and dropped after it"""
+        self.cache.put(12.91, 74.85, make_payload(BASE), now=BASE + 60)
+        self.assertIsNotNone(self.cache.get(12.914, 74.853, now=BASE + 1800))
+        self.assertIsNone(self.cache.get(12.91, 74.85, now=BASE + 3600))
+    
+    def test_only_used_variables_are_stored(self):
+        """Test unused hourly variables are not kept"""
+        entry = self.cache.put(1, 2, make_payload(BASE), now=BASE)
+        self.assertNotIn('temperature_2m', entry.hourly)
+        self.assertEqual(entry.hourly['relative_humidity_2m'].typecode, 'f')
+    
+    def test_hour_indexed_in_location_timezone(self):
+        """Test the current hour is found from UTC instants, not the server clock"""
+        # Series starts at local midnight in UTC+05:30, i.e. 18:30 UTC the day before
+        start = BASE - 19800
+        entry = self.cache.put(12.9, 74.8, make_payload(start, 19800), now=BASE + 7200)
+        self.assertEqual(hour_index(entry, BASE + 7200), 7)
+        self.assertEqual(hourly_value(entry, 'relative_humidity_2m', BASE + 7200, 70), 7.0)
+        self.assertEqual(local_date(entry, BASE + 7200), '2024-06-15')
+        self.assertEqual(local_date(entry, start + 60), '2024-06-15')
+    
+    def test_missing_values_use_default(self):
+        """Test null and out-of-range hours fall back to defaults"""
+        entry = self.cache.put(1, 2, make_payload(BASE), now=BASE)
+        self.assertEqual(hourly_value(entry, 'cloud_cover', BASE, 50), 50)
+        self.assertEqual(hourly_value(entry, 'cloud_cover', BASE + 100 * 3600, 50), 50)
+    
+    def test_cache_is_bounded(self):
+        """Test the least recently used location is evicted"""
+        for i in range(3):
+            self.cache.put(float(i), 0.0, make_payload(BASE), now=BASE)
+        self.assertEqual(len(self.cache), 2)
+        self.assertIsNone(self.cache.get(0.0, 0.0, now=BASE))
+
+if __name__ == '__main__':
+    unittest.main()
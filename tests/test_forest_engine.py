@@ -0,0 +1,156 @@
+import unittest
+import os
+import shutil
+import tempfile
+import numpy as np
+from unittest.mock import patch
+from sklearn.ensemble import RandomForestRegressor, RandomForestClassifier
+from sklearn.tree import DecisionTreeRegressor
+from sklearn.preprocessing import StandardScaler, LabelEncoder
+from app.models import registry
+from app.models.forest_engine import CompiledForest, compile_model
+from app.models.registry import ModelRegistry, save_model_components
+from app.utils.data_processing import preprocess_input
+
+SCALE = np.array([40, 100, 1100, 30, 100, 12, 28, 40, 4])
+
+def make_data(rows, seed=0):
+    rng = np.random.RandomState(seed)
+    X = rng.rand(rows, 9) * SCALE
+    y = X[:, 1] * X[:, 4] / 500 + rng.rand(rows)
+    return X, y
+
+class TestForestEngine(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        X, y = make_data(2000)
+        cls.scaler = StandardScaler().fit(X)
+        cls.model = RandomForestRegressor(n_estimators=100, max_depth=10, random_state=42, n_jobs=-1)
+        cls.model.fit(cls.scaler.transform(X), y)
+        cls.engine = CompiledForest.from_estimator(cls.model, cls.scaler)
+    
+    def test_matches_sklearn_forest(self):
+        """Test compiled predictions equal sklearn's for batches and single rows"""
+        X, _ = make_data(500, seed=1)
+        expected = self.model.predict(self.scaler.transform(X))
+        np.testing.assert_allclose(self.engine.predict(X), expected, rtol=1e-12, atol=1e-12)
+        single = [self.engine.predict_one(row) for row in X[:50]]
+        np.testing.assert_allclose(single, expected[:50], rtol=1e-12, atol=1e-12)
+    
+    def test_matches_on_split_thresholds(self):
+        """Test inputs exactly on a split threshold go left as in sklearn"""
+        X, _ = make_data(20, seed=2)
+        root = self.model.estimators_[0].tree_
+        scaled = self.scaler.transform(X)
+        scaled[:, root.feature[0]] = root.threshold[0]
+        X_on_split = self.scaler.inverse_transform(scaled)
+        np.testing.assert_allclose(self.engine.predict(X_on_split),
+                                   self.model.predict(self.scaler.transform(X_on_split)), rtol=1e-12)
+    
+    def test_single_tree_without_scaler(self):
+        """Test a lone decision tree compiles and scores unscaled input"""
+        X, y = make_data(300)
+        tree = DecisionTreeRegressor(max_depth=6, random_state=0).fit(X, y)
+        engine = compile_model(tree)
+        self.assertEqual(engine.n_trees, 1)
+        np.testing.assert_allclose(engine.predict(X[:40]), tree.predict(X[:40]), rtol=1e-12)
+    
+    def test_unsupported_models(self):
+        """Test non-tree models and classifiers are left uncompiled"""
+        self.assertIsNone(compile_model({'trees': 2}))
+        X, y = make_data(50)
+        with patch('builtins.print'):
+            self.assertIsNone(compile_model(RandomForestClassifier(n_estimators=2).fit(X, y > y.mean())))
+        with self.assertRaises(ValueError):
+            self.engine.predict(np.zeros((1, 3)))
+    
+    def test_registry_bundle_carries_engine(self):
+        """Test loaded bundles include a compiled engine that scores preprocessed input"""
+        model_dir = tempfile.mkdtemp()
+        try:
+            save_model_components(self.model, self.scaler, LabelEncoder().fit(['udupi']),
+                                  LabelEncoder().fit(['monsoon', 'winter']), model_dir)
+            bundle = ModelRegistry(model_dir, check_interval=0).get()
+            self.assertIsInstance(bundle.engine, CompiledForest)
+            with patch.object(registry, '_registry', ModelRegistry(model_dir, check_interval=0)):
+                features = preprocess_input('Udupi', '2024-07-01', 26, 90, 1005, 12, 85, 'monsoon', 'Morning')
+                prediction = bundle.engine.predict_one(features)
+                expected = self.model.predict(self.scaler.transform([[26, 90, 1005, 12, 85, 7, 1, 0, 0]]))[0]
+            # The bundled forest holds float32 leaf values
+            self.assertAlmostEqual(prediction, expected, delta=0.01)
+        finally:
+            shutil.rmtree(model_dir)
+    
+    def test_missing_values_route_like_sklearn(self):
+        """Test NaN inputs follow sklearn's per-node missing_go_to_left, also after save/load"""
+        X, y = make_data(1000, seed=5)
+        X_train = X.copy()
+        X_train[::7, 1] = np.nan
+        model = RandomForestRegressor(n_estimators=20, max_depth=8, random_state=0).fit(X_train, y)
+        X_test, _ = make_data(200, seed=6)
+        X_test[::2, 1] = np.nan
+        X_test[::3, 4] = np.nan
+        engine = compile_model(model)
+        np.testing.assert_allclose(engine.predict(X_test), model.predict(X_test), rtol=1e-12)
+        np.testing.assert_allclose([engine.predict_one(row) for row in X_test[:20]],
+                                   model.predict(X_test[:20]), rtol=1e-12)
+        model_dir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(model_dir, 'model.forest')
+            engine.compact().save(path)
+            np.testing.assert_allclose(CompiledForest.load(path).predict(X_test), model.predict(X_test), rtol=1e-6)
+        finally:
+            shutil.rmtree(model_dir)
+        # Trained without missing values: sklearn still routes NaN by the recorded side
+        nan_row = make_data(1, seed=7)[0]
+        nan_row[0, 1] = np.nan
+        self.assertAlmostEqual(self.engine.predict_one(nan_row),
+                               self.model.predict(self.scaler.transform(nan_row))[0], places=10)
+        legacy = CompiledForest(*(getattr(self.engine, name) for name in
+                                  ('feature', 'threshold', 'children', 'value', 'roots')),
+                                self.engine.max_depth, self.engine.n_features)
+        with self.assertRaises(ValueError):
+            legacy.predict(nan_row)
+    
+    def test_compact_keeps_splits_exact(self):
+        """Test float32 thresholds are rounded down so no split changes"""
+        compact = self.engine.compact()
+        self.assertEqual(compact.threshold.dtype, np.float32)
+        self.assertEqual(compact.value.dtype, np.float32)
+        self.assertTrue((compact.threshold.astype(np.float64) <= self.engine.threshold).all())
+        X, _ = make_data(500, seed=3)
+        np.testing.assert_allclose(compact.predict(X), self.model.predict(self.scaler.transform(X)), rtol=1e-6)
+    
+    def test_pruning(self):
+        """Test redundant splits collapse into leaves within the tolerance"""
+        X, y = make_data(300)
+        y = np.round(y)
+        tree = DecisionTreeRegressor(max_depth=8, random_state=0).fit(X, y)
+        engine = compile_model(tree)
+        exact = engine.compact()
+        pruned = engine.compact(prune_tolerance=0.5)
+        self.assertLessEqual(exact.node_count, engine.node_count)
+        self.assertLess(pruned.node_count, exact.node_count)
+        np.testing.assert_allclose(exact.predict(X), tree.predict(X), rtol=1e-6)
+        self.assertLessEqual(np.abs(pruned.predict(X) - tree.predict(X)).max(), 0.5 * tree.get_depth())
+    
+    def test_saved_forest_is_memory_mapped(self):
+        """Test the saved artifact loads as read-only views of one mapped file"""
+        model_dir = tempfile.mkdtemp()
+        try:
+            path = os.path.join(model_dir, 'model.forest')
+            compact = self.engine.compact()
+            compact.save(path)
+            loaded = CompiledForest.load(path)
+            self.assertFalse(loaded.threshold.flags.writeable)
+            self.assertFalse(loaded.children.flags.owndata)
+            self.assertEqual(loaded.max_depth, compact.max_depth)
+            np.testing.assert_array_equal(loaded.mean, self.scaler.mean_)
+            X, _ = make_data(100, seed=4)
+            np.testing.assert_array_equal(loaded.predict(X), compact.predict(X))
+        finally:
+            shutil.rmtree(model_dir)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import unittest
+import os
+import time
+import tempfile
+import shutil
+from unittest.mock import patch
+from app.utils.gazetteer import Gazetteer, build_gazetteer, load_places_csv
+
+class TestGazetteer(unittest.TestCase):
+    
+    def setUp(self):
+        """Build a gazetteer from the catalogs plus a temporary CSV"""
+        self.test_dir = tempfile.mkdtemp()
+        self.csv_path = os.path.join(self.test_dir, 'places.csv')
+        with open(self.csv_path, 'w') as f:
+            f.write('name,lat,lon,district\n')
+            f.write('Hospet,15.2689,76.3909,Vijayanagara\n')
+            f.write('Broken Row,not-a-number,1,\n')
+        self.gazetteer = build_gazetteer(self.csv_path)
+    
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+    
+    def test_load_places_csv_skips_invalid_rows(self):
+        """Test CSV import keeps valid rows only"""
+        places = load_places_csv(self.csv_path)
+        self.assertEqual(places, [('Hospet', 15.2689, 76.3909, 'Vijayanagara')])
+    
+    def test_lookup_catalog_and_csv_places(self):
+        """Test exact lookups for catalog and imported places"""
+        self.assertEqual(self.gazetteer.lookup('udupi'), (13.3409, 74.7421))
+        self.assertEqual(self.gazetteer.lookup(' HOSPET '), (15.2689, 76.3909))
+        self.assertIsNone(self.gazetteer.lookup('Atlantis'))
+        self.assertIsNone(self.gazetteer.lookup(''))
+    
+    def test_suggest_prefix(self):
+        """Test prefix suggestions are sorted and limited"""
+        names = [place['name'] for place in self.gazetteer.suggest('b', limit=50)]
+        self.assertIn('Bangalore', names)
+        self.assertIn('Bhatkal', names)
+        self.assertEqual(names, sorted(names, key=str.lower))
+        self.assertEqual(len(self.gazetteer.suggest('b', limit=2)), 2)
+        self.assertEqual(self.gazetteer.suggest('zzz'), [])
+        self.assertEqual(self.gazetteer.suggest('  '), [])
+    
+    def test_duplicate_names_collapse(self):
+        """Test the same place from several sources is stored once"""
+        gazetteer = Gazetteer([('Pune', 18.5, 73.8, ''), ('pune', 18.52, 73.85, 'Pune')])
+        self.assertEqual(len(gazetteer), 1)
+        self.assertEqual(gazetteer.lookup('Pune'), (18.52, 73.85))
+    
+    def test_suggest_is_sub_millisecond(self):
+        """Test prefix lookups stay well under a millisecond on a large table"""
+        places = [(f'place {i:06d}', 10.0, 70.0, '') for i in range(100000)]
+        gazetteer = Gazetteer(places)
+        start = time.perf_counter()
+        for _ in range(100):
+            gazetteer.suggest('place 0500', limit=10)
+        self.assertLess((time.perf_counter() - start) / 100, 0.001)
+    
+    @patch('app.utils.geocoding.lookup_nominatim')
+    def test_location_coordinates_use_gazetteer_first(self, mock_lookup):
+        """Test known names never reach the network"""
+        from app.utils.data_processing import get_location_coordinates
+        self.assertEqual(get_location_coordinates('Mangalore'), (12.9141, 74.8560))
+        mock_lookup.assert_not_called()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+import unittest
+import os
+import tempfile
+import shutil
+import sqlite3
+from unittest.mock import patch
+from app.utils.geocoding import GeocodeCache, normalize_location_name, get_catalog_coordinates
+import app.utils.geocoding as geocoding
+
+class TestGeocodeCache(unittest.TestCase):
+    
+    def setUp(self):
+        """Create a cache backed by a temporary SQLite file"""
+        self.test_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.test_dir, 'geocode.sqlite3')
+        self.cache = GeocodeCache(self.db_path, ttl=60, negative_ttl=60, max_memory_entries=2)
+    
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+    
+    def test_normalize_location_name(self):
+        """Test keys ignore case, punctuation and extra whitespace"""
+        self.assertEqual(normalize_location_name('  Udupi,  Karnataka '), 'udupi karnataka')
+        self.assertEqual(normalize_location_name('NEW YORK'), 'new york')
+    
+    def test_put_and_get(self):
+        """Test stored coordinates are returned for equivalent names"""
+        self.assertIsNone(self.cache.get('Mangalore'))
+        self.cache.put('Mangalore', 12.91, 74.85)
+        self.assertEqual(self.cache.get('mangalore '), (12.91, 74.85))
+    
+    def test_negative_cache(self):
+        """Test misses are cached as (None, None)"""
+        self.cache.put('Nowhereville', None, None)
+        self.assertEqual(self.cache.get('Nowhereville'), (None, None))
+    
+    def test_expired_entries_are_ignored(self):
+        """Test entries past their TTL are treated as unknown"""
+        self.cache.put('Old Town', 1.0, 2.0, ttl=-1)
+        self.assertIsNone(self.cache.get('Old Town'))
+    
+    def test_put_survives_a_locked_database(self):
+        """Test a failed SQLite write is reported and the entry is still served from memory"""
+        blocker = sqlite3.connect(self.db_path)
+        blocker.execute('BEGIN EXCLUSIVE')
+        self.cache._conn.execute('PRAGMA busy_timeout = 0')
+        try:
+            with patch('builtins.print') as mock_print:
+                self.cache.put('Mangalore', 12.91, 74.85)
+        finally:
+            blocker.rollback()
+            blocker.close()
+        self.assertIn('[WARN]', mock_print.call_args[0][0])
+        self.assertEqual(self.cache.get('Mangalore'), (12.91, 74.85))
+        self.assertEqual(len(self.cache), 0)
+    
+    def test_unusable_path_falls_back_to_memory(self):
+        """Test a cache path that cannot be created still gives a working cache"""
+        blocker = os.path.join(self.test_dir, 'not_a_dir')
+        with open(blocker, 'w') as f:
+            f.write('')
+        with patch('builtins.print') as mock_print:
+            cache = GeocodeCache(os.path.join(blocker, 'geocode.sqlite3'))
+        self.assertIn('[WARN]', mock_print.call_args[0][0])
+        self.assertIsNone(cache.get('Mangalore'))
+        cache.put('Mangalore', 12.91, 74.85)
+        self.assertEqual(cache.get('mangalore'), (12.91, 74.85))
+        lookup = patch('app.utils.geocoding.lookup_nominatim', return_value=(51.5, -0.12))
+        with patch.object(geocoding, '_cache', cache), lookup:
+            self.assertEqual(geocoding.geocode('London'), (51.5, -0.12))
+    
+    def test_failed_read_is_a_miss(self):
+        """Test a SQLite error while reading is treated as an unknown name"""
+        self.cache._conn.execute('DROP TABLE geocode')
+        with patch('builtins.print'):
+            self.assertIsNone(self.cache.get('Mangalore'))
+    
+    def test_persists_across_instances_and_bounds_memory(self):
+        """Test entries survive on disk while the in-memory LRU stays bounded"""
+        for i in range(5):
+            self.cache.put(f'Town {i}', float(i), float(i))
+        self.assertLessEqual(len(self.cache._memory), 2)
+        reopened = GeocodeCache(self.db_path)
+        self.assertEqual(reopened.get('Town 0'), (0.0, 0.0))
+        self.assertEqual(len(reopened), 5)
+    
+    def test_seeded_catalog_entries(self):
+        """Test catalog coordinates are seeded as permanent entries"""
+        catalog = get_catalog_coordinates()
+        self.assertIn('Udupi', catalog)
+        self.assertIn('Mumbai', catalog)
+        self.cache.seed(catalog)
+        self.assertEqual(self.cache.get('udupi'), (13.3409, 74.7421))
+    
+    @patch('app.utils.geocoding.lookup_nominatim', return_value=(51.5, -0.12))
+    def test_geocode_only_calls_network_once(self, mock_lookup):
+        """Test repeat lookups are served from the cache"""
+        with patch.object(geocoding, '_cache', self.cache):
+            self.assertEqual(geocoding.geocode('London'), (51.5, -0.12))
+            self.assertEqual(geocoding.geocode('LONDON'), (51.5, -0.12))
+        self.assertEqual(mock_lookup.call_count, 1)
+
+if __name__ == '__main__':
+    unittest.main()
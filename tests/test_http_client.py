@@ -0,0 +1,116 @@
+import unittest
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+import requests
+from unittest.mock import patch
+from app.utils.http_client import HttpClient, CircuitBreaker, CircuitOpenError
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Replies with the next status code from the server's script (200 once exhausted)"""
+    
+    def do_GET(self):
+        with self.server.lock:
+            self.server.hits += 1
+            status = self.server.script.pop(0) if self.server.script else 200
+        payload = b'{"ok": true}'
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+    
+    def log_message(self, format, *args):
+        pass
+
+class TestHttpClient(unittest.TestCase):
+    
+    def setUp(self):
+        """Start a scripted stub server and a client with no real backoff"""
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+        self.server.daemon_threads = True
+        self.server.lock = threading.Lock()
+        self.server.hits = 0
+        self.server.script = []
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.host = f'127.0.0.1:{self.server.server_address[1]}'
+        self.url = f'http://{self.host}/data'
+        self.client = HttpClient(max_retries=2, backoff_base=0.001, backoff_max=0.01,
+                                 failure_threshold=3, reset_timeout=0.2)
+    
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+    
+    def test_retries_transient_errors(self):
+        """Test 5xx responses are retried until success"""
+        self.server.script = [503, 502]
+        self.assertEqual(self.client.get_json(self.url), {'ok': True})
+        self.assertEqual(self.server.hits, 3)
+        stats = self.client.snapshot()[self.host]
+        self.assertEqual(stats['retries'], 2)
+        self.assertEqual(stats['errors'], 2)
+        self.assertEqual(stats['circuit'], 'closed')
+    
+    def test_client_errors_are_not_retried(self):
+        """Test 4xx responses fail immediately without tripping the breaker"""
+        self.server.script = [404]
+        with self.assertRaises(requests.HTTPError):
+            self.client.get_json(self.url)
+        self.assertEqual(self.server.hits, 1)
+        self.assertEqual(self.client.breaker(self.host).failures, 0)
+    
+    def test_circuit_opens_and_recovers(self):
+        """Test repeated failures open the circuit, then a trial call closes it"""
+        self.server.script = [500] * 3
+        with self.assertRaises(requests.HTTPError):
+            self.client.get_json(self.url)
+        self.assertEqual(self.client.breaker(self.host).state, 'open')
+        
+        with self.assertRaises(CircuitOpenError):
+            self.client.get_json(self.url)
+        self.assertEqual(self.server.hits, 3)
+        self.assertEqual(self.client.snapshot()[self.host]['short_circuited'], 1)
+        
+        time.sleep(0.25)
+        self.assertEqual(self.client.get_json(self.url), {'ok': True})
+        self.assertEqual(self.client.breaker(self.host).state, 'closed')
+    
+    def test_connection_errors_fail_after_retries(self):
+        """Test unreachable hosts raise after the bounded retries"""
+        self.server.shutdown()
+        self.server.server_close()
+        with self.assertRaises(requests.ConnectionError):
+            self.client.get(self.url, timeout=1)
+        self.assertEqual(self.client.snapshot()[self.host]['requests'], 3)
+    
+    def test_half_open_allows_single_trial(self):
+        """Test only one call is let through while half-open"""
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+        breaker.record_failure()
+        self.assertFalse(breaker.allow())
+        time.sleep(0.06)
+        self.assertTrue(breaker.allow())
+        self.assertFalse(breaker.allow())
+        breaker.record_failure()
+        self.assertEqual(breaker.state, 'open')
+    
+    def test_other_errors_end_the_half_open_trial(self):
+        """Test a non-retried error during the trial re-opens the circuit instead of wedging it"""
+        self.server.script = [500] * 3
+        with self.assertRaises(requests.HTTPError):
+            self.client.get_json(self.url)
+        time.sleep(0.25)
+        session = self.client._host_state(self.host)[0]
+        with patch.object(session, 'get', side_effect=requests.exceptions.ChunkedEncodingError('truncated')):
+            with self.assertRaises(requests.exceptions.ChunkedEncodingError):
+                self.client.get_json(self.url)
+        breaker = self.client.breaker(self.host)
+        self.assertEqual(breaker.state, 'open')
+        self.assertFalse(breaker._trial_in_flight)
+        time.sleep(0.25)
+        self.assertEqual(self.client.get_json(self.url), {'ok': True})
+        self.assertEqual(breaker.state, 'closed')
+
+if __name__ == '__main__':
+    unittest.main()
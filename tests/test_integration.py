@@ -1,6 +1,10 @@
 import unittest
+import os
+import shutil
+import tempfile
 from unittest.mock import patch
 from app import create_app
+from app.utils import prediction_log
 from config import Config
 
 class TestConfig(Config):
@@ -16,9 +20,16 @@ class TestIntegration(unittest.TestCase):
         self.client = self.app.test_client()
         self.app_context = self.app.app_context()
         self.app_context.push()
+        # Keep recorded predictions out of the real prediction log
+        self.log_dir = tempfile.mkdtemp()
+        log = prediction_log.PredictionLog(os.path.join(self.log_dir, 'predictions.sqlite3'))
+        self.log_patch = patch.object(prediction_log, '_log', log)
+        self.log_patch.start()
     
     def tearDown(self):
         """Clean up after tests"""
+        self.log_patch.stop()
+        shutil.rmtree(self.log_dir)
         self.app_context.pop()
     
     def test_complete_prediction_workflow(self):
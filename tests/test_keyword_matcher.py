@@ -0,0 +1,53 @@
+import unittest
+import time
+from app.utils.keyword_matcher import KeywordMatcher, load_keyword_regions
+from app.utils.data_processing import get_keyword_multiplier
+
+class TestKeywordMatcher(unittest.TestCase):
+    
+    def test_highest_priority_match_wins(self):
+        """Test the lowest priority number is returned regardless of position"""
+        matcher = KeywordMatcher([('karnataka', 1), ('udupi', 0), ('sea', 2)])
+        self.assertEqual(matcher.match('seaside udupi karnataka'), 0)
+        self.assertEqual(matcher.match('karnataka seaside'), 1)
+        self.assertEqual(matcher.match('season'), 2)
+        self.assertIsNone(matcher.match('london'))
+    
+    def test_overlapping_keywords(self):
+        """Test keywords that are suffixes of other keywords are found"""
+        matcher = KeywordMatcher([('hill', 1), ('chill', 5), ('ill', 3)])
+        self.assertEqual(matcher.match('chill'), 1)
+        self.assertEqual(matcher.match('chil ill'), 3)
+    
+    def test_region_table_multipliers(self):
+        """Test the data file reproduces the original keyword rules"""
+        cases = {
+            'Mangalore': 1.6,
+            'Sirsi': 1.5,
+            'Hassan': 1.4,
+            'Bangalore Urban': 1.2,
+            'Hubli-Dharwad': 1.0,
+            'Bellary': 0.8,
+            'Rural Karnataka': 1.2,
+            'Long Beach': 1.2,
+            'Hill Valley': 1.3,
+            'Thar Desert': 0.3,
+            'Udupi coast hill': 1.6,
+            'London': 1.0,
+        }
+        for location, expected in cases.items():
+            self.assertEqual(get_keyword_multiplier(location), expected, location)
+    
+    def test_match_cost_independent_of_table_size(self):
+        """Test matching thousands of keywords stays fast"""
+        matcher, multipliers = load_keyword_regions()
+        self.assertEqual(len(multipliers), 10)
+        big = KeywordMatcher([(f'taluk{i:05d}', i) for i in range(5000)])
+        start = time.perf_counter()
+        for _ in range(1000):
+            big.match('somewhere near taluk04999 in karnataka')
+        self.assertLess((time.perf_counter() - start) / 1000, 0.001)
+        self.assertEqual(big.match('somewhere near taluk04999'), 4999)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import unittest
+import json
+import os
+import shutil
+import tempfile
+import numpy as np
+import pandas as pd
+from unittest.mock import MagicMock
+from app.utils.location_catalog import (
+    load_location_catalog, build_season_lut, calendar_features
+)
+from app.utils.gazetteer import get_catalog_places
+from app.utils.ingestion import ingest_regions
+
+INDIAN = ['winter', 'winter', 'summer', 'summer', 'summer', 'monsoon', 'monsoon', 'monsoon',
+          'monsoon', 'post-monsoon', 'post-monsoon', 'winter']
+
+class TestLocationCatalog(unittest.TestCase):
+    
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+    
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+    
+    def write_catalog(self, catalog):
+        path = os.path.join(self.test_dir, 'catalog.json')
+        with open(path, 'w') as f:
+            json.dump(catalog, f)
+        return path
+    
+    def test_shipped_catalog(self):
+        """Test the shipped catalog loads with its regions and season schemes"""
+        catalog = load_location_catalog()
+        self.assertEqual(len(catalog['karnataka'].locations), 42)
+        self.assertEqual(len(catalog['india'].locations), 7)
+        self.assertEqual(catalog['karnataka'].extra_columns, ('district',))
+        self.assertEqual(list(catalog['india'].season_lut[1:]), INDIAN)
+        self.assertEqual(catalog['global'].season_lut[4], 'spring')
+        self.assertFalse(catalog['global'].gazetteer)
+    
+    def test_gazetteer_uses_gazetteer_regions_only(self):
+        """Test offline geocoding covers the Indian regions but not the global reference cities"""
+        names = {name for name, _, _, _ in get_catalog_places()}
+        self.assertIn('Udupi', names)
+        self.assertIn('Delhi', names)
+        self.assertNotIn('London', names)
+    
+    def test_calendar_features_match_pandas(self):
+        """Test vectorized month/day/season agree with pandas over leap years"""
+        dates = pd.date_range('2023-12-25', '2024-03-05')
+        month, day, season = calendar_features(dates.strftime('%Y-%m-%d').to_numpy(), build_season_lut(INDIAN))
+        self.assertEqual(month.dtype, np.int8)
+        self.assertEqual(month.tolist(), dates.month.tolist())
+        self.assertEqual(day.tolist(), dates.day.tolist())
+        self.assertEqual(season.tolist(), [INDIAN[m - 1] for m in dates.month])
+        self.assertIn(29, day[month == 2].tolist())
+    
+    def test_invalid_scheme(self):
+        """Test catalog errors are reported on load"""
+        with self.assertRaises(ValueError):
+            build_season_lut(['winter'] * 11)
+        path = self.write_catalog({
+            'season_schemes': {'indian': INDIAN},
+            'regions': {'x': {'season_scheme': 'tropical', 'start_date': '2024-01-01', 'locations': {}}}
+        })
+        with self.assertRaises(ValueError):
+            load_location_catalog(path)
+        region = {'season_scheme': 'indian', 'start_date': '2024-01-01', 'locations': {'Udupi': {'lat': 13.3, 'lon': 74.7}}}
+        path = self.write_catalog({'season_schemes': {'indian': INDIAN}, 'regions': {'a': region, 'b': region}})
+        with self.assertRaises(ValueError) as context:
+            load_location_catalog(path)
+        self.assertIn('Udupi', str(context.exception))
+    
+    def test_ingest_regions_uses_catalog_settings(self):
+        """Test a region added to the catalog is fetched with its own scheme, timezone and start date"""
+        path = self.write_catalog({
+            'season_schemes': {'indian': INDIAN},
+            'regions': {
+                'goa': {'season_scheme': 'indian', 'timezone': 'Asia/Kolkata', 'start_date': '2024-01-01',
+                        'extra_columns': ['district'],
+                        'locations': {'Panaji': {'lat': 15.49, 'lon': 73.83, 'district': 'North Goa'}}}
+            }
+        })
+        fetcher = MagicMock()
+        reports = ingest_regions(end_date='2024-01-31', catalog=load_location_catalog(path), fetcher=fetcher,
+                                 manifest=MagicMock(), store_root=self.test_dir)
+        self.assertEqual(list(reports), ['goa'])
+        args, kwargs = fetcher.fetch_all.call_args
+        self.assertEqual(args[:3], ({'Panaji': {'lat': 15.49, 'lon': 73.83, 'district': 'North Goa'}},
+                                    '2024-01-01', '2024-01-31'))
+        self.assertEqual(args[3][7], 'monsoon')
+        self.assertEqual(kwargs['timezone'], 'Asia/Kolkata')
+        self.assertEqual(kwargs['extra_columns'], ('district',))
+        with self.assertRaises(ValueError):
+            ingest_regions(['mars'], catalog=load_location_catalog(path), fetcher=fetcher, manifest=MagicMock())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import unittest
+import os
+import subprocess
+import sys
+import numpy as np
+from unittest.mock import patch
+from app.utils.location_features import LocationFeatureTable, stable_location_code
+
+PLACES = [('Mangalore', 12.9141, 74.8560, 'Dakshina Kannada'), ('London', 51.5074, -0.1278, '')]
+
+class TestLocationFeatureTable(unittest.TestCase):
+    
+    def setUp(self):
+        """Build a table from sorted encoder classes and a small catalog"""
+        self.table = LocationFeatureTable(
+            location_classes=np.array(['bangalore', 'mangalore', 'mumbai']),
+            season_classes=np.array(['monsoon', 'summer', 'winter']),
+            places=PLACES
+        )
+    
+    def test_encoded_ids_match_label_encoder(self):
+        """Test location and season codes equal the encoder's class positions"""
+        self.assertEqual(self.table.encode_location('Mangalore'), 1)
+        self.assertEqual(self.table.encode_location(' MUMBAI '), 2)
+        self.assertEqual(self.table.encode_location('London'), 0)  # Not seen by the encoder
+        self.assertEqual(self.table.encode_location('Atlantis'), 0)
+        self.assertEqual(self.table.encode_season('Winter'), 2)
+        self.assertEqual(self.table.encode_season('autumn'), 0)
+    
+    def test_location_multiplier(self):
+        """Test precomputed climate and keyword factors"""
+        self.assertAlmostEqual(self.table.location_multiplier('mangalore'), 1.2 * 1.6)
+        self.assertAlmostEqual(self.table.location_multiplier('London'), 0.6)
+        # Encoder-only names have no coordinates and defer to geocoding
+        self.assertIsNone(self.table.location_multiplier('Bangalore'))
+        self.assertIsNone(self.table.location_multiplier('Atlantis'))
+    
+    def test_zero_coordinates_are_known(self):
+        """Test places on the equator or prime meridian get a climate factor"""
+        table = LocationFeatureTable(places=[('Null Island', 0.0, 0.0, ''), ('Greenwich', 51.48, 0.0, '')])
+        self.assertEqual(table.climate_factors[table.row('Null Island')], 1.4)
+        self.assertEqual(table.climate_factors[table.row('Greenwich')], 0.6)
+        self.assertIsNotNone(table.location_multiplier('Greenwich'))
+    
+    def test_fallback_encoding_without_encoders(self):
+        """Test fallback codes when no trained encoders are available"""
+        table = LocationFeatureTable(places=PLACES)
+        self.assertEqual(table.encode_location('Tokyo'), stable_location_code('tokyo'))
+        self.assertEqual(table.encode_season('Autumn'), 2)
+    
+    def test_empty_encoders_use_fallback_encoding(self):
+        """Test encoders with no classes fall back instead of encoding everything as 0"""
+        table = LocationFeatureTable(location_classes=np.array([]), season_classes=np.array([]), places=PLACES)
+        self.assertEqual(table.encode_location('Tokyo'), stable_location_code('tokyo'))
+        self.assertEqual(table.encode_location('Mangalore'), stable_location_code('mangalore'))
+        self.assertEqual(table.encode_season('Autumn'), 2)
+    
+    def test_stable_location_code_across_processes(self):
+        """Test fallback codes do not depend on per-process hash randomization"""
+        code = subprocess.check_output([
+            sys.executable, '-c',
+            'from app.utils.location_features import stable_location_code; print(stable_location_code("Tokyo"))'
+        ], env=dict(os.environ, PYTHONHASHSEED='random'), cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        self.assertEqual(int(code), stable_location_code('Tokyo'))
+        self.assertTrue(0 <= stable_location_code('Tokyo') < 10)
+    
+    @patch('app.utils.data_processing.get_location_coordinates')
+    def test_catalog_locations_skip_geocoding(self, mock_coords):
+        """Test predictions for catalog locations use the table instead of geocoding"""
+        from app.utils.data_processing import get_location_multiplier
+        self.assertAlmostEqual(get_location_multiplier('Udupi'), 1.2 * 1.6)
+        mock_coords.assert_not_called()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+import unittest
+import os
+import shutil
+import tempfile
+import joblib
+import numpy as np
+from unittest.mock import patch
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.preprocessing import StandardScaler, LabelEncoder
+from config import Config
+from app.models import bundle
+from app.models.bundle import (
+    CURRENT_BUNDLE, read_bundle, list_versions, current_version, promote, rollback, version_path
+)
+from app.models.forest_engine import CompiledForest
+from app.models import registry
+from app.models.registry import ModelRegistry, save_model_components, MODEL_FILES
+from app.utils.data_processing import load_model_components
+from app.utils.feature_store import predict_in_batches
+
+def make_components(seed=0):
+    rng = np.random.RandomState(seed)
+    X = rng.rand(200, 9) * 50
+    y = X[:, 1] / 10 + rng.rand(200)
+    scaler = StandardScaler().fit(X)
+    model = RandomForestRegressor(n_estimators=5, max_depth=4, random_state=seed).fit(scaler.transform(X), y)
+    return X, model, scaler, LabelEncoder().fit(['mysore', 'udupi']), LabelEncoder().fit(['monsoon', 'winter'])
+
+class TestModelBundle(unittest.TestCase):
+
+    def setUp(self):
+        self.model_dir = tempfile.mkdtemp()
+    
+    def tearDown(self):
+        shutil.rmtree(self.model_dir)
+    
+    def _publish(self, seed=0, **kwargs):
+        _, model, scaler, location_encoder, season_encoder = make_components(seed)
+        return save_model_components(model, scaler, location_encoder, season_encoder, self.model_dir, **kwargs)
+    
+    def test_round_trip_from_one_mapped_file(self):
+        """Test one bundle file restores the model, scaler, encoders and manifest"""
+        X, model, scaler, location_encoder, season_encoder = make_components()
+        manifest = save_model_components(model, scaler, location_encoder, season_encoder, self.model_dir,
+                                         source_hash='abc', metrics={'rmse': 1.5})
+        loaded = read_bundle(os.path.join(self.model_dir, CURRENT_BUNDLE))
+        self.assertEqual(loaded.version, manifest['version'])
+        self.assertEqual(loaded.manifest['source_hash'], 'abc')
+        self.assertEqual(loaded.manifest['metrics'], {'rmse': 1.5})
+        self.assertEqual(loaded.manifest['vocabulary']['season'], ['monsoon', 'winter'])
+        self.assertIsInstance(loaded.model, CompiledForest)
+        self.assertFalse(loaded.engine.threshold.flags.writeable)
+        np.testing.assert_array_equal(loaded.scaler.transform(X), scaler.transform(X))
+        np.testing.assert_allclose(loaded.engine.predict(X), model.predict(scaler.transform(X)), rtol=1e-6)
+        self.assertEqual(list(loaded.location_encoder.transform(['udupi'])), [1])
+    
+    def test_non_tree_model_is_pickled(self):
+        """Test models the forest engine cannot hold are stored pickled in the bundle"""
+        save_model_components({'trees': 1}, StandardScaler(), LabelEncoder().fit(['udupi']),
+                              LabelEncoder().fit(['winter']), self.model_dir)
+        loaded = read_bundle(os.path.join(self.model_dir, CURRENT_BUNDLE))
+        self.assertEqual(loaded.model, {'trees': 1})
+        self.assertIsNone(loaded.scaler)
+        self.assertIsNone(loaded.engine)
+    
+    def test_promote_and_rollback(self):
+        """Test new versions are promoted and rollback repoints the registry"""
+        first = self._publish(seed=0)['version']
+        second = self._publish(seed=1)['version']
+        self.assertEqual(list_versions(self.model_dir), [first, second])
+        registry = ModelRegistry(self.model_dir, check_interval=0)
+        self.assertEqual(registry.get().version, second)
+        self.assertEqual(rollback(self.model_dir), first)
+        self.assertEqual(registry.get().version, first)
+        with self.assertRaises(ValueError):
+            rollback(self.model_dir)
+        promote(second, self.model_dir)
+        self.assertEqual(current_version(self.model_dir), second)
+    
+    def test_promote_refuses_missing_or_corrupt_versions(self):
+        """Test a bad version never replaces the current link"""
+        version = self._publish()['version']
+        with self.assertRaises(OSError):
+            promote('missing', self.model_dir)
+        with open(version_path('0', self.model_dir), 'wb') as f:
+            f.write(b'not a bundle')
+        with self.assertRaises(ValueError):
+            promote('0', self.model_dir)
+        self.assertEqual(current_version(self.model_dir), version)
+    
+    def test_old_versions_pruned(self):
+        """Test only the newest MODEL_KEEP_VERSIONS versions are kept"""
+        with patch.object(Config, 'MODEL_KEEP_VERSIONS', 2):
+            versions = [self._publish(seed)['version'] for seed in range(3)]
+        self.assertEqual(list_versions(self.model_dir), versions[1:])
+    
+    def test_legacy_artifacts_load_until_a_bundle_is_published(self):
+        """Test the registry still reads separate pickles, which publishing replaces"""
+        _, model, scaler, location_encoder, season_encoder = make_components()
+        for name, obj in zip(MODEL_FILES, (model, scaler, location_encoder, season_encoder)):
+            joblib.dump(obj, os.path.join(self.model_dir, name))
+        registry = ModelRegistry(self.model_dir, check_interval=0)
+        self.assertIsInstance(registry.get().engine, CompiledForest)
+        self.assertIsNone(registry.get().manifest)
+        self._publish()
+        self.assertEqual(sorted(os.listdir(self.model_dir)), [CURRENT_BUNDLE, bundle.VERSIONS_DIR])
+        self.assertIsNotNone(registry.get().manifest)
+    
+    def test_load_model_components_takes_scaled_input(self):
+        """Test the loaded model and scaler compose as model.predict(scaler.transform(X)) on both paths"""
+        X, model, scaler, location_encoder, season_encoder = make_components()
+        expected = model.predict(scaler.transform(X))
+        for name, obj in zip(MODEL_FILES, (model, scaler, location_encoder, season_encoder)):
+            joblib.dump(obj, os.path.join(self.model_dir, name))
+        for published in (False, True):
+            if published:
+                self._publish()
+            with patch.object(registry, '_registry', ModelRegistry(self.model_dir, check_interval=0)):
+                loaded_model, loaded_scaler, _, _ = load_model_components()
+                engine = registry.get_model_registry().get().engine
+            np.testing.assert_allclose(loaded_model.predict(loaded_scaler.transform(X)), expected, rtol=1e-6)
+            np.testing.assert_allclose(predict_in_batches(loaded_model, loaded_scaler, X, batch_rows=64),
+                                       expected, rtol=1e-6)
+            np.testing.assert_allclose(engine.predict(X), expected, rtol=1e-6)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import unittest
+import os
+import time
+import tempfile
+import shutil
+from sklearn.preprocessing import StandardScaler, LabelEncoder
+from app.models.bundle import CURRENT_BUNDLE
+from app.models.registry import ModelRegistry, save_model_components
+
+class TestModelRegistry(unittest.TestCase):
+    
+    def setUp(self):
+        """Create a temporary model directory with a full artifact set"""
+        self.model_dir = tempfile.mkdtemp()
+        self._write_artifacts(['london', 'tokyo'])
+        self.registry = ModelRegistry(self.model_dir, check_interval=0)
+    
+    def tearDown(self):
+        shutil.rmtree(self.model_dir)
+    
+    def _write_artifacts(self, locations):
+        location_encoder = LabelEncoder().fit(locations)
+        season_encoder = LabelEncoder().fit(['summer', 'winter'])
+        save_model_components({'trees': len(locations)}, StandardScaler(), 
+                              location_encoder, season_encoder, self.model_dir)
+    
+    def test_bundle_served_from_memory(self):
+        """Test repeated lookups return the same loaded objects"""
+        first = self.registry.get()
+        second = self.registry.get()
+        self.assertIsNotNone(first.model)
+        self.assertIs(first, second)
+        self.assertIs(first.location_encoder, second.location_encoder)
+    
+    def test_hot_reload_on_artifact_change(self):
+        """Test a new bundle is swapped in when artifacts are rewritten"""
+        first = self.registry.get()
+        time.sleep(0.01)
+        self._write_artifacts(['london', 'tokyo', 'sydney'])
+        second = self.registry.get()
+        self.assertIsNot(first, second)
+        self.assertEqual(second.model, {'trees': 3})
+        self.assertEqual(len(second.location_encoder.classes_), 3)
+    
+    def test_missing_artifacts_return_empty_bundle(self):
+        """Test registry falls back to an empty bundle when files are missing"""
+        os.remove(os.path.join(self.model_dir, CURRENT_BUNDLE))
+        bundle = self.registry.reload()
+        self.assertIsNone(bundle.model)
+        self.assertIsNone(bundle.location_encoder)
+    
+    def test_check_interval_throttles_stat_calls(self):
+        """Test changes are not picked up until the check interval elapses"""
+        registry = ModelRegistry(self.model_dir, check_interval=3600)
+        first = registry.get()
+        self._write_artifacts(['london'])
+        self.assertIs(registry.get(), first)
+        self.assertEqual(registry.reload().model, {'trees': 1})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+import unittest
+import csv
+import gzip
+import io
+import json
+from datetime import datetime
+from app.utils.prediction_export import (
+    iter_csv, iter_ndjson, iter_parquet, gzip_chunks, export_stream, parse_time_bound
+)
+from app.utils.prediction_history import PredictionHistory, FIELDNAMES
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:
+    pq = None
+
+def make_records(n):
+    return [{
+        'timestamp': datetime.fromtimestamp(1718409600 + i * 60).strftime('%Y-%m-%d %H:%M:%S'),
+        'location': 'Udupi' if i % 2 else 'Mangalore',
+        'temperature': 24.5,
+        'humidity': 88.0,
+        'pressure': 1004.0,
+        'wind_speed': 12.0,
+        'cloud_cover': 85.0,
+        'season': 'monsoon',
+        'predicted_rainfall': float(i),
+        'probability': 80.0
+    } for i in range(n)]
+
+class TestPredictionExport(unittest.TestCase):
+    
+    def test_csv_is_emitted_in_chunks(self):
+        """Test CSV output is streamed in bounded chunks and parses back intact"""
+        chunks = list(iter_csv(iter(make_records(25)), chunk_rows=10))
+        self.assertEqual(len(chunks), 3)
+        rows = list(csv.DictReader(io.StringIO(b''.join(chunks).decode())))
+        self.assertEqual(len(rows), 25)
+        self.assertEqual(list(rows[0]), FIELDNAMES)
+        self.assertEqual(rows[-1]['predicted_rainfall'], '24.0')
+    
+    def test_csv_header_only_when_empty(self):
+        """Test an empty export still has a header row"""
+        self.assertEqual(b''.join(iter_csv([])).decode().strip(), ','.join(FIELDNAMES))
+    
+    def test_ndjson(self):
+        """Test NDJSON output has one record per line"""
+        lines = b''.join(iter_ndjson(make_records(5), chunk_rows=2)).decode().splitlines()
+        self.assertEqual([json.loads(line)['predicted_rainfall'] for line in lines], [0.0, 1.0, 2.0, 3.0, 4.0])
+    
+    @unittest.skipIf(pq is None, 'pyarrow not installed')
+    def test_parquet_row_groups(self):
+        """Test Parquet output is a valid file with one row group per chunk"""
+        data = b''.join(iter_parquet(make_records(25), chunk_rows=10))
+        parquet_file = pq.ParquetFile(io.BytesIO(data))
+        self.assertEqual(parquet_file.metadata.num_rows, 25)
+        self.assertEqual(parquet_file.metadata.num_row_groups, 3)
+        table = parquet_file.read()
+        self.assertEqual(table.column('location').to_pylist()[:2], ['Mangalore', 'Udupi'])
+    
+    def test_gzip_round_trip(self):
+        """Test gzip compression of a chunk stream decompresses to the original"""
+        plain = b''.join(iter_csv(make_records(50)))
+        compressed = b''.join(gzip_chunks(iter_csv(make_records(50), chunk_rows=7)))
+        self.assertEqual(gzip.decompress(compressed), plain)
+    
+    def test_unknown_format(self):
+        """Test unsupported formats are rejected"""
+        with self.assertRaises(ValueError):
+            export_stream([], 'xml')
+    
+    def test_parse_time_bound(self):
+        """Test epoch, date and datetime bounds"""
+        self.assertIsNone(parse_time_bound(''))
+        self.assertEqual(parse_time_bound('1718409600'), 1718409600.0)
+        self.assertEqual(parse_time_bound('2024-06-15'), datetime(2024, 6, 15).timestamp())
+        self.assertEqual(parse_time_bound('2024-06-15 10:30:00'), datetime(2024, 6, 15, 10, 30).timestamp())
+        with self.assertRaises(ValueError):
+            parse_time_bound('yesterday')
+    
+    def test_history_query_filters(self):
+        """Test ring-buffer filtering matches the log's range and location semantics"""
+        history = PredictionHistory(capacity=8)
+        for record in make_records(12):
+            history.append(record)
+        start = parse_time_bound(make_records(12)[6]['timestamp'])
+        end = parse_time_bound(make_records(12)[10]['timestamp'])
+        self.assertEqual([r['predicted_rainfall'] for r in history.query(start=start, end=end)],
+                         [6.0, 7.0, 8.0, 9.0])
+        self.assertEqual([r['predicted_rainfall'] for r in history.query(location='UDUPI')],
+                         [5.0, 7.0, 9.0, 11.0])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import unittest
+import sys
+import threading
+from unittest.mock import patch
+from config import Config
+from app.utils.prediction_history import PredictionHistory, FIELDNAMES
+from tests.helpers import make_prediction_record
+
+class TestPredictionHistory(unittest.TestCase):
+    
+    def test_append_and_tail(self):
+        """Test records round-trip with the export field layout"""
+        history = PredictionHistory(capacity=5)
+        self.assertEqual(len(history), 0)
+        history.append(make_prediction_record(1))
+        records = history.tail(10)
+        self.assertEqual(len(records), 1)
+        self.assertEqual(list(records[0]), FIELDNAMES)
+        self.assertEqual(records[0]['location'], 'Mangalore')
+        self.assertEqual(records[0]['temperature'], 20.1)
+        self.assertEqual(records[0]['pressure'], 1008.5)
+        self.assertEqual(records[0]['season'], 'monsoon')
+    
+    def test_default_capacity_from_config(self):
+        """Test the capacity defaults to PREDICTION_HISTORY_CAPACITY"""
+        with patch.object(Config, 'PREDICTION_HISTORY_CAPACITY', 7):
+            self.assertEqual(PredictionHistory().capacity, 7)
+    
+    def test_ring_overwrites_oldest(self):
+        """Test capacity is fixed and the oldest records are dropped"""
+        history = PredictionHistory(capacity=3)
+        for i in range(7):
+            history.append(make_prediction_record(i))
+        self.assertEqual(len(history), 3)
+        self.assertEqual([r['predicted_rainfall'] for r in history.records()], [4.0, 5.0, 6.0])
+        self.assertEqual([r['predicted_rainfall'] for r in history.tail(2)], [5.0, 6.0])
+    
+    def test_string_table_stays_bounded(self):
+        """Test unique free-text locations do not grow memory without bound"""
+        history = PredictionHistory(capacity=4)
+        for i in range(500):
+            history.append(make_prediction_record(i, location=f'Village {i}'))
+        self.assertLess(len(history._strings), 4 * 4 + 16 + 2)
+        self.assertEqual([r['location'] for r in history.records()],
+                         ['Village 496', 'Village 497', 'Village 498', 'Village 499'])
+    
+    def test_location_query_folds_non_ascii_case(self):
+        """Test location filters ignore case beyond ASCII, like the SQLite log"""
+        history = PredictionHistory(capacity=5)
+        for i, location in enumerate(['ÉVORA', 'Straße', 'Udupi']):
+            history.append(make_prediction_record(i, location))
+        self.assertEqual([r['location'] for r in history.query(location='évora')], ['ÉVORA'])
+        self.assertEqual([r['location'] for r in history.query(location='STRASSE')], ['Straße'])
+    
+    def test_concurrent_appends(self):
+        """Test appends from many threads are all recorded"""
+        history = PredictionHistory(capacity=10000)
+        threads = [threading.Thread(target=lambda: [history.append(make_prediction_record(i)) for i in range(500)])
+                   for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(len(history), 4000)
+    
+    def test_memory_per_record(self):
+        """Test column storage is an order of magnitude smaller than a dict per record"""
+        history = PredictionHistory(capacity=1000)
+        column_bytes = (history.timestamps.nbytes + history.location_ids.nbytes + history.season_ids.nbytes +
+                        sum(column.nbytes for column in history.values.values())) / history.capacity
+        record = make_prediction_record(1)
+        dict_bytes = sys.getsizeof(record) + sum(sys.getsizeof(v) for v in record.values())
+        self.assertLess(column_bytes * 10, dict_bytes)
+
+if __name__ == '__main__':
+    unittest.main()
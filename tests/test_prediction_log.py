@@ -0,0 +1,96 @@
+import unittest
+import os
+import queue
+import time
+import sqlite3
+from unittest.mock import patch
+from app.utils.prediction_log import PredictionLog
+from app.utils.prediction_history import FIELDNAMES, PredictionHistory
+from tests.helpers import TempDirTestCase, make_prediction_record
+
+class TestPredictionLog(TempDirTestCase):
+    
+    def setUp(self):
+        super().setUp()
+        self.path = os.path.join(self.test_dir, 'predictions.sqlite3')
+        self.log = PredictionLog(self.path, batch_size=50, flush_interval=0.05, queue_size=1000)
+    
+    def test_enqueue_is_written_in_background(self):
+        """Test queued records become readable after a flush"""
+        for i in range(120):
+            self.log.enqueue(make_prediction_record(i))
+        self.assertTrue(self.log.flush())
+        records = list(self.log.query())
+        self.assertEqual(len(records), 120)
+        self.assertEqual(list(records[0]), FIELDNAMES)
+        self.assertEqual(records[-1]['predicted_rainfall'], 119.0)
+    
+    def test_flush_is_best_effort_when_backed_up(self):
+        """Test a full queue makes flush return False instead of raising"""
+        self.log.enqueue(make_prediction_record(1))
+        with patch.object(self.log._queue, 'put', side_effect=queue.Full):
+            self.assertFalse(self.log.flush(timeout=0.01))
+        self.assertTrue(self.log.flush())
+    
+    def test_survives_restart(self):
+        """Test records persist for a new log instance (another worker or a restart)"""
+        self.log.enqueue(make_prediction_record(1))
+        self.log.flush()
+        reopened = PredictionLog(self.path)
+        self.assertTrue(reopened.has_records())
+        self.assertEqual(reopened.tail(5)[0]['location'], 'Mangalore')
+    
+    def test_range_and_location_filters(self):
+        """Test time-range and case-insensitive location scans"""
+        for i in range(10):
+            self.log.enqueue(make_prediction_record(i, 'Udupi' if i % 2 else 'Mangalore'))
+        self.log.flush()
+        in_range = list(self.log.query(start=1718409600 + 2 * 3600, end=1718409600 + 5 * 3600))
+        self.assertEqual([r['predicted_rainfall'] for r in in_range], [2.0, 3.0, 4.0])
+        udupi = list(self.log.query(location='udupi'))
+        self.assertEqual(len(udupi), 5)
+        self.assertEqual([r['predicted_rainfall'] for r in self.log.tail(2)], [8.0, 9.0])
+    
+    def test_location_filter_matches_history(self):
+        """Test non-ASCII locations match ignoring case exactly as the in-memory history does"""
+        history = PredictionHistory(capacity=5)
+        for i, location in enumerate(['ÉVORA', 'Straße', 'Udupi']):
+            self.log.enqueue(make_prediction_record(i, location))
+            history.append(make_prediction_record(i, location))
+        self.log.flush()
+        for location in ('évora', 'STRASSE', 'UDUPI'):
+            self.assertEqual(list(self.log.query(location=location)), history.query(location=location))
+            self.assertEqual(len(history.query(location=location)), 1)
+    
+    def test_fills_location_key_of_older_logs(self):
+        """Test a log written with the old NOCASE schema gains location keys on open"""
+        path = os.path.join(self.test_dir, 'old.sqlite3')
+        conn = sqlite3.connect(path)
+        conn.execute('CREATE TABLE predictions (id INTEGER PRIMARY KEY, timestamp REAL NOT NULL, '
+                     'location TEXT COLLATE NOCASE, season TEXT, temperature REAL, humidity REAL, pressure REAL, '
+                     'wind_speed REAL, cloud_cover REAL, predicted_rainfall REAL, probability REAL)')
+        conn.execute('CREATE INDEX idx_predictions_location ON predictions (location, timestamp)')
+        conn.execute("INSERT INTO predictions (timestamp, location) VALUES (1718409600, 'ÉVORA')")
+        conn.commit()
+        conn.close()
+        log = PredictionLog(path)
+        self.assertEqual([r['location'] for r in log.query(location='évora')], ['ÉVORA'])
+    
+    def test_uses_wal_journal(self):
+        """Test the database runs in WAL mode so readers do not block the writer"""
+        conn = self.log._connect()
+        self.assertEqual(conn.execute('PRAGMA journal_mode').fetchone()[0], 'wal')
+        conn.close()
+    
+    def test_enqueue_never_blocks(self):
+        """Test a full queue drops records instead of blocking the request"""
+        log = PredictionLog(os.path.join(self.test_dir, 'small.sqlite3'), queue_size=1)
+        with patch.object(log, '_ensure_writer'):
+            start = time.monotonic()
+            for i in range(100):
+                log.enqueue(make_prediction_record(i))
+            self.assertLess(time.monotonic() - start, 0.5)
+        self.assertEqual(log.dropped, 99)
+
+if __name__ == '__main__':
+    unittest.main()
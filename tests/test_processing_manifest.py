@@ -0,0 +1,111 @@
+import unittest
+import os
+from functools import partial
+import numpy as np
+import pandas as pd
+from unittest.mock import patch
+from config import Config
+from app.utils.feature_store import load_feature_matrix
+from app.utils.processing_manifest import ProcessingManifest
+from app.utils.weather_store import write_partitioned, read_store
+from scripts import process_data
+from tests.helpers import TempDirTestCase, make_weather_frame
+
+# Five days, all within 2023 unless started elsewhere
+make_frame = partial(make_weather_frame, start='2023-01-01', periods=5)
+
+class TestProcessingManifest(TempDirTestCase):
+    
+    def setUp(self):
+        super().setUp()
+        self.path = os.path.join(self.test_dir, '_processing_manifest.json')
+    
+    def test_hash_is_cached_until_file_changes(self):
+        """Test unchanged files are not re-read to hash them"""
+        data_path = os.path.join(self.test_dir, 'data.csv')
+        with open(data_path, 'w') as f:
+            f.write('a\n1\n')
+        manifest = ProcessingManifest(self.path)
+        first = manifest.hash_file(data_path, 'data.csv')
+        with patch('app.utils.processing_manifest.content_hash') as mock_hash:
+            self.assertEqual(manifest.hash_file(data_path, 'data.csv'), first)
+        mock_hash.assert_not_called()
+        with open(data_path, 'w') as f:
+            f.write('a\n2\n')
+        self.assertNotEqual(manifest.hash_file(data_path, 'data.csv'), first)
+    
+    def test_vocabulary_codes_are_stable(self):
+        """Test new categories are appended so existing codes never change"""
+        manifest = ProcessingManifest(self.path)
+        self.assertEqual(list(manifest.encode('location', pd.Series(['udupi', 'mysore']))), [1, 0])
+        manifest.save()
+        manifest = ProcessingManifest(self.path)
+        self.assertEqual(list(manifest.encode('location', pd.Series(['bangalore', 'udupi']))), [2, 1])
+        self.assertEqual(manifest.vocabulary['location'], ['mysore', 'udupi', 'bangalore'])
+
+class TestIncrementalProcessing(TempDirTestCase):
+    
+    def setUp(self):
+        super().setUp()
+        self.raw_dir = os.path.join(self.test_dir, 'raw')
+        processed_dir = os.path.join(self.test_dir, 'processed')
+        os.makedirs(processed_dir)
+        self.patch_config(
+            RAW_DATA_DIR=self.raw_dir,
+            PROCESSED_DATA_DIR=processed_dir,
+            COMBINED_DATA_DIR=os.path.join(processed_dir, 'combined'),
+            FEATURES_DATA_DIR=os.path.join(processed_dir, 'features'),
+            FEATURE_STORE_DIR=os.path.join(processed_dir, 'feature_matrix'),
+            PROCESSING_MANIFEST_PATH=os.path.join(processed_dir, '_processing_manifest.json'),
+            ANALYTICS_AGGREGATES_PATH=os.path.join(processed_dir, 'analytics_aggregates.json')
+        )
+    
+    def run_processing(self):
+        with patch.object(process_data, '_load_partition', wraps=process_data._load_partition) as mock_load:
+            process_data.process_weather_data()
+        return sorted(call.args[0] for call in mock_load.call_args_list)
+    
+    def test_only_changed_partitions_are_rebuilt(self):
+        """Test reprocessing touches new and changed partitions, and the matrix covers all rows"""
+        write_partitioned(make_frame('Udupi'), self.raw_dir)
+        write_partitioned(make_frame('Mysore', offset=3.0), self.raw_dir)
+        self.assertEqual(self.run_processing(), [os.path.join('mysore', '2023.arrow'), os.path.join('udupi', '2023.arrow')])
+        self.assertEqual(self.run_processing(), [])
+        
+        # New year of data for one location and a corrected value for another
+        write_partitioned(make_frame('Udupi', start='2024-01-01', offset=7.0), self.raw_dir)
+        corrected = make_frame('Mysore', offset=3.0)
+        corrected.loc[0, 'temperature_2m_mean'] = 40.0
+        write_partitioned(corrected, self.raw_dir)
+        self.assertEqual(self.run_processing(), [os.path.join('mysore', '2023.arrow'), os.path.join('udupi', '2024.arrow')])
+        
+        everything = pd.concat([make_frame('Udupi'), corrected, make_frame('Udupi', start='2024-01-01', offset=7.0)])
+        matrix = load_feature_matrix()
+        self.assertEqual(matrix.X.shape, (15, 9))
+        self.assertEqual(sorted(matrix.X[:, 0]), sorted(everything['temperature_2m_mean'].astype(np.float32)))
+        
+        features = read_store(Config.FEATURES_DATA_DIR)
+        self.assertEqual(len(features), 15)
+        self.assertEqual(sorted(features.groupby('location', observed=True)['location_encoded'].first().items()),
+                         [('Mysore', 0), ('Udupi', 1)])
+    
+    def test_removed_inputs_are_dropped(self):
+        """Test outputs of a deleted raw partition go away"""
+        write_partitioned(make_frame('Udupi'), self.raw_dir)
+        write_partitioned(make_frame('Mysore'), self.raw_dir)
+        self.run_processing()
+        write_partitioned(make_frame('Udupi'), self.raw_dir, replace=True)
+        self.assertEqual(self.run_processing(), [])
+        self.assertEqual(list(read_store(Config.COMBINED_DATA_DIR)['location'].unique()), ['Udupi'])
+        self.assertEqual(load_feature_matrix().manifest['rows'], 5)
+    
+    def test_legacy_csv_feeds_matching_partitions(self):
+        """Test a legacy CSV is hashed and split across the partitions it covers"""
+        os.makedirs(self.raw_dir)
+        make_frame('Hassan', start='2022-12-30').to_csv(os.path.join(self.raw_dir, 'hassan.csv'), index=False)
+        self.assertEqual(self.run_processing(), [os.path.join('hassan', '2022.arrow'), os.path.join('hassan', '2023.arrow')])
+        self.assertEqual(len(read_store(Config.COMBINED_DATA_DIR)), 5)
+        self.assertEqual(self.run_processing(), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+import os
+import numpy as np
+import pandas as pd
+from app.utils.raw_loader import frame_from_tables, legacy_csv_files, parse_csvs, validate_sources
+from app.utils.weather_store import write_partitioned, list_partitions, to_table
+from tests.helpers import MEASUREMENTS, TempDirTestCase, make_weather_frame
+
+class TestRawLoader(TempDirTestCase):
+    
+    def test_frame_from_tables_matches_concat(self):
+        """Test preallocated assembly gives the same data as concatenating frames"""
+        tables = [to_table(make_weather_frame('Udupi', district='Udupi')),
+                  to_table(make_weather_frame('Delhi', periods=3))]
+        df = frame_from_tables(tables)
+        expected = pd.concat([t.to_pandas() for t in tables], ignore_index=True)
+        self.assertEqual(list(df.columns), list(expected.columns))
+        self.assertEqual(df['temperature_2m_mean'].dtype, np.float32)
+        self.assertEqual(df['month'].dtype, np.int8)
+        self.assertEqual(list(df['location'].cat.categories), ['Delhi', 'Udupi'])
+        self.assertEqual(list(df['location'].astype(str)), list(expected['location'].astype(str)))
+        self.assertEqual(df['district'].isna().sum(), 3)
+        np.testing.assert_array_equal(df['precipitation_sum'], expected['precipitation_sum'])
+        self.assertTrue((df['date'] == pd.to_datetime(expected['date'])).all())
+    
+    def test_columns_missing_from_some_tables(self):
+        """Test integer columns absent from a table become float with NaN"""
+        first = to_table(make_weather_frame('Udupi'))
+        second = to_table(make_weather_frame('Delhi').drop(columns=['day']))
+        df = frame_from_tables([first, second], columns=['location', 'day'])
+        self.assertEqual(list(df.columns), ['location', 'day'])
+        self.assertEqual(df['day'].dtype, np.float32)
+        self.assertEqual(df['day'].isna().sum(), 4)
+    
+    def test_required_columns_checked(self):
+        """Test a file missing a required column is reported by name from its header"""
+        write_partitioned(make_weather_frame('Udupi'), self.test_dir)
+        mysore = make_weather_frame('Mysore').drop(columns=['precipitation_sum'])
+        mysore.to_csv(os.path.join(self.test_dir, 'mysore.csv'), index=False)
+        sources = list_partitions(self.test_dir) + legacy_csv_files(self.test_dir)
+        with self.assertRaises(ValueError) as context:
+            validate_sources(sources, MEASUREMENTS + ['date'])
+        self.assertIn('mysore.csv', str(context.exception))
+        validate_sources(sources, ['date', 'location'])
+    
+    def test_parallel_parse_matches_serial(self):
+        """Test CSVs parsed on a process pool come back in order and compact"""
+        paths = []
+        for location in ('Udupi', 'Mysore', 'Hassan'):
+            paths.append(os.path.join(self.test_dir, f'{location}.csv'))
+            make_weather_frame(location).to_csv(paths[-1], index=False)
+        parallel = parse_csvs(paths, columns=['location', 'temperature_2m_mean'], workers=2)
+        serial = parse_csvs(paths, columns=['location', 'temperature_2m_mean'], workers=1)
+        self.assertEqual([t.equals(s) for t, s in zip(parallel, serial)], [True] * 3)
+        self.assertEqual(str(parallel[0].schema.field('temperature_2m_mean').type), 'float')
+
+if __name__ == '__main__':
+    unittest.main()
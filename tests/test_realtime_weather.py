@@ -0,0 +1,127 @@
+import unittest
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+from unittest.mock import patch
+from config import Config
+from app.utils.realtime_weather import AsyncWeatherClient, get_current_weather_data, get_weather_alerts
+
+class StubWeatherHandler(BaseHTTPRequestHandler):
+    """Local stand-in for the Nominatim and Open-Meteo forecast APIs"""
+    
+    def do_GET(self):
+        server = self.server
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        with server.lock:
+            server.requests.append((url.path, query))
+        time.sleep(server.delay)
+        
+        if url.path == '/search':
+            body = [{'lat': '10.5', 'lon': '76.2'}] if query['q'][0] != 'Atlantis' else []
+        elif 'daily' in query:
+            body = {'daily': {'precipitation_sum': [60.0], 'precipitation_probability_max': [90]}}
+        else:
+            # Hourly series starts at local midnight (UTC+05:30) two hours ago
+            start = int(time.time() // 3600) * 3600 - 2 * 3600
+            hourly = {name: [50.0 + i for i in range(48)] for name in query['hourly'][0].split(',')}
+            hourly['time'] = [start + i * 3600 for i in range(48)]
+            body = {
+                'utc_offset_seconds': 19800,
+                'current_weather': {'temperature': 27.34, 'windspeed': 11.26},
+                'hourly': hourly
+            }
+        payload = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+    
+    def log_message(self, format, *args):
+        pass
+
+class TestRealtimeWeather(unittest.TestCase):
+    
+    def setUp(self):
+        """Start a stub HTTP server and point the weather APIs at it"""
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), StubWeatherHandler)
+        self.server.requests = []
+        self.server.lock = threading.Lock()
+        self.server.daemon_threads = True
+        self.server.delay = 0
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        base = f'http://127.0.0.1:{self.server.server_address[1]}'
+        
+        self.client = AsyncWeatherClient(pool_size=4)
+        self.patches = [
+            patch.object(Config, 'FORECAST_API_URL', f'{base}/v1/forecast'),
+            patch.object(Config, 'GEOCODE_API_URL', f'{base}/search'),
+            patch('app.utils.realtime_weather._client', self.client),
+        ]
+        for p in self.patches:
+            p.start()
+    
+    def tearDown(self):
+        for p in self.patches:
+            p.stop()
+        self.client.close()
+        self.server.shutdown()
+        self.server.server_close()
+    
+    def test_current_weather_for_catalog_location(self):
+        """Test catalog locations skip geocoding and fill the form fields"""
+        data = get_current_weather_data('Mangalore')
+        self.assertEqual(data['temperature'], 27.3)
+        self.assertEqual(data['wind_speed'], 11.3)
+        self.assertEqual(data['location'], 'Mangalore')
+        # Current hour is index 2 of the location's hourly series
+        self.assertEqual(data['humidity'], 52.0)
+        self.assertEqual(data['cloud_cover'], 52.0)
+        paths = [path for path, _ in self.server.requests]
+        self.assertEqual(paths, ['/v1/forecast'])
+        query = self.server.requests[0][1]
+        self.assertEqual(query['hourly'], ['relative_humidity_2m,surface_pressure,cloud_cover'])
+        self.assertEqual(query['timeformat'], ['unixtime'])
+    
+    def test_forecast_is_cached_until_next_update(self):
+        """Test repeat lookups for the same place reuse the cached forecast"""
+        first = get_current_weather_data('Mangalore')
+        second = get_current_weather_data('mangalore')
+        self.assertEqual(first['humidity'], second['humidity'])
+        self.assertEqual(len(self.server.requests), 1)
+    
+    @patch('app.utils.realtime_weather.get_geocode_cache')
+    @patch('app.utils.realtime_weather.geocode_offline', return_value=None)
+    def test_unknown_location_is_geocoded(self, mock_offline, mock_cache):
+        """Test unknown names go through the geocoder before the forecast, with cache access off the loop"""
+        threads = []
+        mock_offline.side_effect = lambda name: threads.append(threading.current_thread().name)
+        mock_cache.return_value.put.side_effect = lambda *args: threads.append(threading.current_thread().name)
+        self.assertIsNotNone(get_current_weather_data('Tiny Village'))
+        self.assertIsNone(get_current_weather_data('Atlantis'))
+        paths = [path for path, _ in self.server.requests]
+        self.assertEqual(paths, ['/search', '/v1/forecast', '/search'])
+        self.assertEqual(len(threads), 4)
+        self.assertNotIn('realtime-weather', threads)
+    
+    def test_concurrent_requests_are_coalesced(self):
+        """Test identical concurrent requests share one upstream call"""
+        self.server.delay = 0.3
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(lambda _: get_weather_alerts(12.9, 74.8), range(8)))
+        self.assertTrue(all(alerts == ['Heavy rainfall expected today'] for alerts in results))
+        self.assertEqual(len(self.server.requests), 1)
+    
+    def test_deadline_returns_fallback(self):
+        """Test a slow upstream is abandoned at the per-call deadline"""
+        self.server.delay = 2
+        start = time.monotonic()
+        self.assertEqual(get_weather_alerts(12.9, 74.8, timeout=0.2), [])
+        self.assertLess(time.monotonic() - start, 1)
+
+if __name__ == '__main__':
+    unittest.main()
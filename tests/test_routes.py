@@ -1,7 +1,15 @@
 import unittest
+import gzip
+import json
+import os
+import shutil
+import tempfile
 from unittest.mock import patch
+import pandas as pd
 from app import create_app
+from app.utils import prediction_log
 from config import Config
+from tests.helpers import isolate_geocode_cache
 
 class TestConfig(Config):
     TESTING = True
@@ -15,9 +23,17 @@ class TestRoutes(unittest.TestCase):
         self.client = self.app.test_client()
         self.app_context = self.app.app_context()
         self.app_context.push()
+        # Keep recorded predictions out of the real prediction log
+        self.log_dir = tempfile.mkdtemp()
+        log = prediction_log.PredictionLog(os.path.join(self.log_dir, 'predictions.sqlite3'))
+        self.log_patch = patch.object(prediction_log, '_log', log)
+        self.log_patch.start()
+        isolate_geocode_cache(self)
     
     def tearDown(self):
         """Clean up after tests"""
+        self.log_patch.stop()
+        shutil.rmtree(self.log_dir)
         self.app_context.pop()
     
     def test_index_route(self):
@@ -76,6 +92,104 @@ class TestRoutes(unittest.TestCase):
         self.assertIn('locations', json_data)
         self.assertIn('latest_date', json_data)
         self.assertIsInstance(json_data['locations'], list)
+    
+    @patch('app.routes.predict_rainfall', return_value=3.5)
+    def test_export_csv_after_prediction(self, mock_predict):
+        """Test exported CSV contains recorded predictions"""
+        self.client.post('/predict', data={
+            'location': 'Export Town', 'date': '2024-06-15', 'temperature': '20', 'humidity': '70',
+            'pressure': '1010', 'wind_speed': '10', 'cloud_cover': '60', 'season': 'summer',
+            'time_of_day': 'morning'
+        })
+        response = self.client.get('/export-csv')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, 'text/csv')
+        self.assertIn(b'Export Town,20.0,70.0,1010.0,10.0,60.0,summer,3.5,40.0', response.data)
+    
+    @patch('app.routes.predict_rainfall', return_value=3.5)
+    def test_export_filters_and_formats(self, mock_predict):
+        """Test streamed export with location filter, NDJSON and gzip"""
+        for location in ('Udupi', 'Mysore'):
+            self.client.post('/predict', data={
+                'location': location, 'date': '2024-06-15', 'temperature': '20', 'humidity': '70',
+                'pressure': '1010', 'wind_speed': '10', 'cloud_cover': '60', 'season': 'summer',
+                'time_of_day': 'morning'
+            })
+        response = self.client.get('/export-csv?format=ndjson&location=udupi')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.is_streamed)
+        rows = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+        self.assertEqual([row['location'] for row in rows], ['Udupi'])
+        
+        response = self.client.get('/export-csv?compress=gzip')
+        self.assertEqual(response.mimetype, 'application/gzip')
+        self.assertIn(b'Mysore', gzip.decompress(response.data))
+        
+        self.assertEqual(self.client.get('/export-csv?format=xml').status_code, 400)
+        self.assertEqual(self.client.get('/export-csv?start=soon').status_code, 400)
+    
+    def test_api_analytics_data_from_materialized_aggregates(self):
+        """Test analytics endpoint serves the cached aggregates"""
+        from app.utils import analytics_cache
+        
+        from app.utils.weather_store import write_partitioned
+        
+        data_root = os.path.join(self.log_dir, 'combined')
+        sidecar_path = os.path.join(self.log_dir, 'analytics_aggregates.json')
+        write_partitioned(pd.DataFrame({
+            'date': ['2023-07-01', '2023-01-01'], 'location': 'Udupi', 'season': ['monsoon', 'winter'],
+            'month': [7, 1], 'precipitation_sum': [30.0, 2.0]
+        }), data_root)
+        cache = analytics_cache.AnalyticsCache(data_root, sidecar_path)
+        with patch.object(analytics_cache, '_cache', cache):
+            json_data = self.client.get('/api/analytics-data').get_json()
+        self.assertTrue(json_data['success'])
+        self.assertEqual(json_data['total_records'], 2)
+        self.assertEqual(json_data['seasonal_rainfall'], {'monsoon': 30.0, 'winter': 2.0})
+    
+    def test_api_location_suggest(self):
+        """Test location autocomplete endpoint"""
+        response = self.client.get('/api/locations/suggest?q=man')
+        self.assertEqual(response.status_code, 200)
+        
+        json_data = response.get_json()
+        names = [place['name'] for place in json_data['suggestions']]
+        self.assertIn('Mangalore', names)
+        self.assertIn('Mandya', names)
+    
+    @patch('app.utils.data_processing.get_location_coordinates', return_value=(12.97, 77.59))
+    def test_api_predict_batch_json(self, mock_coords):
+        """Test batch prediction endpoint with a JSON body"""
+        row = {'location': 'Bangalore', 'date': '2024-06-15', 'temperature': 22, 'humidity': 88,
+               'pressure': 1002, 'wind_speed': 10, 'cloud_cover': 85, 'season': 'monsoon'}
+        response = self.client.post('/api/predict/batch', json={'rows': [row, row]})
+        self.assertEqual(response.status_code, 200)
+        
+        json_data = response.get_json()
+        self.assertTrue(json_data['success'])
+        self.assertEqual(json_data['count'], 2)
+        self.assertGreater(json_data['predictions'][0]['predicted_rainfall'], 0)
+    
+    @patch('app.utils.data_processing.get_location_coordinates', return_value=(None, None))
+    def test_api_predict_batch_ndjson(self, mock_coords):
+        """Test batch prediction endpoint with an NDJSON body"""
+        body = '\n'.join([
+            '{"location": "A", "temperature": 20, "humidity": 70, "pressure": 1010, "wind_speed": 5, "cloud_cover": 60}',
+            '{"location": "B", "temperature": 30, "humidity": 40, "pressure": 1020, "wind_speed": 5, "cloud_cover": 20}',
+        ])
+        response = self.client.post('/api/predict/batch', data=body, content_type='application/x-ndjson')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()['count'], 2)
+    
+    def test_api_predict_batch_invalid(self):
+        """Test batch prediction endpoint rejects malformed rows"""
+        response = self.client.post('/api/predict/batch', json={'rows': [{'location': 'A'}]})
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(response.get_json()['success'])
+        body = '{"location": "A", "temperature": NaN, "humidity": 70, "pressure": 1010, "wind_speed": 5, "cloud_cover": 60}'
+        response = self.client.post('/api/predict/batch', data=body, content_type='application/x-ndjson')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('finite', response.get_json()['message'])
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
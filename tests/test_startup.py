@@ -0,0 +1,54 @@
+import unittest
+from unittest.mock import patch
+from app import create_app
+from app.utils import prewarm
+from config import Config
+from scripts.startup_benchmark import LAZY_MODULES, eager_lazy_modules, measure_startup, parse_importtime
+
+class TestConfig(Config):
+    TESTING = True
+    DEBUG = False
+
+class TestStartup(unittest.TestCase):
+
+    def test_create_app_imports_no_heavy_dependencies(self):
+        """Test a fresh interpreter creates the app without importing the lazy modules"""
+        modules = measure_startup()
+        self.assertIn('app.routes', modules)
+        self.assertEqual(eager_lazy_modules(modules), [])
+    
+    def test_parse_importtime(self):
+        """Test self and cumulative microseconds are read per module"""
+        output = ("import time: self [us] | cumulative | imported package\n"
+                  "import time:       120 |        120 |   numpy._core\n"
+                  "import time:      1800 |      73549 | numpy\n")
+        modules = parse_importtime(output)
+        self.assertEqual(modules['numpy'], (1800, 73549))
+        self.assertEqual(eager_lazy_modules(modules), ['numpy'])
+        self.assertIn('pandas', LAZY_MODULES)
+    
+    def test_prewarm_skips_failing_steps(self):
+        """Test prewarm times every step and reports, then skips, a failing one"""
+        def fail():
+            raise OSError('unavailable')
+        steps = [('ok', lambda: None), ('broken', fail)]
+        with patch.object(prewarm, 'PREWARM_STEPS', steps), patch('builtins.print') as mock_print:
+            timings = prewarm.prewarm()
+        self.assertEqual([name for name, _ in timings], ['ok'])
+        self.assertIn('broken', mock_print.call_args[0][0])
+    
+    def test_prewarm_is_an_explicit_step(self):
+        """Test create_app only prewarms when configured, and exposes a CLI command"""
+        with patch('app.utils.prewarm.prewarm', return_value=[('model bundle', 0.002)]) as mock_prewarm:
+            app = create_app(TestConfig)
+            mock_prewarm.assert_not_called()
+            result = app.test_cli_runner().invoke(args=['prewarm'])
+            self.assertIn('model bundle', result.output)
+            
+            class PrewarmConfig(TestConfig):
+                PREWARM = True
+            create_app(PrewarmConfig)
+            self.assertEqual(mock_prewarm.call_count, 2)
+
+if __name__ == '__main__':
+    unittest.main()
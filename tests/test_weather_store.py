@@ -0,0 +1,80 @@
+import unittest
+import os
+import numpy as np
+import pandas as pd
+from unittest.mock import patch
+from app.utils.weather_store import (
+    write_partitioned, read_store, list_partitions, export_csv, location_slug
+)
+from tests.helpers import TempDirTestCase, make_weather_frame
+
+class TestWeatherStore(TempDirTestCase):
+    
+    def test_partitions_by_location_and_year(self):
+        """Test one Arrow file is written per location and year"""
+        written = write_partitioned(make_weather_frame('New Delhi'), self.test_dir)
+        self.assertEqual(written, [os.path.join('new_delhi', '2022.arrow'), os.path.join('new_delhi', '2023.arrow')])
+        self.assertEqual(len(list_partitions(self.test_dir, locations=['new delhi'], years=[2023])), 1)
+    
+    def test_compact_dtypes_round_trip(self):
+        """Test values survive with float32 measurements, int8 dates and categoricals"""
+        write_partitioned(make_weather_frame('Udupi'), self.test_dir)
+        df = read_store(self.test_dir)
+        self.assertEqual(len(df), 4)
+        self.assertEqual(df['precipitation_sum'].dtype, np.float32)
+        self.assertEqual(df['month'].dtype, np.int8)
+        self.assertEqual(df['day'].dtype, np.int8)
+        self.assertIsInstance(df['location'].dtype, pd.CategoricalDtype)
+        self.assertIsInstance(df['season'].dtype, pd.CategoricalDtype)
+        self.assertNotIn('time', df.columns)
+        self.assertEqual(df['date'].dt.strftime('%Y-%m-%d').tolist(),
+                         ['2022-12-30', '2022-12-31', '2023-01-01', '2023-01-02'])
+        self.assertAlmostEqual(float(df['temperature_2m_mean'].iloc[0]), 0.1, places=5)
+    
+    def test_column_and_partition_pruning(self):
+        """Test only requested columns and partitions are read"""
+        write_partitioned(make_weather_frame('Udupi'), self.test_dir)
+        write_partitioned(make_weather_frame('Mysore'), self.test_dir)
+        df = read_store(self.test_dir, columns=['location', 'precipitation_sum'], locations=['Mysore'], years=[2023])
+        self.assertEqual(list(df.columns), ['location', 'precipitation_sum'])
+        self.assertEqual(df['location'].astype(str).tolist(), ['Mysore', 'Mysore'])
+    
+    def test_rewrite_replaces_partitions(self):
+        """Test re-fetching a location replaces its partitions and replace=True drops others"""
+        write_partitioned(make_weather_frame('Udupi'), self.test_dir)
+        write_partitioned(make_weather_frame('Mysore'), self.test_dir)
+        write_partitioned(make_weather_frame('Udupi', periods=1), self.test_dir)
+        self.assertEqual(len(read_store(self.test_dir, locations=['Udupi'], years=[2022])), 1)
+        self.assertEqual(len(read_store(self.test_dir, locations=['Udupi'], years=[2023])), 2)
+        
+        write_partitioned(make_weather_frame('Mysore', start='2024-03-01', periods=1), self.test_dir, replace=True)
+        self.assertEqual(len(list_partitions(self.test_dir)), 1)
+        self.assertFalse(os.path.exists(os.path.join(self.test_dir, 'udupi', '2022.arrow')))
+    
+    def test_optional_columns_and_csv_export(self):
+        """Test partitions with different columns combine, and export to CSV"""
+        write_partitioned(make_weather_frame('Udupi', district='Udupi'), self.test_dir)
+        write_partitioned(make_weather_frame('Delhi'), self.test_dir)
+        df = read_store(self.test_dir)
+        self.assertEqual(df['district'].isna().sum(), 4)
+        
+        csv_path = os.path.join(self.test_dir, 'export.csv')
+        self.assertTrue(export_csv(self.test_dir, csv_path))
+        exported = pd.read_csv(csv_path)
+        self.assertEqual(len(exported), 8)
+        self.assertIn('district', exported.columns)
+        self.assertEqual(exported['precipitation_sum'].iloc[0], 50.1)
+    
+    def test_reads_are_memory_mapped(self):
+        """Test partitions are opened with memory mapping"""
+        write_partitioned(make_weather_frame('Udupi'), self.test_dir)
+        with patch('app.utils.weather_store.pa.memory_map', wraps=__import__('pyarrow').memory_map) as mock_map:
+            read_store(self.test_dir)
+        self.assertEqual(mock_map.call_count, 2)
+    
+    def test_location_slug(self):
+        """Test partition names are filesystem-safe"""
+        self.assertEqual(location_slug(' Navi Mumbai (East) '), 'navi_mumbai_east')
+
+if __name__ == '__main__':
+    unittest.main()